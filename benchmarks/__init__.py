@@ -0,0 +1,3 @@
+"""
+Performance benchmarks for the Skyrim HybridCommander preset generator.
+"""
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Preset Generator Benchmarks
+===========================
+Times each phase of the generator (and a full run) against synthetic large
+configs, writes machine-readable JSON, and can fail when a phase regresses
+past a threshold compared with a saved baseline.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output bench.json
+    python benchmarks/run_benchmarks.py --compare bench.json --threshold 0.15
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import write_workspace
+from generator.config_cache import ConfigCache
+from skyrim_preset_generator import SkyrimPresetGenerator
+
+
+def quiet():
+    """Swallow the generator's console output so it is not part of the timings"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+class BenchmarkContext:
+    """A synthetic workspace plus a fully loaded generator to clone state from"""
+
+    def __init__(self, workdir, data_path):
+        self.workdir = workdir
+        self.data_path = data_path
+        self.cache_dir = os.path.join(workdir, ".preset_cache")
+        self.storage = os.path.join(data_path, "SKSE", "Plugins", "StorageUtilData")
+        self.config_fixture = os.path.join(self.storage, "HybridCommander-Config.json")
+        with open(self.config_fixture, 'rb') as f:
+            self.config_bytes = f.read()
+
+        self.loaded = self.new_generator()
+        with quiet():
+            self.loaded.load_configs()
+            self.loaded.load_hybrid_commander_data()
+        self.keybinds = self.loaded.keybinds_data['keybinds']
+        self.fixture_config = copy.deepcopy(self.loaded.hybrid_config)
+        self.resolved = {
+            key: (f"Python_{entry['name']}_{key}", self.loaded.registry.resolve_many(entry['commands']))
+            for key, entry in self.keybinds.items()
+        }
+
+    def new_generator(self, cache=True):
+        generator = SkyrimPresetGenerator(skyrim_data_path=self.data_path)
+        generator.config_cache = ConfigCache(self.cache_dir, enabled=cache)
+        return generator
+
+    def reset_target(self):
+        """Restore the HybridCommander fixture and drop generator sidecar files"""
+        with open(self.config_fixture, 'wb') as f:
+            f.write(self.config_bytes)
+        for name in os.listdir(self.storage):
+            if name in ("HybridCommander-Command.json", "HybridCommander-Config.json"):
+                continue
+            path = os.path.join(self.storage, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path)  # e.g. HybridCommander-Backups
+            else:
+                os.remove(path)
+
+
+def phase_load_configs_cold(ctx):
+    shutil.rmtree(ctx.cache_dir, ignore_errors=True)
+    generator = ctx.new_generator(cache=False)
+    return lambda: generator.load_configs()
+
+
+def phase_load_configs_warm(ctx):
+    with quiet():
+        ctx.new_generator().load_configs()  # Prime the cache
+    generator = ctx.new_generator()
+    return lambda: generator.load_configs()
+
+
+def phase_resolve_command(ctx):
+    generator = ctx.loaded
+    generator.registry.clear_cache()
+    calls = [(cmd.get('function'), cmd.get('args', [])) for entry in ctx.keybinds.values()
+             for cmd in entry['commands']]
+
+    def run():
+        for function, args in calls:
+            generator.resolve_command(function, args)
+    return run
+
+
+def phase_create_presets(ctx):
+    generator = ctx.new_generator()
+    generator.slot_layout = ctx.loaded.slot_layout
+    generator.hybrid_config = generator.slot_layout.new_config()
+    presets = list(ctx.resolved.values())
+
+    def run():
+        for preset_name, commands in presets:
+            generator.create_hybrid_commander_preset(preset_name, commands)
+    return run
+
+
+def phase_clear_python_presets(ctx):
+    generator = ctx.new_generator()
+    generator.slot_layout = ctx.loaded.slot_layout
+    generator.hybrid_config = copy.deepcopy(ctx.fixture_config)
+    return lambda: generator.clear_python_presets()
+
+
+def phase_save_config(ctx):
+    ctx.reset_target()
+    generator = ctx.new_generator()
+    generator.hybrid_config = copy.deepcopy(ctx.fixture_config)
+    generator.hybrid_config["stringList"]["PresetName"][0] = "Python_benchmark_changed"
+    return lambda: generator.save_hybrid_commander_config()
+
+
+def phase_end_to_end(ctx):
+    ctx.reset_target()
+    generator = ctx.new_generator()
+    return lambda: generator.run()
+
+
+PHASES = {
+    "load_configs_cold": phase_load_configs_cold,
+    "load_configs_warm": phase_load_configs_warm,
+    "resolve_command": phase_resolve_command,
+    "create_hybrid_commander_preset": phase_create_presets,
+    "clear_python_presets": phase_clear_python_presets,
+    "save_hybrid_commander_config": phase_save_config,
+    "end_to_end": phase_end_to_end,
+}
+
+
+def run_phase(ctx, setup, repeat):
+    """Run setup (untimed) then the returned callable (timed), `repeat` times"""
+    timings = []
+    for _ in range(repeat):
+        with quiet():
+            action = setup(ctx)
+            start = time.perf_counter()
+            action()
+            timings.append(time.perf_counter() - start)
+    return {
+        "median": statistics.median(timings),
+        "min": min(timings),
+        "max": max(timings),
+        "runs": timings,
+    }
+
+
+def run_benchmarks(keybinds, ids, repeat, phases=None, workdir=None):
+    """Build a synthetic workspace and time each phase; returns the results document"""
+    own_workdir = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix="skyrim-bench-")
+    original_cwd = os.getcwd()
+    try:
+        data_path = write_workspace(workdir, keybinds=keybinds, ids=ids)
+        os.chdir(workdir)
+        ctx = BenchmarkContext(workdir, data_path)
+        results = {}
+        for name in phases or PHASES:
+            results[name] = run_phase(ctx, PHASES[name], repeat)
+            print(f"⏱️ {name:32s} median {results[name]['median'] * 1000:10.2f} ms")
+    finally:
+        os.chdir(original_cwd)
+        if own_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "keybinds": keybinds,
+            "ids": ids,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold, min_delta=0.001):
+    """List phases whose median regressed by more than threshold (and min_delta seconds)"""
+    regressions = []
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+        delta = result["median"] - previous["median"]
+        if delta > min_delta and result["median"] > previous["median"] * (1 + threshold):
+            regressions.append((name, previous["median"], result["median"]))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the preset generator on synthetic configs")
+    parser.add_argument("--keybinds", type=int, default=10000, help="synthetic keybinds (default: 10000)")
+    parser.add_argument("--ids", type=int, default=100000, help="synthetic form IDs (default: 100000)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per phase (default: 3)")
+    parser.add_argument("--phase", action="append", choices=sorted(PHASES), help="only run these phases")
+    parser.add_argument("--output", metavar="PATH", help="write results JSON to PATH (default: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="fail if a phase regressed versus BASELINE")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown as a fraction of the baseline median (default: 0.10)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print(f"🏁 Benchmarking with {args.keybinds} keybinds and {args.ids} form IDs", file=sys.stderr)
+    with contextlib.redirect_stdout(sys.stderr):
+        document = run_benchmarks(args.keybinds, args.ids, args.repeat, args.phase)
+
+    text = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(document, baseline, args.threshold)
+        for name, before, after in regressions:
+            print(f"❌ {name} regressed: {before * 1000:.2f} ms -> {after * 1000:.2f} ms "
+                  f"(+{(after / before - 1) * 100:.0f}%)", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"✅ No phase regressed more than {args.threshold * 100:.0f}%", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
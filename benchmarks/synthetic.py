@@ -0,0 +1,113 @@
+"""
+Synthetic Data Generator
+========================
+Builds large but realistic config.yaml, ids.yaml, commands.yaml and
+HybridCommander JSON fixtures for benchmarking.
+"""
+
+import json
+import os
+import random
+
+import yaml
+
+STATS = ["health", "magicka", "stamina", "carryweight", "speedmult", "onehanded", "twohanded",
+         "archery", "block", "smithing", "destruction", "restoration", "illusion", "sneak"]
+
+
+def make_ids(count, categories=200, seed=1):
+    """ids.yaml tree with `count` form IDs spread over categories"""
+    rng = random.Random(seed)
+    ids = {}
+    for i in range(count):
+        category = ids.setdefault(f"category_{i % categories:04d}", {})
+        category[f"item_{i:07d}"] = f"{rng.randrange(0x01000000):08x}"
+    ids.setdefault("currency", {})["gold"] = "0000000f"
+    return ids
+
+
+def make_commands(count=500):
+    """commands.yaml tree with `count` named console commands"""
+    commands = {
+        "player_commands": {"god_mode": "tgm", "no_clip": "tcl", "unlock_all": "unlock"},
+    }
+    for i in range(count):
+        commands.setdefault(f"group_{i % 20:02d}", {})[f"command_{i:05d}"] = f"set global{i} to {i}"
+    return commands
+
+
+def make_config(keybinds, ids, commands, commands_per_keybind=5, duplicate_ratio=0.3, seed=2):
+    """config.yaml with `keybinds` entries; a share of them repeat earlier command lists"""
+    rng = random.Random(seed)
+    item_names = [f"{category}.{item}" for category, items in ids.items() for item in items]
+    command_paths = [f"{group}.{name}" for group, entries in commands.items() for name in entries]
+
+    def random_command():
+        kind = rng.randrange(4)
+        if kind == 0:
+            return {"function": "give_item", "args": [rng.choice(item_names), rng.randrange(1, 100)]}
+        if kind == 1:
+            return {"function": "set_player_stat", "args": [rng.choice(STATS), rng.choice([100, 200, 999])]}
+        if kind == 2:
+            return {"function": "modify_player_stat", "args": [rng.choice(STATS), rng.randrange(1, 50)]}
+        return {"function": "execute_command", "args": [rng.choice(command_paths)]}
+
+    entries = {}
+    previous = []
+    for i in range(keybinds):
+        if previous and rng.random() < duplicate_ratio:
+            command_list = rng.choice(previous)
+        else:
+            command_list = [random_command() for _ in range(rng.randrange(1, commands_per_keybind + 1))]
+            previous.append(command_list)
+        entries[f"Key{i:06d}"] = {
+            "name": f"preset_{i:06d}",
+            "description": f"Synthetic preset {i}",
+            "commands": command_list,
+        }
+    return {
+        "keybinds": entries,
+        "hybrid_commander": {"preset_slots": keybinds, "commands_per_preset": 10},
+    }
+
+
+def make_hybrid_config(preset_slots, filled=0, commands_per_preset=10, seed=3):
+    """HybridCommander-Config.json fixture with `filled` Python_ presets already present"""
+    rng = random.Random(seed)
+    config = {
+        "string": {},
+        "int": {},
+        "float": {},
+        "stringList": {"PresetName": [""] * preset_slots, "PowerName": [""] * 10},
+        "intList": {"HotkeyCode": [-1] * 10, "HotkeyModifier": [0] * 10,
+                    "HotkeyPreset": [0] * 10, "PowerPreset": [0] * 10},
+    }
+    for i in range(preset_slots):
+        commands = [""] * commands_per_preset
+        if i < filled:
+            config["stringList"]["PresetName"][i] = f"Python_old_{i:06d}_Key{i:06d}"
+            for j in range(rng.randrange(1, commands_per_preset)):
+                commands[j] = f"player.setav {rng.choice(STATS)} {rng.randrange(1000)}"
+        config["stringList"][str(i)] = commands
+    return config
+
+
+def write_workspace(directory, keybinds=10000, ids=100000, commands=500, filled=None):
+    """Write a complete synthetic project plus fake Skyrim Data directory; returns the Data path"""
+    os.makedirs(directory, exist_ok=True)
+    ids_tree = make_ids(ids)
+    commands_tree = make_commands(commands)
+    config_tree = make_config(keybinds, ids_tree, commands_tree)
+
+    for name, tree in (("ids.yaml", ids_tree), ("commands.yaml", commands_tree), ("config.yaml", config_tree)):
+        with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+            yaml.safe_dump(tree, f, sort_keys=False)
+
+    data_path = os.path.join(directory, "Data")
+    storage = os.path.join(data_path, "SKSE", "Plugins", "StorageUtilData")
+    os.makedirs(storage, exist_ok=True)
+    with open(os.path.join(storage, "HybridCommander-Command.json"), 'w', encoding='utf-8') as f:
+        json.dump({"stringList": {}}, f)
+    with open(os.path.join(storage, "HybridCommander-Config.json"), 'w', encoding='utf-8') as f:
+        json.dump(make_hybrid_config(keybinds, keybinds // 2 if filled is None else filled), f, indent=2)
+    return data_path
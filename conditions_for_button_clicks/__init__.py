@@ -0,0 +1,3 @@
+"""
+Automated key pressing for Skyrim: scheduling, input backends and triggers.
+"""
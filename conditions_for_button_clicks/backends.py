@@ -0,0 +1,337 @@
+"""
+Input Backends
+==============
+Pluggable ways of pressing a key. A BackendSelector probes the backends
+once, remembers the first one that works and only re-probes after a press
+fails, so a steady run never pays for detection again.
+"""
+
+import ctypes
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from functools import lru_cache
+
+from conditions_for_button_clicks.macros import compile_macro
+from conditions_for_button_clicks.win32_input import KEYEVENTF_EXTENDEDKEY, KEYEVENTF_KEYUP, KEYEVENTF_SCANCODE
+
+HOLD_SECONDS = 0.05
+AHK_REPLY_TIMEOUT = 5.0   # A press not acknowledged within this is treated as a hung AutoHotkey
+AHK_RETRY_SECONDS = 60.0  # How long a hung AutoHotkey is skipped before it is tried again
+
+AHK_PATHS = [
+    r"C:\Program Files\AutoHotkey\AutoHotkey.exe",
+    r"C:\Program Files (x86)\AutoHotkey\AutoHotkey.exe",
+    r"C:\Users\%USERNAME%\AppData\Local\Programs\AutoHotkey\AutoHotkey.exe"
+]
+
+# Reads one AHK key name per line from stdin and answers "ok" once it is sent.
+# stdout.Read(0) flushes the reply so the Python side is not left waiting.
+AHK_SERVER_SCRIPT = """#NoEnv
+#NoTrayIcon
+#SingleInstance Off
+SetKeyDelay, 10, 50
+stdin := FileOpen("*", "r")
+stdout := FileOpen("*", "w")
+Loop
+{
+    if stdin.AtEOF
+        ExitApp
+    line := Trim(stdin.ReadLine(), " `r`n")
+    if (line = "")
+        continue
+    Send, {%line%}
+    stdout.Write("ok`n")
+    stdout.Read(0)
+}
+"""
+
+
+@lru_cache(maxsize=1)
+def find_autohotkey():
+    """Locate AutoHotkey.exe once per process; returns None when it is not installed"""
+    if sys.platform != "win32":
+        return None
+    try:
+        for path in AHK_PATHS:
+            expanded_path = os.path.expandvars(path)
+            if os.path.exists(expanded_path):
+                return expanded_path
+
+        # Try to find it in PATH
+        result = subprocess.run(['where', 'AutoHotkey.exe'],
+                                capture_output=True, text=True, shell=True)
+        if result.returncode == 0:
+            return result.stdout.strip().split('\n')[0]
+        return None
+    except Exception:
+        return None
+
+
+class InputBackend:
+    """Base class for a way of pressing keys"""
+
+    name = "backend"
+    icon = "✅"
+
+    def available(self):
+        """Cheap check whether this backend can run here"""
+        return True
+
+    def press(self, key):
+        """Press and release a key; returns True on success"""
+        raise NotImplementedError
+
+    def close(self):
+        """Release any resources held by the backend"""
+
+
+class AutoHotkeyBackend(InputBackend):
+    """One long-lived AutoHotkey process fed key names over a pipe"""
+
+    name = "AutoHotkey"
+
+    def __init__(self, ahk_path=None, reply_timeout=AHK_REPLY_TIMEOUT, clock=time.monotonic):
+        self.ahk_path = ahk_path
+        self.reply_timeout = reply_timeout
+        self.clock = clock
+        self.process = None
+        self.replies = None
+        self.script_path = None
+        self.failed_at = None  # When the process last hung; skipped until AHK_RETRY_SECONDS later
+
+    def available(self):
+        """AutoHotkey must be installed and not have hung recently"""
+        if self.failed_at is not None and self.clock() - self.failed_at < AHK_RETRY_SECONDS:
+            return False
+        if self.ahk_path is None:
+            self.ahk_path = find_autohotkey()
+        return self.ahk_path is not None
+
+    def start(self):
+        """Write the server script once and launch AutoHotkey if it is not running"""
+        if self.process is not None and self.process.poll() is None:
+            return
+        self.close()
+        if self.script_path is None:
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.ahk', delete=False) as f:
+                f.write(AHK_SERVER_SCRIPT)
+                self.script_path = f.name
+        self.launch([self.ahk_path, "/ErrorStdOut", self.script_path])
+
+    def launch(self, command):
+        """Start the process plus a reader thread, so replies can be waited for with a deadline"""
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1)
+        self.replies = queue.Queue()
+        threading.Thread(target=read_replies, args=(self.process.stdout, self.replies), daemon=True).start()
+
+    def press(self, key):
+        """Send the key name down the pipe and wait (at most reply_timeout) for the acknowledgement"""
+        try:
+            self.start()
+            self.process.stdin.write(key.ahk + "\n")
+            self.process.stdin.flush()
+            reply = self.replies.get(timeout=self.reply_timeout)
+        except (OSError, ValueError):
+            return False
+        except queue.Empty:
+            # Hung: kill it so the input thread is free again, and let the selector fall back
+            self.process.kill()
+            self.process = None
+            self.failed_at = self.clock()
+            return False
+        return reply is not None and reply.strip() == "ok"
+
+    def close(self):
+        """Stop the AutoHotkey process (the script file is kept for a restart)"""
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=2)
+        except Exception:
+            self.process.kill()
+        self.process = None
+
+    def __del__(self):
+        self.close()
+        if self.script_path:
+            try:
+                os.unlink(self.script_path)
+            except OSError:
+                pass
+
+
+def read_replies(stream, replies):
+    """Forward each line from the AutoHotkey process into a queue; None marks the end of output"""
+    try:
+        for line in stream:
+            replies.put(line)
+    except (OSError, ValueError):
+        pass
+    replies.put(None)
+
+
+class Win32Backend(InputBackend):
+    """Common base for backends that call user32 directly"""
+
+    def available(self):
+        """Requires Windows"""
+        return sys.platform == "win32"
+
+
+class HardwareScanBackend(Win32Backend):
+    """keybd_event with hardware scan codes - bypasses most game filters"""
+
+    name = "Hardware scan codes"
+
+    def press(self, key):
+        """Press a key using hardware scan codes"""
+        try:
+            flags = KEYEVENTF_SCANCODE | (KEYEVENTF_EXTENDEDKEY if key.extended else 0)
+            ctypes.windll.user32.keybd_event(0, key.scan, flags, 0)  # Key down with scan code
+            time.sleep(HOLD_SECONDS)
+            ctypes.windll.user32.keybd_event(0, key.scan, flags | KEYEVENTF_KEYUP, 0)  # Key up with scan code
+            return True
+        except Exception:
+            return False
+
+
+class SendInputBackend(Win32Backend):
+    """SendInput with scan codes or virtual-key codes
+
+    A single key is two calls, down then up, HOLD_SECONDS apart. Skyrim
+    samples keyboard state once per frame, so a down and up sent in one
+    call usually land between two frames and the press is never seen.
+    With hold=0 both events go out in one SendInput call.
+    """
+
+    def __init__(self, scan_codes=True, hold=HOLD_SECONDS):
+        self.scan_codes = scan_codes
+        self.hold = hold
+        self.name = "Direct input scan codes" if scan_codes else "SendInput API"
+        self.compiled = {}  # Key name -> prebuilt INPUT arrays
+
+    def compile(self, key):
+        """Prebuilt INPUT arrays for a key, built on its first press"""
+        macro = self.compiled.get(key.name)
+        if macro is None:
+            macro = self.compiled[key.name] = compile_macro(
+                key.name, {"key": key.name, "hold": self.hold}, self.scan_codes)
+        return macro
+
+    def press(self, key):
+        """Send key down, hold, then key up (one call when there is no hold)"""
+        try:
+            return self.compile(key).play()
+        except Exception:
+            return False
+
+
+class KeybdEventBackend(Win32Backend):
+    """Fallback method using keybd_event with virtual-key codes"""
+
+    name = "fallback method"
+    icon = "⚠️ "
+
+    def press(self, key):
+        """Press a key using keybd_event"""
+        try:
+            ctypes.windll.user32.keybd_event(key.vk, 0, 0, 0)  # Key down
+            time.sleep(HOLD_SECONDS)
+            ctypes.windll.user32.keybd_event(key.vk, 0, KEYEVENTF_KEYUP, 0)  # Key up
+            return True
+        except Exception:
+            return False
+
+
+class RecordingBackend(InputBackend):
+    """Fake backend that records presses; lets backend selection and fallback be tested off Windows"""
+
+    def __init__(self, name="recording", fail=0, is_available=True, clock=time.monotonic):
+        self.name = name
+        self.fail = fail  # Number of upcoming presses to fail, or True to always fail
+        self.is_available = is_available
+        self.clock = clock
+        self.presses = []
+        self.attempts = 0
+
+    def available(self):
+        """Availability is set by the test"""
+        return self.is_available
+
+    def press(self, key):
+        """Record the key and time unless a failure is queued"""
+        self.attempts += 1
+        if self.fail is True:
+            return False
+        if self.fail:
+            self.fail -= 1
+            return False
+        self.presses.append((self.clock(), key.name))
+        return True
+
+
+class BackendSelector:
+    """Remembers the working backend and falls back in preference order on failure"""
+
+    def __init__(self, backends, clock=time.perf_counter):
+        self.backends = list(backends)
+        self.current = None
+        self.probes = 0
+        self.clock = clock
+        self.last_attempts = []  # (backend name, seconds, ok) for the most recent press
+
+    def select(self, exclude=None):
+        """Pick the first available backend, skipping the one that just failed"""
+        self.probes += 1
+        for backend in self.backends:
+            if backend is not exclude and backend.available():
+                return backend
+        return None
+
+    def attempt(self, backend, key):
+        """Press with one backend, recording how long the attempt took"""
+        started = self.clock()
+        ok = backend.press(key)
+        self.last_attempts.append((backend.name, self.clock() - started, ok))
+        return ok
+
+    def press(self, key):
+        """Press with the remembered backend; re-probe only after a failure. Returns the backend or None"""
+        self.last_attempts = []
+        if self.current is None:
+            self.current = self.select()
+        if self.current is not None and self.attempt(self.current, key):
+            return self.current
+
+        failed = self.current
+        self.probes += 1
+        for backend in self.backends:
+            if backend is failed or not backend.available():
+                continue
+            if self.attempt(backend, key):
+                self.current = backend
+                return backend
+        self.current = None
+        return None
+
+    def close(self):
+        """Close every backend"""
+        for backend in self.backends:
+            backend.close()
+
+
+def create_default_selector():
+    """Backends in order of preference for games"""
+    return BackendSelector([
+        AutoHotkeyBackend(),                 # Most reliable for games
+        HardwareScanBackend(),               # Bypasses most game input filters
+        SendInputBackend(scan_codes=True),
+        SendInputBackend(scan_codes=False),
+        KeybdEventBackend(),
+    ])
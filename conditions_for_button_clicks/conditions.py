@@ -0,0 +1,337 @@
+"""
+Log Conditions
+==============
+Presses keys in reaction to game events instead of on a fixed timer.
+Papyrus and SKSE plugin logs are tailed incrementally from saved offsets
+(rotation and truncation start the file over), new lines are matched
+against every rule in one combined regex pass, and matching rules fire
+their key, macro or HybridCommander preset once their cheap predicates
+pass (cooldown first, then the foreground-window check). Rules wait
+DEFAULT_COOLDOWN seconds between fires unless they set their own
+`cooldown`, so a burst of matching log lines presses once, not once per
+line.
+
+Example clicker.yaml section:
+
+    conditions:
+      rules:
+        - name: low health
+          pattern: "health (is )?low"
+          ignore_case: true
+          preset: restore           # preset name, or the keybind key (Numpad3)
+          cooldown: 30
+          window: "Skyrim"          # regex on the foreground window title
+        - name: quest done
+          pattern: "QuestComplete"
+          key: F5
+"""
+
+import ctypes
+import glob
+import json
+import os
+import re
+import sys
+import time
+
+from conditions_for_button_clicks.keys import key_for_dx_code
+
+DEFAULT_LOGS = [
+    "~/Documents/My Games/Skyrim Special Edition/Logs/Script/Papyrus.0.log",
+    "~/Documents/My Games/Skyrim Special Edition/SKSE/*.log",
+]
+# Same install location the preset generator defaults to
+DEFAULT_HYBRID_CONFIG = (r"C:\Program Files (x86)\Steam\steamapps\common\Skyrim Special Edition\Data"
+                         r"\SKSE\Plugins\StorageUtilData\HybridCommander-Config.json")
+DEFAULT_POLL_INTERVAL = 0.5
+DEFAULT_COOLDOWN = 1.0  # Set cooldown: 0 to fire on every matching line
+GROUP_REFERENCE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")  # \1, (?P=name), (?(1)yes|no)
+READ_CHUNK = 1024 * 1024
+
+
+class LogTailer:
+    """Reads lines appended to one file since the last call"""
+
+    def __init__(self, path, offset=None, file_id=None):
+        self.path = path
+        self.offset = offset    # None = start at the current end of the file
+        self.file_id = file_id  # st_ino; a new id means the log was rotated
+        self.partial = b""
+
+    def read_lines(self):
+        """Return complete new lines; restarts from 0 after rotation or truncation"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return []
+        if self.offset is None:
+            self.offset, self.file_id = stat.st_size, stat.st_ino
+            return []
+        if stat.st_ino != self.file_id or stat.st_size < self.offset:
+            self.offset, self.file_id, self.partial = 0, stat.st_ino, b""
+        if stat.st_size == self.offset:
+            return []
+
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read(min(stat.st_size - self.offset, READ_CHUNK))
+        self.offset += len(data)
+
+        *lines, self.partial = (self.partial + data).split(b"\n")
+        return [line.rstrip(b"\r").decode('utf-8', 'replace') for line in lines]
+
+    def state(self):
+        # An unfinished last line is re-read after a restart rather than lost
+        return {"offset": self.offset - len(self.partial), "file_id": self.file_id}
+
+
+class LogSet:
+    """Tailers for a list of paths and globs, with offsets persisted between runs"""
+
+    def __init__(self, patterns, state_file=None):
+        self.patterns = [os.path.expandvars(os.path.expanduser(pattern)) for pattern in patterns]
+        self.state_file = state_file
+        self.tailers = {}
+        self.saved = self.load_state()
+        self.started = False
+
+    def load_state(self):
+        if not self.state_file or not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_state(self):
+        """Write current offsets so a restart resumes instead of replaying or skipping lines"""
+        if not self.state_file:
+            return
+        state = {path: tailer.state() for path, tailer in self.tailers.items() if tailer.offset is not None}
+        if state == self.saved:
+            return
+        tmp = self.state_file + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp, self.state_file)
+        self.saved = state
+
+    def refresh(self):
+        """Pick up log files that appeared since the last poll"""
+        for pattern in self.patterns:
+            for path in (glob.glob(pattern) if glob.has_magic(pattern) else [pattern]):
+                if path in self.tailers:
+                    continue
+                saved = self.saved.get(path)
+                if saved:
+                    tailer = LogTailer(path, saved.get("offset"), saved.get("file_id"))
+                elif self.started:
+                    tailer = LogTailer(path, 0)  # Created while running: read it all
+                else:
+                    tailer = LogTailer(path)     # First run: only new lines
+                self.tailers[path] = tailer
+        self.started = True
+
+    def read_lines(self):
+        """Yield (path, line) for every new line across all logs"""
+        self.refresh()
+        for path, tailer in self.tailers.items():
+            for line in tailer.read_lines():
+                yield path, line
+
+
+class Rule:
+    """A log pattern (or none, for timer-only rules) mapped to an action"""
+
+    def __init__(self, name, action, target, pattern=None, ignore_case=False, cooldown=DEFAULT_COOLDOWN,
+                 every=None, window=None):
+        self.name = name
+        self.action = action  # "key", "macro" or "preset"
+        self.target = target
+        self.pattern = pattern
+        self.ignore_case = ignore_case
+        try:
+            self.regex = re.compile(pattern, re.IGNORECASE if ignore_case else 0) if pattern else None
+        except re.error as e:
+            raise ValueError(f"Invalid pattern in rule {name}: {e}")
+        self.cooldown = float(cooldown)
+        self.every = float(every) if every else None
+        self.window = re.compile(window, re.IGNORECASE) if window else None
+        self.last_fired = None
+        self.fires = 0
+
+    @classmethod
+    def from_config(cls, entry, index):
+        actions = [action for action in ("key", "macro", "preset") if action in entry]
+        if len(actions) != 1:
+            raise ValueError(f"Rule {entry.get('name', index)} needs exactly one of key, macro or preset")
+        if not entry.get("pattern") and not entry.get("every"):
+            raise ValueError(f"Rule {entry.get('name', index)} needs a pattern or an every: interval")
+        action = actions[0]
+        return cls(entry.get("name", f"rule{index}"), action, str(entry[action]), entry.get("pattern"),
+                   entry.get("ignore_case", False), entry.get("cooldown", DEFAULT_COOLDOWN), entry.get("every"),
+                   entry.get("window"))
+
+    def timer_ok(self, now):
+        """Cheapest predicate: cooldown since the last fire"""
+        return self.last_fired is None or now - self.last_fired >= self.cooldown
+
+    def timer_due(self, now):
+        """Timer-only rules (no pattern) fire every `every` seconds"""
+        return self.every is not None and not self.pattern and (self.last_fired is None or now - self.last_fired >= self.every)
+
+
+def combine_patterns(rules):
+    """One alternation of the rules' patterns that rejects most lines in a single scan
+
+    Returns (regex, rules it cannot stand in for). Joining patterns renumbers
+    their groups and repeats group names, so patterns that refer to a group
+    (backreferences, conditionals) or name one are checked on their own;
+    if the rest do not compile together (e.g. a global inline flag such as
+    (?i) inside the alternation) every rule is checked on its own.
+    """
+    rules = [rule for rule in rules if rule.regex is not None]
+    combinable = [rule for rule in rules if not rule.regex.groupindex and not GROUP_REFERENCE.search(rule.pattern)]
+    if not combinable:
+        return None, rules
+    parts = [f"(?i:{rule.pattern})" if rule.ignore_case else f"(?:{rule.pattern})" for rule in combinable]
+    try:
+        combined = re.compile("|".join(parts))
+    except re.error:
+        return None, rules
+    return combined, [rule for rule in rules if rule not in combinable]
+
+
+def foreground_window_title():
+    """Title of the focused window, or None when it cannot be read (e.g. not Windows)"""
+    if sys.platform != "win32":
+        return None
+    try:
+        user32 = ctypes.windll.user32
+        hwnd = user32.GetForegroundWindow()
+        length = user32.GetWindowTextLengthW(hwnd)
+        buffer = ctypes.create_unicode_buffer(length + 1)
+        user32.GetWindowTextW(hwnd, buffer, length + 1)
+        return buffer.value
+    except (OSError, AttributeError):
+        return None
+
+
+class PresetHotkeys:
+    """Maps HybridCommander preset names to the key bound to them, re-read when the config changes"""
+
+    def __init__(self, config_path):
+        self.config_path = config_path
+        self.stat = None
+        self.bindings = {}
+
+    def reload(self):
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            self.bindings = {}
+            return
+        if (stat.st_mtime_ns, stat.st_size) == self.stat:
+            return
+        with open(self.config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        names = config.get("stringList", {}).get("PresetName", [])
+        ints = config.get("intList", {})
+        bindings = {}
+        for code, modifier, preset in zip(ints.get("HotkeyCode", []), ints.get("HotkeyModifier", []),
+                                          ints.get("HotkeyPreset", [])):
+            key = key_for_dx_code(code) if code >= 0 else None
+            if key is None or not (0 <= preset < len(names)) or not names[preset]:
+                continue
+            chord = key.name
+            modifier_key = key_for_dx_code(modifier) if modifier > 0 else None
+            if modifier_key is not None:
+                chord = f"{modifier_key.name}+{key.name}"
+            bindings.setdefault(names[preset].lower(), chord)
+        self.bindings = bindings
+        self.stat = (stat.st_mtime_ns, stat.st_size)
+
+    def chord_for(self, preset):
+        """Key (or modifier+key chord) bound to a preset, matched by full name or its _<suffix>"""
+        self.reload()
+        lowered = preset.lower()
+        if lowered in self.bindings:
+            return self.bindings[lowered]
+        for name, chord in self.bindings.items():
+            if name.endswith(f"_{lowered}") or f"_{lowered}_" in name:
+                return chord
+        return None
+
+
+class ConditionEngine:
+    """Matches new log lines and timers against rules and fires their actions"""
+
+    def __init__(self, rules, logs, fire, clock=time.monotonic, window_title=foreground_window_title):
+        self.rules = list(rules)
+        self.logs = logs
+        self.fire = fire  # fire(rule, line) -> result
+        self.clock = clock
+        self.window_title = window_title
+        self.pattern_rules = [rule for rule in self.rules if rule.regex is not None]
+        self.combined, self.separate_rules = combine_patterns(self.pattern_rules)
+        self.lines = 0
+
+    def matching_rules(self, line):
+        """Rules whose pattern matches the line, in rule order; the combined regex rejects most lines in one pass"""
+        if self.combined is not None and self.combined.search(line) is None:
+            return [rule for rule in self.separate_rules if rule.regex.search(line)]
+        # The alternation only reports the leftmost match, so every rule is checked on its own
+        return [rule for rule in self.pattern_rules if rule.regex.search(line)]
+
+    def allowed(self, rule, now, title_cache):
+        """Evaluate predicates cheapest first: cooldown, then foreground window"""
+        if not rule.timer_ok(now):
+            return False
+        if rule.window is not None:
+            if "title" not in title_cache:
+                title_cache["title"] = self.window_title()
+            title = title_cache["title"]
+            if title is None or not rule.window.search(title):
+                return False
+        return True
+
+    def poll(self):
+        """Read new log lines, check timers and fire every rule that passes; returns (rule, line) fired"""
+        fired = []
+        title_cache = {}  # Foreground window read at most once per poll
+        candidates = []
+        if self.pattern_rules:
+            for _path, line in self.logs.read_lines():
+                self.lines += 1
+                candidates += [(rule, line) for rule in self.matching_rules(line)]
+        now = self.clock()
+        candidates += [(rule, None) for rule in self.rules if rule.timer_due(now)]
+
+        for rule, line in candidates:
+            now = self.clock()
+            if not self.allowed(rule, now, title_cache):
+                continue
+            rule.last_fired = now
+            rule.fires += 1
+            self.fire(rule, line)
+            fired.append((rule, line))
+        if self.pattern_rules:
+            self.logs.save_state()
+        return fired
+
+    def run(self, stop, interval=DEFAULT_POLL_INTERVAL):
+        """Poll until `stop` (a threading.Event) is set"""
+        while not stop.is_set():
+            self.poll()
+            stop.wait(interval)
+
+
+def load_engine(section, fire, state_file=None):
+    """Build a ConditionEngine from the conditions section of clicker.yaml (None when there are no rules)"""
+    section = section or {}
+    rules = [Rule.from_config(entry, index) for index, entry in enumerate(section.get('rules') or [])]
+    if not rules:
+        return None
+    logs = LogSet(section.get('logs') or DEFAULT_LOGS, state_file)
+    return ConditionEngine(rules, logs, fire)
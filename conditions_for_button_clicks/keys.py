@@ -0,0 +1,99 @@
+"""
+Key Table
+=========
+Virtual-key codes, hardware scan codes (which are also the DirectX key
+codes HybridCommander stores for hotkeys) and AutoHotkey names for the
+keys the auto-clicker can press.
+"""
+
+from collections import namedtuple
+
+Key = namedtuple("Key", "name vk scan extended ahk")
+
+_KEYS = [
+    # Numpad
+    Key("Numpad0", 0x60, 0x52, False, "Numpad0"),
+    Key("Numpad1", 0x61, 0x4F, False, "Numpad1"),
+    Key("Numpad2", 0x62, 0x50, False, "Numpad2"),
+    Key("Numpad3", 0x63, 0x51, False, "Numpad3"),
+    Key("Numpad4", 0x64, 0x4B, False, "Numpad4"),
+    Key("Numpad5", 0x65, 0x4C, False, "Numpad5"),
+    Key("Numpad6", 0x66, 0x4D, False, "Numpad6"),
+    Key("Numpad7", 0x67, 0x47, False, "Numpad7"),
+    Key("Numpad8", 0x68, 0x48, False, "Numpad8"),
+    Key("Numpad9", 0x69, 0x49, False, "Numpad9"),
+    Key("NumpadMultiply", 0x6A, 0x37, False, "NumpadMult"),
+    Key("NumpadPlus", 0x6B, 0x4E, False, "NumpadAdd"),
+    Key("NumpadMinus", 0x6D, 0x4A, False, "NumpadSub"),
+    Key("NumpadPeriod", 0x6E, 0x53, False, "NumpadDot"),
+    Key("NumpadDivide", 0x6F, 0x35, True, "NumpadDiv"),
+    Key("NumpadEnter", 0x0D, 0x1C, True, "NumpadEnter"),
+    # Function keys
+    Key("F1", 0x70, 0x3B, False, "F1"),
+    Key("F2", 0x71, 0x3C, False, "F2"),
+    Key("F3", 0x72, 0x3D, False, "F3"),
+    Key("F4", 0x73, 0x3E, False, "F4"),
+    Key("F5", 0x74, 0x3F, False, "F5"),
+    Key("F6", 0x75, 0x40, False, "F6"),
+    Key("F7", 0x76, 0x41, False, "F7"),
+    Key("F8", 0x77, 0x42, False, "F8"),
+    Key("F9", 0x78, 0x43, False, "F9"),
+    Key("F10", 0x79, 0x44, False, "F10"),
+    Key("F11", 0x7A, 0x57, False, "F11"),
+    Key("F12", 0x7B, 0x58, False, "F12"),
+    # Modifiers and common keys
+    Key("Shift", 0xA0, 0x2A, False, "LShift"),
+    Key("Ctrl", 0xA2, 0x1D, False, "LCtrl"),
+    Key("Alt", 0xA4, 0x38, False, "LAlt"),
+    Key("Space", 0x20, 0x39, False, "Space"),
+    Key("Enter", 0x0D, 0x1C, False, "Enter"),
+    Key("Escape", 0x1B, 0x01, False, "Escape"),
+    Key("Tab", 0x09, 0x0F, False, "Tab"),
+    Key("Backspace", 0x08, 0x0E, False, "Backspace"),
+    Key("Console", 0xC0, 0x29, False, "vkC0"),  # ~ / ` opens the Skyrim console
+]
+
+# Letters and digits
+_LETTER_SCANS = dict(zip("QWERTYUIOP", range(0x10, 0x1A)))
+_LETTER_SCANS.update(zip("ASDFGHJKL", range(0x1E, 0x27)))
+_LETTER_SCANS.update(zip("ZXCVBNM", range(0x2C, 0x33)))
+_KEYS += [Key(letter, ord(letter), scan, False, letter.lower()) for letter, scan in sorted(_LETTER_SCANS.items())]
+_KEYS += [Key(digit, ord(digit), 0x0B if digit == "0" else 0x01 + int(digit), False, digit) for digit in "0123456789"]
+
+ALIASES = {
+    "numpaddot": "NumpadPeriod",
+    "numpaddecimal": "NumpadPeriod",
+    "numpadadd": "NumpadPlus",
+    "numpadsub": "NumpadMinus",
+    "numpadmult": "NumpadMultiply",
+    "numpaddiv": "NumpadDivide",
+    "control": "Ctrl",
+    "lctrl": "Ctrl",
+    "lshift": "Shift",
+    "lalt": "Alt",
+    "esc": "Escape",
+    "return": "Enter",
+    "tilde": "Console",
+    "grave": "Console",
+}
+
+KEYS = {key.name.lower(): key for key in _KEYS}
+KEYS_BY_SCAN = {}
+for _key in _KEYS:
+    KEYS_BY_SCAN.setdefault((_key.scan | 0x80) if _key.extended else _key.scan, _key)
+
+
+def get_key(name):
+    """Look up a key by name (case-insensitive, with common aliases)"""
+    if isinstance(name, Key):
+        return name
+    lowered = str(name).strip().lower()
+    key = KEYS.get(lowered) or KEYS.get(ALIASES.get(lowered, "").lower())
+    if key is None:
+        raise ValueError(f"Unknown key: {name}")
+    return key
+
+
+def key_for_dx_code(code):
+    """Look up a key by its DirectX key code (as stored in HybridCommander hotkeys)"""
+    return KEYS_BY_SCAN.get(code)
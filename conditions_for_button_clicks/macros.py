@@ -0,0 +1,161 @@
+"""
+Key Macros
+==========
+Key sequences and chords from clicker.yaml, compiled once into ctypes
+INPUT arrays. Every run of events without a delay between them goes out
+in a single SendInput call, so a chord such as Ctrl+Shift+S costs one
+call instead of one call (and a 50ms sleep) per key.
+
+Compiling only builds structures and works on any platform; sending
+needs Windows (or a replacement `sender`).
+"""
+
+import time
+
+from conditions_for_button_clicks.keys import get_key
+from conditions_for_button_clicks.win32_input import INPUT, keyboard_input, send_input
+
+
+class Segment:
+    """A prebuilt INPUT array sent in one call, followed by an optional wait"""
+
+    __slots__ = ("events", "labels", "delay")
+
+    def __init__(self, events, labels, delay):
+        self.events = events  # ctypes INPUT array, reused on every play
+        self.labels = labels  # ("Ctrl", "down"), ... for inspection and logging
+        self.delay = delay
+
+    def __len__(self):
+        return len(self.labels)
+
+
+class Macro:
+    """A compiled key sequence"""
+
+    def __init__(self, name, segments):
+        self.name = name
+        self.segments = segments
+
+    @property
+    def event_count(self):
+        return sum(len(segment) for segment in self.segments)
+
+    @property
+    def call_count(self):
+        return sum(1 for segment in self.segments if len(segment))
+
+    def play(self, sender=send_input, sleep=time.sleep):
+        """Send every segment; returns True when Windows accepted all events"""
+        ok = True
+        for segment in self.segments:
+            if len(segment):
+                ok = sender(segment.events) == len(segment) and ok
+            if segment.delay:
+                sleep(segment.delay)
+        return ok
+
+    def __repr__(self):
+        return f"Macro({self.name!r}, events={self.event_count}, calls={self.call_count})"
+
+
+def parse_chord(text):
+    """'Ctrl+Shift+S' -> [Key, Key, Key]"""
+    names = [part for part in str(text).split("+") if part.strip()]
+    if not names:
+        raise ValueError(f"Empty key chord: {text!r}")
+    return [get_key(name) for name in names]
+
+
+def expand_step(step):
+    """Turn one config step into [(events, delay_after), ...] where events are (key, up) pairs"""
+    if isinstance(step, (int, float)) and not isinstance(step, bool):
+        return [([], float(step))]  # Bare number = wait
+    if isinstance(step, str):
+        step = {"key": step}
+    if not isinstance(step, dict):
+        raise ValueError(f"Invalid macro step: {step!r}")
+
+    delay = float(step.get("delay", 0))
+    parts = []
+    events = []
+    if "key" in step:
+        keys = parse_chord(step["key"])
+        downs = [(key, False) for key in keys]
+        ups = [(key, True) for key in reversed(keys)]  # Release in reverse order
+        hold = float(step.get("hold", 0))
+        if hold:
+            parts.append((downs, hold))
+            events = ups
+        else:
+            events = downs + ups
+    if "down" in step:
+        events += [(key, False) for key in parse_chord(step["down"])]
+    if "up" in step:
+        events += [(key, True) for key in reversed(parse_chord(step["up"]))]
+    if not events and not parts and "delay" not in step:
+        raise ValueError(f"Macro step needs key, down, up or delay: {step!r}")
+    parts.append((events, delay))
+    return parts
+
+
+def build_segment(events, delay, scan_codes):
+    """Pack (key, up) events into one reusable ctypes INPUT array"""
+    array = (INPUT * len(events))(*(keyboard_input(key, key_up=up, scan_codes=scan_codes) for key, up in events))
+    labels = tuple((key.name, "up" if up else "down") for key, up in events)
+    return Segment(array, labels, delay)
+
+
+def compile_macro(name, steps, scan_codes=True):
+    """Compile config steps into segments, merging events that have no delay between them"""
+    if isinstance(steps, (str, dict)):
+        steps = [steps]
+
+    segments = []
+    pending = []
+
+    def flush(delay):
+        if pending or delay:
+            segments.append(build_segment(pending, delay, scan_codes))
+            pending.clear()
+
+    for step in steps:
+        for events, delay in expand_step(step):
+            pending.extend(events)
+            if delay:
+                flush(delay)
+    flush(0)
+    if not segments:
+        raise ValueError(f"Macro {name} has no steps")
+    return Macro(name, segments)
+
+
+class MacroEngine:
+    """Named macros from config plus inline chords, each compiled once"""
+
+    def __init__(self, definitions=None, scan_codes=True, sender=send_input, sleep=time.sleep):
+        self.scan_codes = scan_codes
+        self.sender = sender
+        self.sleep = sleep
+        self.macros = {}
+        for name, steps in (definitions or {}).items():
+            self.macros[name.lower()] = compile_macro(name, steps, scan_codes)
+
+    def knows(self, name):
+        """True for a named macro or an inline chord such as Ctrl+S"""
+        return str(name).lower() in self.macros or "+" in str(name).strip("+")
+
+    def get(self, name):
+        """Return the compiled macro, compiling inline chords on first use"""
+        lowered = str(name).lower()
+        macro = self.macros.get(lowered)
+        if macro is None:
+            macro = self.macros[lowered] = compile_macro(name, [name], self.scan_codes)
+        return macro
+
+    def play(self, name):
+        """Play a macro; returns True on success"""
+        try:
+            return self.get(name).play(self.sender, self.sleep)
+        except (OSError, AttributeError):
+            return False  # No user32 (not on Windows)
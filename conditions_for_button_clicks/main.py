@@ -1,105 +1,39 @@
 """
-Automated Numpad 1 Key Presser for Skyrim Special Edition
+Automated Key Presser for Skyrim Special Edition
+Presses one or more keys on independent schedules (see clicker.yaml).
 Uses multiple methods including AutoHotkey for maximum compatibility.
 Must run as Administrator for Skyrim compatibility.
 """
 
 import ctypes
-import ctypes.wintypes
 import time
 import signal
 import sys
-import subprocess
 import os
-import tempfile
-
-
-# Windows API constants
-VK_NUMPAD1 = 0x61
-KEYEVENTF_KEYUP = 0x0002
-INPUT_KEYBOARD = 1
-
-# Input structures for SendInput
-class KEYBDINPUT(ctypes.Structure):
-    _fields_ = [
-        ("wVk", ctypes.wintypes.WORD),
-        ("wScan", ctypes.wintypes.WORD),
-        ("dwFlags", ctypes.wintypes.DWORD),
-        ("time", ctypes.wintypes.DWORD),
-        ("dwExtraInfo", ctypes.POINTER(ctypes.wintypes.ULONG))
-    ]
-
-class INPUT(ctypes.Structure):
-    class _INPUT(ctypes.Union):
-        _fields_ = [("ki", KEYBDINPUT)]
-    
-    _anonymous_ = ("_input",)
-    _fields_ = [
-        ("type", ctypes.wintypes.DWORD),
-        ("_input", _INPUT)
-    ]
+import threading
 
+if __package__ in (None, ""):
+    # Allow running directly as conditions_for_button_clicks/main.py
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def check_autohotkey():
-    """Check if AutoHotkey is installed"""
-    try:
-        # Try common AutoHotkey installation paths
-        ahk_paths = [
-            r"C:\Program Files\AutoHotkey\AutoHotkey.exe",
-            r"C:\Program Files (x86)\AutoHotkey\AutoHotkey.exe",
-            r"C:\Users\%USERNAME%\AppData\Local\Programs\AutoHotkey\AutoHotkey.exe"
-        ]
-        
-        for path in ahk_paths:
-            expanded_path = os.path.expandvars(path)
-            if os.path.exists(expanded_path):
-                return expanded_path
-        
-        # Try to find it in PATH
-        result = subprocess.run(['where', 'AutoHotkey.exe'], 
-                              capture_output=True, text=True, shell=True)
-        if result.returncode == 0:
-            return result.stdout.strip().split('\n')[0]
-        
-        return None
-    except:
-        return None
+from conditions_for_button_clicks.backends import create_default_selector, find_autohotkey
+from conditions_for_button_clicks.conditions import (
+    DEFAULT_HYBRID_CONFIG, DEFAULT_POLL_INTERVAL, PresetHotkeys, load_engine
+)
+from conditions_for_button_clicks.keys import get_key
+from conditions_for_button_clicks.macros import MacroEngine
+from conditions_for_button_clicks.scheduler import Job, Scheduler
+from conditions_for_button_clicks.telemetry import (
+    DEFAULT_CAPACITY, PressOutcome, Telemetry, format_summary, install_export_handler
+)
 
 
-def press_numpad1_autohotkey():
-    """Press numpad 1 using AutoHotkey - most reliable for games"""
-    try:
-        ahk_path = check_autohotkey()
-        if not ahk_path:
-            return False
-        
-        # Create temporary AutoHotkey script
-        ahk_script = """
-; Skyrim numpad 1 press
-Send, {Numpad1}
-Sleep, 50
-ExitApp
-        """
-        
-        # Write script to temp file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.ahk', delete=False) as f:
-            f.write(ahk_script)
-            temp_script = f.name
-        
-        try:
-            # Run AutoHotkey script
-            result = subprocess.run([ahk_path, temp_script], 
-                                  timeout=5, capture_output=True)
-            return result.returncode == 0
-        finally:
-            # Clean up temp file
-            try:
-                os.unlink(temp_script)
-            except:
-                pass
-                
-    except Exception as e:
-        return False
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "clicker.yaml")
+DEFAULT_JOBS = [{"key": "Numpad1", "interval": 30}]
+CONDITION_STATE_FILE = os.path.join(os.path.dirname(CONFIG_FILE), ".log_offsets.json")
+
+# Scheduled jobs and log conditions press from different threads; backends are not thread-safe
+_input_lock = threading.Lock()
 
 
 def is_admin():
@@ -110,134 +44,159 @@ def is_admin():
         return False
 
 
-def press_numpad1_hardware():
-    """Press numpad 1 using hardware scan codes - bypasses most game filters"""
-    try:
-        # Hardware scan code for Numpad 1
-        NUMPAD1_SCANCODE = 0x4F
-        
-        # Send hardware scan code directly
-        ctypes.windll.user32.keybd_event(0, NUMPAD1_SCANCODE, 0x0008, 0)  # Key down with scan code
-        time.sleep(0.05)
-        ctypes.windll.user32.keybd_event(0, NUMPAD1_SCANCODE, 0x0008 | 0x0002, 0)  # Key up with scan code
-        return True
-    except:
-        return False
+_selector = None
 
 
-def press_numpad1_direct_input():
-    """Press numpad 1 using direct input structures"""
-    try:
-        # More advanced SendInput with scan codes
-        key_down = INPUT()
-        key_down.type = INPUT_KEYBOARD
-        key_down.ki.wVk = 0  # No virtual key
-        key_down.ki.wScan = 0x4F  # Hardware scan code for Numpad 1
-        key_down.ki.dwFlags = 0x0008  # KEYEVENTF_SCANCODE
-        key_down.ki.time = 0
-        key_down.ki.dwExtraInfo = None
-        
-        key_up = INPUT()
-        key_up.type = INPUT_KEYBOARD
-        key_up.ki.wVk = 0
-        key_up.ki.wScan = 0x4F
-        key_up.ki.dwFlags = 0x0008 | 0x0002  # KEYEVENTF_SCANCODE | KEYEVENTF_KEYUP
-        key_up.ki.time = 0
-        key_up.ki.dwExtraInfo = None
-        
-        # Send both events
-        result1 = ctypes.windll.user32.SendInput(1, ctypes.byref(key_down), ctypes.sizeof(INPUT))
-        time.sleep(0.05)
-        result2 = ctypes.windll.user32.SendInput(1, ctypes.byref(key_up), ctypes.sizeof(INPUT))
-        
-        return result1 == 1 and result2 == 1
-    except:
-        return False
+def get_selector():
+    """Create the backend selector once; it remembers the working backend between presses"""
+    global _selector
+    if _selector is None:
+        _selector = create_default_selector()
+    return _selector
 
 
-def press_numpad1_sendinput():
-    """Press numpad 1 using SendInput API - most reliable for games"""
+def press_key(key):
+    """Press a key with the remembered backend; returns the backend name used"""
+    key = get_key(key)
+    current_time = time.strftime("%Y-%m-%d %H:%M:%S")
+    
+    backend = get_selector().press(key)
+    if backend is not None:
+        print(f"[{current_time}] {backend.icon} Pressed {key.name} ({backend.name})")
+        return backend.name
+    
+    print(f"[{current_time}] ❌ Failed to press {key.name} (all methods failed)")
+    return None
+
+
+def click_numpad_1():
+    """Press numpad 1 using the most reliable methods for games"""
+    return press_key("Numpad1")
+
+
+def read_clicker_config(path=CONFIG_FILE):
+    """Read clicker.yaml, returning {} when it is missing or unreadable"""
+    if not os.path.exists(path):
+        return {}
     try:
-        # Create key down input
-        key_down = INPUT()
-        key_down.type = INPUT_KEYBOARD
-        key_down.ki.wVk = VK_NUMPAD1
-        key_down.ki.wScan = 0
-        key_down.ki.dwFlags = 0
-        key_down.ki.time = 0
-        key_down.ki.dwExtraInfo = None
-        
-        # Create key up input
-        key_up = INPUT()
-        key_up.type = INPUT_KEYBOARD
-        key_up.ki.wVk = VK_NUMPAD1
-        key_up.ki.wScan = 0
-        key_up.ki.dwFlags = KEYEVENTF_KEYUP
-        key_up.ki.time = 0
-        key_up.ki.dwExtraInfo = None
-        
-        # Send key down
-        result1 = ctypes.windll.user32.SendInput(1, ctypes.byref(key_down), ctypes.sizeof(INPUT))
-        time.sleep(0.05)  # Hold key for 50ms
-        
-        # Send key up
-        result2 = ctypes.windll.user32.SendInput(1, ctypes.byref(key_up), ctypes.sizeof(INPUT))
-        
-        return result1 == 1 and result2 == 1
+        import yaml
+        with open(path, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f) or {}
     except Exception as e:
-        return False
+        print(f"⚠️  Could not read {os.path.basename(path)}: {e} - using defaults")
+        return {}
 
 
-def press_numpad1_fallback():
-    """Fallback method using keybd_event"""
-    try:
-        ctypes.windll.user32.keybd_event(VK_NUMPAD1, 0, 0, 0)  # Key down
-        time.sleep(0.05)
-        ctypes.windll.user32.keybd_event(VK_NUMPAD1, 0, KEYEVENTF_KEYUP, 0)  # Key up
-        return True
-    except:
-        return False
+def load_macros(config):
+    """Compile the macros section of clicker.yaml into reusable INPUT arrays"""
+    return MacroEngine(config.get('macros') or {})
 
 
-def click_numpad_1():
-    """Press numpad 1 using the most reliable methods for games"""
-    current_time = time.strftime("%Y-%m-%d %H:%M:%S")
-    
-    # Try AutoHotkey first (most reliable for games)
-    if press_numpad1_autohotkey():
-        print(f"[{current_time}] ✅ Pressed numpad 1 (AutoHotkey)")
-        return
-    
-    # Try hardware scan codes (bypasses most game input filters)
-    if press_numpad1_hardware():
-        print(f"[{current_time}] ✅ Pressed numpad 1 (Hardware scan codes)")
-        return
-    
-    # Try direct input with scan codes
-    if press_numpad1_direct_input():
-        print(f"[{current_time}] ✅ Pressed numpad 1 (Direct input scan codes)")
-        return
+def load_jobs(config, macros):
+    """Build key jobs from clicker.yaml, defaulting to Numpad1 every 30 seconds"""
+    jobs = []
+    entries = config.get('jobs')
+    for entry in DEFAULT_JOBS if entries is None else entries:  # jobs: [] = conditions only
+        if 'macro' in entry:
+            entry = dict(entry, key=entry['macro'])
+        if macros.knows(entry['key']):
+            macros.get(entry['key'])  # Fail early on unknown macros or chord keys
+        else:
+            get_key(entry['key'])  # Fail early on unknown key names
+        jobs.append(Job.from_config(entry))
+    return jobs
+
+
+def run_action(name, macros):
+    """Play a macro or chord in one SendInput batch, or press a single key; returns a PressOutcome"""
+    with _input_lock:
+        return _run_action(name, macros)
+
+
+def _run_action(name, macros):
+    if not macros.knows(name):
+        backend = press_key(name)
+        return PressOutcome(backend, tuple(get_selector().last_attempts))
     
-    # Try SendInput with virtual keys
-    if press_numpad1_sendinput():
-        print(f"[{current_time}] ✅ Pressed numpad 1 (SendInput API)")
-        return
+    current_time = time.strftime("%Y-%m-%d %H:%M:%S")
+    macro = macros.get(name)
+    started = time.perf_counter()
+    ok = macros.play(name)
+    attempts = (("SendInput macro", time.perf_counter() - started, ok),)
+    if ok:
+        print(f"[{current_time}] ✅ Played {macro.name} ({macro.event_count} events in {macro.call_count} SendInput call(s))")
+        return PressOutcome("SendInput macro", attempts)
+    print(f"[{current_time}] ❌ Failed to play {macro.name}")
+    return PressOutcome(None, attempts)
+
+
+def load_conditions(config, macros, hybrid_config=None, telemetry=None):
+    """Build the log condition engine from clicker.yaml; None when no rules are configured"""
+    section = config.get('conditions') or {}
+    hotkeys = PresetHotkeys(section.get('hybrid_commander_config') or hybrid_config or DEFAULT_HYBRID_CONFIG)
     
-    # Final fallback
-    if press_numpad1_fallback():
-        print(f"[{current_time}] ⚠️  Pressed numpad 1 (fallback method)")
-        return
+    def fire(rule, line):
+        triggered = time.monotonic()
+        current_time = time.strftime("%Y-%m-%d %H:%M:%S")
+        target = rule.target
+        if rule.action == "preset":
+            try:
+                target = hotkeys.chord_for(rule.target)
+            except (OSError, ValueError) as e:
+                print(f"[{current_time}] ❌ Could not read HybridCommander hotkeys: {e}")
+                return None
+            if target is None:
+                print(f"[{current_time}] ❌ Rule {rule.name}: no hotkey bound to preset {rule.target}")
+                return None
+        print(f"[{current_time}] 🔔 Rule {rule.name} triggered" + (f": {line.strip()[:80]}" if line else ""))
+        pressed = time.monotonic()
+        outcome = run_action(target, macros)
+        if telemetry is not None:
+            # Lateness is the time from the rule matching to the press starting
+            telemetry.record(target, triggered, pressed, outcome)
+        return outcome
     
-    print(f"[{current_time}] ❌ Failed to press numpad 1 (all methods failed)")
+    return load_engine(section, fire, CONDITION_STATE_FILE)
+
+
+def load_telemetry(config):
+    """Create the press telemetry buffer and its export path from clicker.yaml"""
+    settings = config.get('telemetry') or {}
+    export_path = settings.get('export')
+    if export_path and not os.path.isabs(export_path):
+        export_path = os.path.join(os.path.dirname(CONFIG_FILE), export_path)
+    return Telemetry(int(settings.get('capacity', DEFAULT_CAPACITY))), export_path
+
+
+def report_fire(report, telemetry=None):
+    """Record the press and print timing problems (late or missed fires)"""
+    if telemetry is not None:
+        telemetry.record_fire(report)
+    job = report.job
+    if report.missed:
+        print(f"⚠️  {job.key}: missed {report.missed} press(es) - scheduler was blocked "
+              f"{report.lateness:.3f}s past the deadline")
+    elif report.lateness > 0.010:
+        print(f"⏱️  {job.key}: fired {report.lateness * 1000:.1f}ms late")
 
 
 def main():
     """Main function to run the automated key presser"""
-    print("🎮 Skyrim Numpad 1 Auto-Clicker (Enhanced)")
+    print("🎮 Skyrim Auto-Clicker (Enhanced)")
     print("=" * 45)
     
+    config = read_clicker_config()
+    try:
+        macros = load_macros(config)
+        jobs = load_jobs(config, macros)
+        telemetry, export_path = load_telemetry(config)
+        conditions = load_conditions(config, macros, telemetry=telemetry)
+    except (KeyError, ValueError) as e:
+        print(f"❌ Invalid job in {os.path.basename(CONFIG_FILE)}: {e}")
+        return
+    
     # Check AutoHotkey availability
-    ahk_path = check_autohotkey()
+    ahk_path = find_autohotkey()
     if ahk_path:
         print(f"✅ AutoHotkey found: {os.path.basename(ahk_path)}")
     else:
@@ -256,15 +215,20 @@ def main():
     print("📋 Instructions:")
     print("1. 🎮 Start Skyrim Special Edition")
     print("2. 🎯 Make sure Skyrim window is active/focused")
-    print("3. ⏰ Script will press numpad 1 every 30 seconds")
+    print("3. ⏰ Scheduled keys (edit clicker.yaml to change):")
+    for job in jobs:
+        jitter = f" ±{job.jitter:g}s" if job.jitter else ""
+        phase = f", first after {job.phase:g}s" if job.phase else ""
+        print(f"   • {job.key} every {job.interval:g}s{jitter}{phase}")
+    if conditions is not None:
+        print(f"   • {len(conditions.rules)} log condition rule(s) watching {', '.join(conditions.logs.patterns)}")
     print("4. 🛑 Press Ctrl+C to stop")
     
-    print("\n🔧 Methods (in order of preference):")
-    print("• AutoHotkey (best for games)")
-    print("• Hardware scan codes (bypasses input filters)")
-    print("• Direct input scan codes")
-    print("• SendInput API")
-    print("• keybd_event (fallback)")
+    selector = get_selector()
+    print("\n🔧 Methods (in order of preference, chosen once and re-probed only on failure):")
+    for backend in selector.backends:
+        status = "" if backend.available() else " (unavailable)"
+        print(f"• {backend.name}{status}")
     
     print("\n💡 For best results:")
     print("• Use Windowed Fullscreen mode in Skyrim")
@@ -273,23 +237,45 @@ def main():
     
     print("\n" + "-" * 45)
     
-    print("🚀 Starting automated numpad 1 pressing...")
+    signum = install_export_handler(
+        telemetry, export_path, lambda path: print(f"📈 Telemetry exported to {path}"),
+        lambda path, error: print(f"❌ Could not export telemetry to {path}: {error}"))
+    if signum is not None:
+        print(f"📈 Send {signal.Signals(signum).name} to export telemetry while running")
+    
+    print("🚀 Starting automated key pressing...")
     
+    scheduler = Scheduler(jobs, lambda job: run_action(job.key, macros),
+                          on_fire=lambda report: report_fire(report, telemetry))
+    stop = threading.Event()
+    if conditions is not None:
+        interval = float((config.get('conditions') or {}).get('poll_interval', DEFAULT_POLL_INTERVAL))
+        threading.Thread(target=conditions.run, args=(stop, interval), daemon=True).start()
     try:
-        while True:
-            click_numpad_1()
-            
-            # Wait 30 seconds with progress indication
-            for i in range(30, 0, -1):
-                print(f"\r⏰ Next press in {i:2d} seconds...", end="", flush=True)
-                time.sleep(1)
-            print()  # New line after countdown
+        # Sleeps until each next deadline; deadlines never drift with press duration
+        scheduler.run()
+        while conditions is not None and not stop.wait(1.0):
+            pass  # No scheduled jobs; keep the condition engine running
             
     except KeyboardInterrupt:
         print("\n\n🛑 Script interrupted by user. Exiting...")
     except Exception as e:
         print(f"\n❌ Unexpected error: {e}")
+    finally:
+        stop.set()
+        selector.close()
+    
+    for job in jobs:
+        print(f"📊 {job.key}: {job.fires} presses, {job.late} late, {job.missed} missed")
+    for line in format_summary(telemetry.summary()):
+        print(f"📈 {line}")
+    if export_path and telemetry.records:
+        try:
+            telemetry.export(export_path)
+            print(f"📈 Telemetry exported to {export_path}")
+        except OSError as e:
+            print(f"❌ Could not export telemetry: {e}")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,154 @@
+"""
+Key Press Scheduler
+===================
+Drift-free scheduling of several keys on independent cadences. Jobs live
+in a heap ordered by deadline; deadlines advance from the previous
+deadline (not from when the press finished), and the scheduler sleeps
+until the next deadline instead of waking every second.
+"""
+
+import contextlib
+import ctypes
+import heapq
+import random
+import sys
+import time
+from collections import namedtuple
+
+# Lateness beyond this counts as a late fire (seconds)
+DEFAULT_LATE_TOLERANCE = 0.010
+# Final stretch before a deadline that is waited out by yielding instead of sleeping
+DEFAULT_SPIN_MARGIN = 0.002
+
+FireReport = namedtuple("FireReport", "job deadline fired_at lateness missed result")
+
+
+class Job:
+    """A key pressed every `interval` seconds, first after `phase`, offset by ±`jitter`"""
+
+    __slots__ = ("key", "interval", "jitter", "phase", "base", "deadline", "fires", "late", "missed")
+
+    def __init__(self, key, interval, jitter=0.0, phase=0.0):
+        if interval <= 0:
+            raise ValueError(f"Interval for {key} must be positive")
+        self.key = key
+        self.interval = float(interval)
+        self.jitter = max(0.0, float(jitter))
+        self.phase = max(0.0, float(phase))
+        self.base = None      # Un-jittered deadline; advances by exactly one interval per fire
+        self.deadline = None  # Actual deadline including this cycle's jitter
+        self.fires = 0
+        self.late = 0
+        self.missed = 0
+
+    @classmethod
+    def from_config(cls, entry):
+        return cls(entry['key'], entry.get('interval', 30), entry.get('jitter', 0), entry.get('phase', 0))
+
+    def __repr__(self):
+        return f"Job({self.key!r}, interval={self.interval}, jitter={self.jitter}, phase={self.phase})"
+
+
+@contextlib.contextmanager
+def high_resolution_timer():
+    """Raise the Windows timer resolution to 1ms while scheduling (no-op elsewhere)"""
+    winmm = None
+    if sys.platform == "win32":
+        try:
+            winmm = ctypes.WinDLL("winmm")
+            winmm.timeBeginPeriod(1)
+        except (OSError, AttributeError):
+            winmm = None
+    try:
+        yield
+    finally:
+        if winmm is not None:
+            winmm.timeEndPeriod(1)
+
+
+def sleep_until(deadline, clock=time.monotonic, spin_margin=DEFAULT_SPIN_MARGIN, stop=None):
+    """Sleep until clock() >= deadline; returns False if `stop` was set first"""
+    while True:
+        remaining = deadline - clock()
+        if remaining <= 0:
+            return True
+        if stop is not None and stop.is_set():
+            return False
+        if remaining > spin_margin:
+            if stop is not None:
+                stop.wait(remaining - spin_margin)
+            else:
+                time.sleep(remaining - spin_margin)
+        else:
+            time.sleep(0)  # Yield for the last stretch instead of oversleeping
+
+
+class Scheduler:
+    """Heap of jobs fired by `action(job)` at their deadlines on a monotonic clock"""
+
+    def __init__(self, jobs, action, clock=time.monotonic, sleeper=sleep_until,
+                 late_tolerance=DEFAULT_LATE_TOLERANCE, rng=None, on_fire=None):
+        self.jobs = list(jobs)
+        self.action = action
+        self.clock = clock
+        self.sleeper = sleeper
+        self.late_tolerance = late_tolerance
+        self.rng = rng or random.Random()
+        self.on_fire = on_fire
+        self.heap = []
+        self._counter = 0  # Tie-breaker so jobs never need to be compared
+
+    def start(self, now=None):
+        """Put every job on the heap relative to `now`"""
+        now = self.clock() if now is None else now
+        self.heap = []
+        for job in self.jobs:
+            job.base = now + job.phase
+            self._push(job)
+
+    def _push(self, job):
+        offset = self.rng.uniform(-job.jitter, job.jitter) if job.jitter else 0.0
+        job.deadline = max(job.base + offset, job.base - job.interval / 2)
+        self._counter += 1
+        heapq.heappush(self.heap, (job.deadline, self._counter, job))
+
+    def next_deadline(self):
+        return self.heap[0][0] if self.heap else None
+
+    def fire_due(self, now=None):
+        """Fire every job whose deadline has passed; returns their FireReports"""
+        reports = []
+        now = self.clock() if now is None else now
+        while self.heap and self.heap[0][0] <= now:
+            deadline, _, job = heapq.heappop(self.heap)
+            fired_at = self.clock()
+            lateness = fired_at - deadline
+
+            # If whole intervals were slept through, count them as missed instead of bursting
+            missed = int(lateness // job.interval) if lateness >= job.interval else 0
+            result = self.action(job)
+            job.fires += 1
+            job.missed += missed
+            if lateness > self.late_tolerance:
+                job.late += 1
+
+            report = FireReport(job, deadline, fired_at, lateness, missed, result)
+            reports.append(report)
+            if self.on_fire:
+                self.on_fire(report)
+
+            job.base += job.interval * (missed + 1)
+            self._push(job)
+        return reports
+
+    def run(self, stop=None, max_fires=None):
+        """Fire jobs until `stop` (a threading.Event) is set or max_fires presses happened"""
+        if not self.heap:
+            self.start()
+        fired = 0
+        with high_resolution_timer():
+            while self.heap and (max_fires is None or fired < max_fires):
+                if not self.sleeper(self.next_deadline(), clock=self.clock, stop=stop):
+                    break
+                fired += len(self.fire_due())
+        return fired
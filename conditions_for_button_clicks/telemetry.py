@@ -0,0 +1,228 @@
+"""
+Press Telemetry
+===============
+Per-press timing records kept in a fixed-size ring buffer: when a press
+was scheduled, when it fired, which backend pressed the key, how long
+every fallback attempt took and whether it worked. Summaries give
+p50/p95/p99 latency and jitter per backend; records export to JSON or CSV.
+"""
+
+import csv
+import json
+import math
+import signal
+import statistics
+import threading
+import time
+from collections import deque, namedtuple
+
+DEFAULT_CAPACITY = 4096
+
+# What an action reports back: the backend that succeeded (None on failure)
+# and every attempt as (backend name, seconds, ok)
+PressOutcome = namedtuple("PressOutcome", "backend attempts")
+
+PressRecord = namedtuple(
+    "PressRecord",
+    "key scheduled fired lateness duration backend outcome missed attempts"
+)
+
+CSV_FIELDS = ["key", "scheduled", "fired", "lateness_ms", "duration_ms", "backend", "outcome", "missed", "attempts"]
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of a sorted list"""
+    if not values:
+        return None
+    rank = (len(values) - 1) * pct / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def summarize_series(values):
+    """p50/p95/p99/max in milliseconds for a list of seconds"""
+    ordered = sorted(values)
+    if not ordered:
+        return {}
+    return {
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+class Telemetry:
+    """Ring buffer of PressRecords with per-backend summaries"""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, wall_clock=time.time, monotonic=time.monotonic):
+        self.records = deque(maxlen=capacity)
+        self.total = 0  # Presses seen, including those pushed out of the buffer
+        self.wall_clock = wall_clock
+        self.monotonic = monotonic
+        # Condition rules record from their own thread. Reentrant, because the export
+        # signal handler can interrupt the main thread while it is inside record()
+        self.lock = threading.RLock()
+
+    def record(self, key, scheduled, fired, outcome, missed=0):
+        """Store one press; `scheduled` and `fired` are monotonic seconds"""
+        if not isinstance(outcome, PressOutcome):
+            outcome = PressOutcome(outcome, ())
+        attempts = tuple(outcome.attempts)
+        if outcome.backend is None:
+            status = "failed"
+        elif len(attempts) > 1:
+            status = "fallback"
+        else:
+            status = "ok"
+
+        # Monotonic times are only meaningful relative to each other; store wall-clock equivalents
+        offset = self.wall_clock() - self.monotonic()
+        record = PressRecord(
+            key=key,
+            scheduled=scheduled + offset,
+            fired=fired + offset,
+            lateness=fired - scheduled,
+            duration=sum(seconds for _, seconds, _ in attempts),
+            backend=outcome.backend,
+            outcome=status,
+            missed=missed,
+            attempts=attempts,
+        )
+        with self.lock:
+            self.records.append(record)
+            self.total += 1
+        return record
+
+    def snapshot(self):
+        """Copy of the buffered records, safe to iterate while other threads keep recording"""
+        with self.lock:
+            return list(self.records)
+
+    def record_fire(self, report):
+        """Store a scheduler FireReport whose result is a PressOutcome"""
+        return self.record(report.job.key, report.deadline, report.fired_at, report.result, report.missed)
+
+    def summary(self):
+        """Per-backend counts, latency percentiles and jitter, plus per-attempt failure rates"""
+        records = self.snapshot()
+        by_backend = {}
+        attempts = {}
+        for record in records:
+            by_backend.setdefault(record.backend or "(all failed)", []).append(record)
+            for name, seconds, ok in record.attempts:
+                entry = attempts.setdefault(name, {"attempts": 0, "failures": 0, "durations": []})
+                entry["attempts"] += 1
+                entry["failures"] += 0 if ok else 1
+                entry["durations"].append(seconds)
+
+        backends = {}
+        for name, records in by_backend.items():
+            lateness = [record.lateness for record in records]
+            backends[name] = {
+                "presses": len(records),
+                "fallbacks": sum(1 for record in records if record.outcome == "fallback"),
+                "latency": summarize_series(lateness),
+                "press_duration": summarize_series([record.duration for record in records]),
+                "jitter_ms": round(statistics.pstdev(lateness) * 1000, 3) if len(lateness) > 1 else 0.0,
+            }
+
+        return {
+            "presses": self.total,
+            "buffered": len(records),
+            "failed": sum(1 for record in records if record.outcome == "failed"),
+            "backends": backends,
+            "attempts": {
+                name: {
+                    "attempts": entry["attempts"],
+                    "failures": entry["failures"],
+                    "duration": summarize_series(entry["durations"]),
+                }
+                for name, entry in attempts.items()
+            },
+        }
+
+    def export(self, path):
+        """Write records (and the summary, for JSON) to a .json or .csv file"""
+        records = self.snapshot()
+        if str(path).lower().endswith(".csv"):
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+                writer.writeheader()
+                for record in records:
+                    writer.writerow({
+                        "key": record.key,
+                        "scheduled": f"{record.scheduled:.6f}",
+                        "fired": f"{record.fired:.6f}",
+                        "lateness_ms": f"{record.lateness * 1000:.3f}",
+                        "duration_ms": f"{record.duration * 1000:.3f}",
+                        "backend": record.backend or "",
+                        "outcome": record.outcome,
+                        "missed": record.missed,
+                        "attempts": ";".join(f"{name}:{seconds * 1000:.3f}:{'ok' if ok else 'fail'}"
+                                             for name, seconds, ok in record.attempts),
+                    })
+        else:
+            document = {
+                "summary": self.summary(),
+                "records": [
+                    dict(record._asdict(), attempts=[
+                        {"backend": name, "seconds": seconds, "ok": ok} for name, seconds, ok in record.attempts
+                    ])
+                    for record in records
+                ],
+            }
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(document, f, indent=2)
+        return path
+
+
+def export_signal():
+    """Signal that triggers an export while running (SIGUSR1, or Ctrl+Break on Windows)"""
+    return getattr(signal, "SIGUSR1", None) or getattr(signal, "SIGBREAK", None)
+
+
+def install_export_handler(telemetry, path, on_export=None, on_error=None):
+    """Export telemetry whenever the export signal arrives; returns the signal used (or None)
+
+    A failed export is reported through on_error(path, error) and never
+    propagates, since the handler interrupts whatever the main thread runs.
+    """
+    signum = export_signal()
+    if signum is None or not path:
+        return None
+
+    def handler(signum, frame):
+        try:
+            telemetry.export(path)
+        except OSError as e:
+            if on_error:
+                on_error(path, e)
+            return
+        if on_export:
+            on_export(path)
+
+    try:
+        signal.signal(signum, handler)
+    except (ValueError, OSError):
+        return None  # Not in the main thread
+    return signum
+
+
+def format_summary(summary):
+    """One line per backend for the console"""
+    lines = []
+    for name, stats in summary["backends"].items():
+        latency = stats["latency"]
+        duration = stats["press_duration"]
+        lines.append(
+            f"{name}: {stats['presses']} presses ({stats['fallbacks']} via fallback) - "
+            f"latency p50 {latency.get('p50_ms', 0):.1f}ms / p95 {latency.get('p95_ms', 0):.1f}ms / "
+            f"p99 {latency.get('p99_ms', 0):.1f}ms, jitter {stats['jitter_ms']:.1f}ms, "
+            f"press p50 {duration.get('p50_ms', 0):.1f}ms"
+        )
+    for name, stats in summary["attempts"].items():
+        if stats["failures"]:
+            lines.append(f"{name}: {stats['failures']}/{stats['attempts']} attempts failed")
+    return lines
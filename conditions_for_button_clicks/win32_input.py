@@ -0,0 +1,88 @@
+"""
+Win32 Input Structures
+======================
+ctypes definitions for SendInput. These only describe memory layout, so
+they can be built (and inspected) on any platform; calling SendInput
+itself requires Windows.
+"""
+
+import ctypes
+import ctypes.wintypes
+
+# Windows API constants
+INPUT_KEYBOARD = 1
+KEYEVENTF_EXTENDEDKEY = 0x0001
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_SCANCODE = 0x0008
+
+ULONG_PTR = ctypes.c_size_t
+
+
+# Input structures for SendInput. The union must include MOUSEINPUT, the
+# largest member, or sizeof(INPUT) is wrong and SendInput rejects the call.
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ("wVk", ctypes.wintypes.WORD),
+        ("wScan", ctypes.wintypes.WORD),
+        ("dwFlags", ctypes.wintypes.DWORD),
+        ("time", ctypes.wintypes.DWORD),
+        ("dwExtraInfo", ULONG_PTR)
+    ]
+
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ("dx", ctypes.wintypes.LONG),
+        ("dy", ctypes.wintypes.LONG),
+        ("mouseData", ctypes.wintypes.DWORD),
+        ("dwFlags", ctypes.wintypes.DWORD),
+        ("time", ctypes.wintypes.DWORD),
+        ("dwExtraInfo", ULONG_PTR)
+    ]
+
+
+class HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [
+        ("uMsg", ctypes.wintypes.DWORD),
+        ("wParamL", ctypes.wintypes.WORD),
+        ("wParamH", ctypes.wintypes.WORD)
+    ]
+
+
+class INPUT(ctypes.Structure):
+    class _INPUT(ctypes.Union):
+        _fields_ = [("ki", KEYBDINPUT), ("mi", MOUSEINPUT), ("hi", HARDWAREINPUT)]
+
+    _anonymous_ = ("_input",)
+    _fields_ = [
+        ("type", ctypes.wintypes.DWORD),
+        ("_input", _INPUT)
+    ]
+
+
+def keyboard_input(key, key_up=False, scan_codes=True):
+    """Build one keyboard INPUT event for a key (scan code or virtual-key based)"""
+    event = INPUT()
+    event.type = INPUT_KEYBOARD
+    if scan_codes:
+        event.ki.wVk = 0  # No virtual key
+        event.ki.wScan = key.scan  # Hardware scan code
+        event.ki.dwFlags = KEYEVENTF_SCANCODE | (KEYEVENTF_EXTENDEDKEY if key.extended else 0)
+    else:
+        event.ki.wVk = key.vk
+        event.ki.wScan = 0
+        event.ki.dwFlags = KEYEVENTF_EXTENDEDKEY if key.extended else 0
+    if key_up:
+        event.ki.dwFlags |= KEYEVENTF_KEYUP
+    event.ki.time = 0
+    event.ki.dwExtraInfo = 0
+    return event
+
+
+def send_input(events):
+    """Send a ctypes INPUT array (or a single INPUT) in one SendInput call; returns events sent"""
+    if isinstance(events, INPUT):
+        count, pointer = 1, ctypes.byref(events)
+    else:
+        count, pointer = len(events), events
+    return ctypes.windll.user32.SendInput(count, pointer, ctypes.sizeof(INPUT))
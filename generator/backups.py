@@ -0,0 +1,143 @@
+"""
+Config Backups
+==============
+Compressed history of HybridCommander-Config.json. Before each write the
+current file is stored once per distinct content: files are named by their
+SHA-256 and compressed with lzma (or gzip), so regenerating dozens of times
+a day only adds an entry when the config actually differs from every kept
+version. Retention trims the oldest entries by count and by total size;
+the newest entry is always kept.
+
+A rollback decompresses an entry and renames it over the config
+atomically, after backing up the config being replaced.
+"""
+
+import gzip
+import hashlib
+import json
+import lzma
+import os
+import time
+
+from generator.config_io import atomic_write
+
+BACKUP_DIRNAME = "HybridCommander-Backups"
+INDEX_FILENAME = "index.json"
+DEFAULT_KEEP = 30
+DEFAULT_MAX_BYTES = 20 * 1024 * 1024
+COMPRESSORS = {
+    "lzma": (".xz", lzma.compress, lzma.decompress),
+    "gzip": (".gz", gzip.compress, gzip.decompress),
+}
+
+
+class BackupStore:
+    """Content-addressed, compressed config backups with count and size retention"""
+
+    def __init__(self, directory, keep=DEFAULT_KEEP, max_bytes=DEFAULT_MAX_BYTES, compression="lzma"):
+        if compression not in COMPRESSORS:
+            raise ValueError(f"backup compression must be one of {', '.join(COMPRESSORS)}, not {compression!r}")
+        self.directory = directory
+        self.keep = max(1, int(keep))
+        self.max_bytes = int(max_bytes)
+        self.compression = compression
+        self.index_path = os.path.join(directory, INDEX_FILENAME)
+        self.entries = self.load_index()  # Oldest first
+
+    @classmethod
+    def from_config(cls, settings, config_dir):
+        settings = settings or {}
+        directory = settings.get("directory") or os.path.join(config_dir, BACKUP_DIRNAME)
+        max_mb = settings.get("max_mb")
+        return cls(os.path.expandvars(directory), settings.get("keep", DEFAULT_KEEP),
+                   DEFAULT_MAX_BYTES if max_mb is None else float(max_mb) * 1024 * 1024,
+                   settings.get("compression", "lzma"))
+
+    def load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get("backups", [])
+        except (OSError, ValueError):
+            return []
+        # Drop entries whose file was deleted by hand
+        return [entry for entry in entries if os.path.exists(os.path.join(self.directory, entry["file"]))]
+
+    def save_index(self):
+        payload = json.dumps({"backups": self.entries}, indent=2).encode('utf-8')
+        atomic_write(self.index_path, payload)
+
+    def add(self, payload):
+        """Store payload bytes unless an identical version is kept; returns (entry, stored_new)"""
+        digest = hashlib.sha256(payload).hexdigest()
+        existing = next((entry for entry in self.entries if entry["sha256"] == digest), None)
+        if existing is not None:
+            # Same content again: it becomes the newest entry, no new file
+            self.entries.remove(existing)
+            existing["created"] = time.time()
+            self.entries.append(existing)
+            self.save_index()
+            return existing, False
+
+        extension, compress, _ = COMPRESSORS[self.compression]
+        compressed = compress(payload)
+        os.makedirs(self.directory, exist_ok=True)
+        entry = {
+            "sha256": digest,
+            "file": digest[:16] + ".json" + extension,
+            "created": time.time(),
+            "size": len(payload),
+            "stored": len(compressed),
+        }
+        atomic_write(os.path.join(self.directory, entry["file"]), compressed)
+        self.entries.append(entry)
+        self.prune()
+        self.save_index()
+        return entry, True
+
+    def backup_file(self, path):
+        """Back up the current contents of path (if it exists); returns (entry, stored_new) or None"""
+        try:
+            with open(path, 'rb') as f:
+                payload = f.read()
+        except FileNotFoundError:
+            return None
+        return self.add(payload)
+
+    def prune(self):
+        """Delete the oldest entries beyond the count and size limits (never the newest)"""
+        removed = 0
+        while len(self.entries) > 1 and (len(self.entries) > self.keep or
+                                         sum(entry["stored"] for entry in self.entries) > self.max_bytes):
+            entry = self.entries.pop(0)
+            try:
+                os.remove(os.path.join(self.directory, entry["file"]))
+            except FileNotFoundError:
+                pass
+            removed += 1
+        return removed
+
+    def listing(self):
+        """Entries newest first as (number, entry); number 1 is the most recent backup"""
+        return list(enumerate(reversed(self.entries), start=1))
+
+    def read(self, entry):
+        """Decompressed bytes of an entry, checked against its hash"""
+        with open(os.path.join(self.directory, entry["file"]), 'rb') as f:
+            data = f.read()
+        decompress = gzip.decompress if entry["file"].endswith(".gz") else lzma.decompress
+        payload = decompress(data)
+        if hashlib.sha256(payload).hexdigest() != entry["sha256"]:
+            raise ValueError(f"Backup {entry['file']} is corrupt (hash mismatch)")
+        return payload
+
+    def rollback(self, number, target):
+        """Restore backup `number` (1 = newest) over target via atomic rename; returns the entry"""
+        listing = dict(self.listing())
+        if number not in listing:
+            raise IndexError(f"No backup #{number} (have {len(listing)})")
+        entry = listing[number]
+        payload = self.read(entry)
+        # The version being replaced becomes a backup itself, so a rollback can be undone
+        self.backup_file(target)
+        atomic_write(target, payload)
+        return entry
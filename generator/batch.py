@@ -0,0 +1,87 @@
+"""
+Batch File Presets
+==================
+Moves long command lists out of HybridCommander's fixed command slots into
+plain-text batch files in the game directory. The preset then holds a
+single `bat <file>` console command, so one slot can run any number of
+commands.
+
+Modes (config.yaml `batch_files: {mode: ...}`):
+    overflow  only presets with more commands than a slot holds (default)
+    all       every preset
+    off       never; extra commands are dropped with a warning
+
+Files are only rewritten when their content changed, and files from
+earlier runs that no preset uses any more are deleted.
+"""
+
+import os
+import re
+
+from generator.config_io import write_if_changed
+from generator.log import log
+
+BATCH_MODES = ("overflow", "all", "off")
+DEFAULT_BATCH_MODE = "overflow"
+
+
+def batch_file_stem(preset_name):
+    """Console-safe file name (without .txt) for a preset"""
+    return re.sub(r"[^0-9A-Za-z_-]+", "_", preset_name).strip("_") or "preset"
+
+
+class BatchFiles:
+    """Decides which presets become `bat` files and writes those files incrementally"""
+
+    def __init__(self, game_path, directory=None, mode=DEFAULT_BATCH_MODE, limit=10):
+        if mode not in BATCH_MODES:
+            raise ValueError(f"batch_files mode must be one of {', '.join(BATCH_MODES)}, not {mode!r}")
+        self.game_path = game_path  # `bat` resolves file names relative to the game directory
+        self.directory = directory or game_path
+        self.mode = mode
+        self.limit = limit
+        self.files = {}  # path -> text for this run
+
+    @classmethod
+    def from_config(cls, settings, game_path, limit):
+        settings = settings or {}
+        directory = settings.get("directory")
+        return cls(game_path, directory and os.path.expandvars(directory), settings.get("mode", DEFAULT_BATCH_MODE),
+                   limit)
+
+    def wants_file(self, commands):
+        if self.mode == "all":
+            return True
+        return self.mode == "overflow" and len(commands) > self.limit
+
+    def apply(self, groups):
+        """Replace long (or all) groups' commands with one `bat` command; returns how many moved"""
+        self.files = {}
+        moved = 0
+        for group in groups:
+            if not self.wants_file(group.commands):
+                if len(group.commands) > self.limit:
+                    log.warning("⚠️ %s has %d commands - only the first %d fit a preset (batch_files mode is off)",
+                                group.name, len(group.commands), self.limit)
+                continue
+            path = os.path.join(self.directory, batch_file_stem(group.name) + ".txt")
+            self.files[path] = "\n".join(group.commands) + "\n"
+            target = os.path.splitext(os.path.relpath(path, self.game_path))[0]
+            group.commands = [f'bat "{target}"' if " " in target else f"bat {target}"]
+            moved += 1
+        return moved
+
+    def write(self, previous=()):
+        """Write changed batch files and delete ones only earlier runs used; returns (written, removed)"""
+        written = 0
+        if self.files:
+            os.makedirs(self.directory, exist_ok=True)
+        for path, text in self.files.items():
+            if write_if_changed(path, text):
+                written += 1
+        removed = 0
+        for path in previous:
+            if path not in self.files and os.path.exists(path):
+                os.remove(path)
+                removed += 1
+        return written, removed
@@ -0,0 +1,173 @@
+"""
+Command-Line Interface
+======================
+Argument parsing and batch entry points for skyrim_preset_generator.py.
+"""
+
+import argparse
+import json
+import lzma
+import os
+import sqlite3
+import time
+import zlib
+
+from generator.formdb import DEFAULT_FORM_DB, import_dumps, open_form_database
+from generator.log import log
+from generator.profiles import run_profiles
+
+
+def log_message(line):
+    """Message text of a captured log line, which is a JSON record in --json mode"""
+    try:
+        return json.loads(line)["message"].strip()
+    except (ValueError, KeyError, TypeError):
+        return line.strip()
+
+
+def run_profile_batch(manifest_path, jobs=None, compact=False):
+    """Generate presets for every target in a profiles manifest and log a summary"""
+    log.info("🗂️ Generating presets for profiles in %s", manifest_path)
+    try:
+        summaries = run_profiles(manifest_path, jobs=jobs, compact=compact)
+    except Exception as e:
+        log.error("❌ Error loading profiles: %s", e)
+        return False
+
+    if not summaries:
+        log.error("❌ No profiles found")
+        return False
+
+    log.info("\n📊 PROFILE SUMMARY:")
+    for summary in summaries:
+        changes = summary["changes"]
+        status = "✅" if summary["success"] else "❌"
+        detail = summary["error"] or (
+            f"{summary['presets']} presets, {changes.get('added', 0)} added, {changes.get('changed', 0)} updated, "
+            f"{changes.get('removed', 0)} removed, {'saved' if summary['saved'] else 'unchanged'}"
+        )
+        fields = {"profile": summary["name"], "success": summary["success"], "presets": summary["presets"],
+                  "changes": changes, "saved": summary["saved"], "error": summary["error"]}
+        (log.info if summary["success"] else log.warning)(
+            "   %s %s: %s", status, summary["name"], detail, extra={"fields": fields})
+        if not summary["success"] and not summary["error"]:
+            # Show the target's own error lines to explain the failure
+            for line in [line for line in summary["log"].splitlines() if "❌" in line][:3]:
+                log.warning("      %s", log_message(line), extra={"fields": {"profile": summary["name"]}})
+
+    return all(summary["success"] for summary in summaries)
+
+
+def run_form_import(db_path, paths, replace=False):
+    """Import xEdit/CSV/YAML dumps into the form-ID database"""
+    log.info("🗃️ Importing %d dump(s) into %s", len(paths), db_path)
+    started = time.perf_counter()
+    try:
+        counts = import_dumps(db_path, paths, replace=replace)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        log.error("❌ Error importing form IDs: %s", e)
+        return False
+    for path, count in counts.items():
+        log.info("   • %s: %d records", os.path.basename(path), count,
+                 extra={"fields": {"dump": path, "records": count}})
+    elapsed = time.perf_counter() - started
+    log.info("✅ Imported %d records in %.1fs", sum(counts.values()), elapsed,
+             extra={"fields": {"records": sum(counts.values()), "seconds": round(elapsed, 3)}})
+    return True
+
+
+def run_form_search(db_path, query, limit=10):
+    """Log the best form database matches for a name"""
+    database = open_form_database(db_path)
+    if database is None:
+        log.error("❌ Form database not found: %s (create it with --import-forms)", db_path)
+        return False
+    started = time.perf_counter()
+    try:
+        exact = database.exact(query)
+        matches = database.search(query, limit)
+    except sqlite3.Error as e:
+        log.error("❌ Error searching form IDs: %s", e)
+        return False
+    finally:
+        database.close()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    log.info("🔎 %r (%.1fms)", query, elapsed_ms, extra={"fields": {"query": query, "ms": round(elapsed_ms, 3)}})
+    if exact:
+        log.info("   ✅ exact: %s", exact, extra={"fields": {"exact": exact}})
+    for score, form_id, name, plugin in matches:
+        log.info("   %.2f  %s  %s  [%s]", score, form_id, name, plugin or '?',
+                 extra={"fields": {"score": round(score, 4), "form_id": form_id, "name": name, "plugin": plugin}})
+    return bool(exact or matches)
+
+
+def run_list_backups(store):
+    """Log the backup history, newest first"""
+    listing = store.listing()
+    if not listing:
+        log.info("📭 No backups in %s", store.directory)
+        return True
+    log.info("💾 %d backups in %s (%.1f KB stored):", len(listing), store.directory,
+             sum(entry['stored'] for _, entry in listing) / 1024)
+    for number, entry in listing:
+        created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry["created"]))
+        log.info("   #%-3d %s  %8.1f KB -> %6.1f KB  %s", number, created, entry['size'] / 1024,
+                 entry['stored'] / 1024, entry['sha256'][:12], extra={"fields": dict(entry, number=number)})
+    return True
+
+
+def run_rollback(store, number, target):
+    """Restore backup #number over HybridCommander-Config.json"""
+    try:
+        entry = store.rollback(number, target)
+    except (OSError, ValueError, IndexError, lzma.LZMAError, zlib.error) as e:
+        log.error("❌ Rollback failed: %s", e)
+        return False
+    created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry["created"]))
+    log.info("⏪ Restored backup #%d from %s to %s", number, created, os.path.basename(target),
+             extra={"fields": dict(entry, number=number, target=target)})
+    log.info("💡 The replaced config was backed up too; the next generation re-applies config.yaml")
+    return True
+
+
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description="Generate HybridCommander presets from config.yaml")
+    parser.add_argument("--compact", action="store_true",
+                        help="write HybridCommander-Config.json without indentation")
+    parser.add_argument("--watch", action="store_true",
+                        help="stay running and regenerate presets when a YAML file changes")
+    parser.add_argument("--debounce", type=float, default=0.5, metavar="SECONDS",
+                        help="quiet period before a burst of saves triggers regeneration (default: 0.5)")
+    parser.add_argument("--profiles", metavar="PATH",
+                        help="generate for every target in a profiles manifest (e.g. profiles.yaml)")
+    parser.add_argument("--jobs", type=int, metavar="N",
+                        help="worker processes for --profiles (default: CPU count)")
+    parser.add_argument("--data-path", metavar="PATH",
+                        help="Skyrim Data directory (default: the Steam install location)")
+    plans = parser.add_mutually_exclusive_group()
+    plans.add_argument("--compile", metavar="PLAN",
+                       help="resolve config.yaml into a plan file instead of writing presets")
+    plans.add_argument("--apply", metavar="PLAN",
+                       help="write presets from a compiled plan file (no YAML needed)")
+    parser.add_argument("--import-forms", nargs="+", metavar="DUMP",
+                        help="import xEdit/CSV (or ids.yaml-style) dumps into the form-ID database")
+    parser.add_argument("--replace", action="store_true",
+                        help="with --import-forms: rebuild the database instead of adding to it")
+    parser.add_argument("--find-form", metavar="NAME",
+                        help="search the form-ID database for an item name")
+    parser.add_argument("--form-db", metavar="PATH",
+                        help=f"form-ID database file, overriding config.yaml form_database (default: {DEFAULT_FORM_DB})")
+    parser.add_argument("--list-backups", action="store_true",
+                        help="list saved versions of HybridCommander-Config.json, newest first")
+    parser.add_argument("--rollback", type=int, metavar="N",
+                        help="restore backup #N from --list-backups (1 = newest)")
+    parser.add_argument("--validate", action="store_true",
+                        help="check every resolved command against known console verbs and their arguments")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--quiet", action="store_true", help="only print warnings and errors")
+    output.add_argument("--verbose", action="store_true", help="also print every preset's commands")
+    parser.add_argument("--json", action="store_true", help="print one JSON object per log line")
+    parser.add_argument("--profile", action="store_true",
+                        help="report wall time and memory allocated per phase (load, index, resolve, ...)")
+    return parser.parse_args(argv)
@@ -0,0 +1,228 @@
+"""
+Command Registry
+================
+Table-driven conversion of config.yaml function calls into console commands.
+Each function is a pre-compiled template (or a registered handler) so
+resolution is a single dictionary dispatch, memoized per (function, args).
+"""
+
+import sqlite3
+from functools import lru_cache
+from string import Formatter
+
+from generator.formdb import looks_like_form_id
+from generator.index import LookupIndex
+from generator.loadorder import parse_reference
+from generator.log import Joined, log
+
+# Built-in templates; config.yaml function_definitions may override or extend these
+BUILTIN_TEMPLATES = {
+    "give_item": "player.additem {item_id} {quantity}",
+    "execute_command": "{command}",
+    "set_player_stat": "player.setav {stat} {value}",
+    "modify_player_stat": "player.modav {stat} {value}",
+    "teleport_to": "coc {location_id}",
+    "give_spell": "player.addspell {spell_id}",
+    "complete_quest": "completequest {quest_id}",
+    "set_weather": "fw {weather_id}",
+}
+
+# Form IDs that work even without an ids.yaml
+DEFAULT_FORM_IDS = {
+    "currency.gold": "0000000f",
+}
+
+# Handlers registered with @command_function before a registry is created
+CUSTOM_FUNCTIONS = {}
+
+
+def command_function(name):
+    """Decorator registering handler(registry, *args) -> command for every registry"""
+    def decorator(handler):
+        CUSTOM_FUNCTIONS[name] = handler
+        return handler
+    return decorator
+
+
+def freeze_args(args):
+    """Convert YAML args into a hashable tuple for memoization"""
+    if isinstance(args, (list, tuple)):
+        return tuple(freeze_args(arg) for arg in args)
+    if isinstance(args, dict):
+        return tuple(sorted((key, freeze_args(value)) for key, value in args.items()))
+    return args
+
+
+def is_hashable(value):
+    """True if value can be used as a memoization key"""
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+class CommandTemplate:
+    """A console command template compiled to positional format fields"""
+
+    __slots__ = ("name", "source", "fields", "compiled")
+
+    def __init__(self, name, source):
+        self.name = name
+        self.source = source
+        self.fields = []
+        parts = []
+        for literal, field, spec, conversion in Formatter().parse(source):
+            parts.append(literal.replace("{", "{{").replace("}", "}}"))
+            if field is None:
+                continue
+            if field not in self.fields:
+                self.fields.append(field)
+            parts.append("{%d%s%s}" % (
+                self.fields.index(field),
+                f"!{conversion}" if conversion else "",
+                f":{spec}" if spec else "",
+            ))
+        self.compiled = "".join(parts)
+
+    def render(self, values):
+        return self.compiled.format(*values)
+
+
+class CommandRegistry:
+    """Registry of command functions with O(1) dispatch and memoized resolution"""
+
+    def __init__(self, index=None, cache_size=4096, form_db=None, load_order=None):
+        self.index = index or LookupIndex()
+        self.form_db = form_db  # Optional FormDatabase for human item names
+        self.load_order = load_order  # Optional LoadOrder for "Plugin.esp:000D62" references
+        self.templates = {}
+        self.handlers = dict(CUSTOM_FUNCTIONS)
+        # Per-field argument lookups applied before rendering a template
+        self.argument_filters = {
+            "item_id": self.lookup_item_id,
+            "command": self.lookup_command,
+        }
+        for name, source in BUILTIN_TEMPLATES.items():
+            self.add_template(name, source)
+        self._resolve_cached = lru_cache(maxsize=cache_size)(self._resolve)
+        self._resolve_many_cached = lru_cache(maxsize=cache_size)(self._resolve_many)
+
+    def add_template(self, name, source):
+        """Register (or replace) a template-based function"""
+        self.templates[name] = CommandTemplate(name, source)
+        self.handlers.pop(name, None)
+        self.clear_cache()
+
+    def function(self, name):
+        """Decorator registering a handler(registry, *args) on this registry"""
+        def decorator(handler):
+            self.handlers[name] = handler
+            self.templates.pop(name, None)
+            self.clear_cache()
+            return handler
+        return decorator
+
+    def load_definitions(self, definitions):
+        """Load function templates from a YAML function_definitions mapping"""
+        loaded = 0
+        for name, definition in (definitions or {}).items():
+            template = definition.get("template") if isinstance(definition, dict) else definition
+            if isinstance(template, str):
+                self.add_template(name, template)
+                loaded += 1
+        return loaded
+
+    def clear_cache(self):
+        """Forget memoized results (call after the index or templates change)"""
+        if hasattr(self, "_resolve_cached"):
+            self._resolve_cached.cache_clear()
+        if hasattr(self, "_resolve_many_cached"):
+            self._resolve_many_cached.cache_clear()
+
+    def lookup_item_id(self, item_name):
+        """Resolve an ids.yaml dotted name or a form database name to its form ID, or pass it through"""
+        if not isinstance(item_name, str):
+            return item_name
+        form_id = self.index.form_id(item_name, DEFAULT_FORM_IDS.get(item_name))
+        if form_id is None and parse_reference(item_name) is not None:
+            return self.lookup_reference(item_name)
+        if form_id is None and self.form_db is not None and not looks_like_form_id(item_name):
+            match = None
+            try:
+                match = self.form_db.resolve_match(item_name)
+            except sqlite3.Error as e:
+                log.warning("⚠️ Form database lookup failed for %s: %s", item_name, e)
+            if match is None:
+                log.warning("⚠️ No form ID found for item: %s", item_name)
+            else:
+                form_id, matched, score = match
+                if score is not None:
+                    # A fuzzy pick may be the wrong item; make it visible
+                    log.info("🔤 %r matched %s (%s, similarity %.2f)", item_name, matched, form_id, score,
+                             extra={"fields": {"query": item_name, "matched": matched, "form_id": form_id,
+                                               "score": score}})
+        return item_name if form_id is None else form_id
+
+    def lookup_reference(self, value):
+        """Resolve a "Plugin.esp:000D62" reference against the load order, or pass the value through"""
+        reference = parse_reference(value)
+        if reference is None:
+            return value
+        form_id = self.load_order.runtime_form_id(*reference) if self.load_order is not None else None
+        if form_id is None:
+            log.warning("⚠️ %s is not in the active load order - passing %s through", reference[0], value)
+            return value
+        return f"{form_id:08x}"
+
+    def lookup_command(self, command_path):
+        """Resolve a commands.yaml dotted path, or pass a raw console command through"""
+        if not isinstance(command_path, str):
+            return command_path
+        return self.index.command(command_path, command_path)
+
+    def resolve(self, function_name, args):
+        """Convert a single function call into a console command (memoized)"""
+        frozen = freeze_args(args or [])
+        if not is_hashable(frozen):
+            return self._resolve(function_name, args or [])
+        return self._resolve_cached(function_name, frozen)
+
+    def resolve_many(self, commands):
+        """Resolve a list of {function, args} entries, dropping unresolvable ones (memoized per list)"""
+        frozen = tuple((cmd_config.get('function'), freeze_args(cmd_config.get('args', [])))
+                       for cmd_config in commands or [])
+        if not is_hashable(frozen):
+            return list(self._resolve_many(frozen))
+        return list(self._resolve_many_cached(frozen))
+
+    def _resolve_many(self, frozen_commands):
+        resolved = []
+        for function_name, args in frozen_commands:
+            console_command = self.resolve(function_name, args)
+            if console_command:
+                resolved.append(console_command)
+        return tuple(resolved)
+
+    def _resolve(self, function_name, args):
+        handler = self.handlers.get(function_name)
+        if handler is not None:
+            return handler(self, *args)
+
+        template = self.templates.get(function_name)
+        if template is None:
+            log.warning("⚠️ Unknown function: %s", function_name)
+            return None
+
+        if len(args) != len(template.fields):
+            log.warning("⚠️ %s expects %d args (%s), got %d", function_name, len(template.fields),
+                        Joined(template.fields), len(args))
+            return None
+
+        values = []
+        for field, value in zip(template.fields, args):
+            argument_filter = self.argument_filters.get(field)
+            if argument_filter is None and field.endswith("_id"):
+                argument_filter = self.lookup_reference
+            values.append(argument_filter(value) if argument_filter else value)
+        return template.render(values)
@@ -0,0 +1,140 @@
+"""
+Parsed Config Cache
+===================
+Persistent cache of parsed (and indexed) YAML files so warm starts skip
+YAML parsing entirely. Each file is cached separately, keyed by its path,
+size, mtime and content hash, and stored as a pickle under .preset_cache/.
+Misses are parsed concurrently: in threads normally, or in a process pool
+for large batches such as a directory of config fragments.
+"""
+
+import hashlib
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from generator.log import log
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = ".preset_cache"
+PROCESS_POOL_BYTES = 512 * 1024  # Smaller batches parse faster in threads than a process pool starts
+
+
+def parse_yaml(text):
+    """Parse YAML text with the fastest available safe loader
+
+    yaml is imported here rather than at module level so code paths that
+    never parse YAML (such as applying a compiled plan) do not need it.
+    """
+    import yaml
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)  # libyaml C loader when available
+    return yaml.load(text, Loader=loader) or {}
+
+
+def build_entry(path, raw, stat, indexer):
+    """Parse one file into a cache entry (module level so process pool workers can run it)"""
+    data = parse_yaml(raw.decode('utf-8'))
+    return {
+        "version": CACHE_VERSION,
+        "path": os.path.abspath(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": hashlib.sha256(raw).hexdigest(),
+        "data": data,
+        "index": indexer(data) if indexer else None,
+    }
+
+
+class ConfigCache:
+    """Per-file cache of parsed YAML data plus an optional derived index"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, enabled=True):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.memory = {}  # In-process entries, so long-running sessions skip the pickle too
+
+    def entry_path(self, path):
+        digest = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{os.path.basename(path)}.{digest}.pickle")
+
+    def read_entry(self, path):
+        if not self.enabled:
+            return None
+        try:
+            with open(self.entry_path(path), 'rb') as f:
+                entry = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError, AttributeError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("version") != CACHE_VERSION:
+            return None
+        return entry
+
+    def write_entry(self, path, entry):
+        self.memory[path] = entry
+        if not self.enabled:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            target = self.entry_path(path)
+            temp_path = target + ".tmp"
+            with open(temp_path, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, target)
+        except OSError as e:
+            log.warning("⚠️ Could not write config cache for %s: %s", path, e)
+
+    def lookup(self, path):
+        """Return a valid cache entry for path, or (None, raw_bytes, stat) on a miss"""
+        stat = os.stat(path)
+        entry = self.memory.get(path) or self.read_entry(path)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry, None, stat
+
+        with open(path, 'rb') as f:
+            raw = f.read()
+        if entry and entry["sha256"] == hashlib.sha256(raw).hexdigest():
+            # Touched but unchanged: refresh the stat key and keep the parsed data
+            entry["size"] = stat.st_size
+            entry["mtime_ns"] = stat.st_mtime_ns
+            self.write_entry(path, entry)
+            return entry, None, stat
+        return None, raw, stat
+
+    def load_many(self, files, processes=False):
+        """Load {name: (path, indexer)} and return {name: (data, index)}
+
+        Cached files are served directly; misses are parsed concurrently, in
+        a process pool when processes is set and there is enough YAML to parse.
+        """
+        results = {}
+        pending = {}
+        self.hits = self.misses = 0
+        for name, (path, indexer) in files.items():
+            entry, raw, stat = self.lookup(path)
+            if entry is not None:
+                self.hits += 1
+                self.memory[path] = entry
+                results[name] = (entry["data"], entry["index"])
+            else:
+                self.misses += 1
+                pending[name] = (path, raw, stat, indexer)
+
+        if pending:
+            pending_bytes = sum(len(raw) for _, raw, _, _ in pending.values())
+            if processes and len(pending) > 1 and pending_bytes >= PROCESS_POOL_BYTES:
+                executor = ProcessPoolExecutor(max_workers=min(len(pending), os.cpu_count() or 1))
+            else:
+                executor = ThreadPoolExecutor(max_workers=len(pending))
+            with executor:
+                futures = {
+                    name: executor.submit(build_entry, *args)
+                    for name, args in pending.items()
+                }
+                for name, future in futures.items():
+                    entry = future.result()
+                    self.write_entry(pending[name][0], entry)
+                    results[name] = (entry["data"], entry["index"])
+
+        return results
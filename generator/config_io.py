@@ -0,0 +1,148 @@
+"""
+HybridCommander Config I/O
+==========================
+Change-aware, atomic reading and writing of HybridCommander-Config.json.
+Top-level keys the generator does not manage are carried through as their
+original raw JSON text so they survive a rewrite byte-for-byte.
+"""
+
+import json
+import os
+import stat
+import tempfile
+from functools import lru_cache
+
+# StorageUtil sections the generator reads and rewrites
+MANAGED_KEYS = ("string", "int", "float", "stringList", "intList")
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+def _skip_whitespace(text, pos):
+    while pos < len(text) and text[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def scan_top_level(text):
+    """Return {key: raw_value_text} for each member of a top-level JSON object"""
+    members = {}
+    pos = _skip_whitespace(text, 0)
+    if pos >= len(text) or text[pos] != "{":
+        raise ValueError("Config root is not a JSON object")
+    pos = _skip_whitespace(text, pos + 1)
+    if pos < len(text) and text[pos] == "}":
+        return members
+
+    while True:
+        key, pos = _decoder.raw_decode(text, pos)
+        pos = _skip_whitespace(text, pos)
+        if text[pos] != ":":
+            raise ValueError(f"Expected ':' at offset {pos}")
+        start = _skip_whitespace(text, pos + 1)
+        _, end = _decoder.raw_decode(text, start)
+        members[key] = text[start:end]
+        pos = _skip_whitespace(text, end)
+        if text[pos] == "}":
+            return members
+        if text[pos] != ",":
+            raise ValueError(f"Expected ',' at offset {pos}")
+        pos = _skip_whitespace(text, pos + 1)
+
+
+def read_config_document(path):
+    """Load a config file, returning (data, raw_unmanaged_members)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    data = json.loads(text)
+    raw_members = {
+        key: raw for key, raw in scan_top_level(text).items()
+        if key not in MANAGED_KEYS
+    }
+    return data, raw_members
+
+
+def serialize_config(config, raw_members=None, compact=False):
+    """Serialize the config once, splicing unmanaged members back in verbatim"""
+    raw_members = raw_members or {}
+    members = []
+    for key, value in config.items():
+        if key in raw_members:
+            value_text = raw_members[key]
+        elif compact:
+            value_text = json.dumps(value, separators=(',', ':'))
+        else:
+            # Re-indent nested lines to match json.dump(indent=2) of the whole document
+            value_text = json.dumps(value, indent=2).replace("\n", "\n  ")
+        members.append((json.dumps(key), value_text))
+
+    if not members:
+        return "{}"
+    if compact:
+        return "{" + ",".join(f"{key}:{value}" for key, value in members) + "}"
+    return "{\n" + ",\n".join(f"  {key}: {value}" for key, value in members) + "\n}"
+
+
+def file_matches(path, payload):
+    """Check whether a file already contains exactly these bytes"""
+    try:
+        if os.path.getsize(path) != len(payload):
+            return False
+        with open(path, 'rb') as f:
+            return f.read() == payload
+    except OSError:
+        return False
+
+
+@lru_cache(maxsize=1)
+def default_file_mode():
+    """Mode a newly created file gets under the process umask"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def target_mode(path):
+    """Permissions to give the replacement file: the target's own, or the umask default if it is new"""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return default_file_mode()
+
+
+def atomic_write(path, payload):
+    """Write bytes to a temp file, fsync it and rename it over the target, keeping the target's permissions"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file as 0600
+        os.chmod(temp_path, target_mode(path))
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+    # Persist the rename itself (not supported on Windows)
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def write_if_changed(path, text):
+    """Atomically write text unless the file already holds it; returns True if written"""
+    payload = text.encode('utf-8')
+    if file_matches(path, payload):
+        return False
+    atomic_write(path, payload)
+    return True
@@ -0,0 +1,65 @@
+"""
+Preset Deduplication
+====================
+Groups keybinds whose resolved console commands are identical so they can
+share a single HybridCommander preset slot.
+"""
+
+import hashlib
+import re
+
+TOKEN = re.compile(r'"[^"]*"?|\S+')
+# Form IDs (0000000f, 0x000D62) and plugin references (Skyrim.esm:000D62), which the console reads case-insensitively
+FORM_TOKEN = re.compile(r"(?:0x)?[0-9a-f]{1,8}|[^:]+\.es[mpl][:|](?:0x)?[0-9a-f]{1,8}", re.IGNORECASE)
+
+
+def canonical_command(command):
+    """Normalize a console command for comparison
+
+    Whitespace between tokens is collapsed and the verb (with its reference)
+    and form-ID tokens are lowercased. Quoted arguments are kept as written,
+    since their case can matter.
+    """
+    tokens = TOKEN.findall(str(command))
+    return " ".join(token.lower() if index == 0 or FORM_TOKEN.fullmatch(token) else token
+                    for index, token in enumerate(tokens))
+
+
+def canonical_digest(commands):
+    """Hash of a command list after canonicalization"""
+    payload = "\n".join(canonical_command(command) for command in commands)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class PresetGroup:
+    """One preset slot's worth of content and the keybinds that share it"""
+
+    __slots__ = ("keys", "name", "commands", "digest")
+
+    def __init__(self, key, preset_name, commands, digest):
+        self.keys = [key]
+        self.name = preset_name
+        self.commands = commands
+        self.digest = digest
+
+    @property
+    def shared(self):
+        return len(self.keys) > 1
+
+
+def group_identical(resolved):
+    """Group {key: (preset_name, commands)} by canonical command list, in first-seen order
+
+    A shared preset is named after its first keybind with the other keys
+    appended, e.g. Python_spawn_bears_Numpad1+F9.
+    """
+    groups = {}
+    for key, (preset_name, commands) in resolved.items():
+        digest = canonical_digest(commands)
+        group = groups.get(digest)
+        if group is None:
+            groups[digest] = PresetGroup(key, preset_name, commands, digest)
+        else:
+            group.keys.append(key)
+            group.name = f"{group.name}+{key}"
+    return list(groups.values())
@@ -0,0 +1,284 @@
+"""
+Form-ID Database
+================
+SQLite index of item names and form IDs imported from xEdit/CSV dumps (or
+YAML id files), so `give_item` can take human names such as "iron sword"
+for any of hundreds of thousands of records without loading them into
+memory.
+
+Names are normalized (lowercase, punctuation and underscores to spaces)
+and split into trigrams. A lookup tries an exact name/EditorID hit first,
+then gathers candidates from the query's rarest trigrams and ranks them by
+trigram similarity, with a bonus for prefix matches.
+"""
+
+import csv
+import os
+import re
+import sqlite3
+
+from generator.index import flatten_tree
+
+DEFAULT_FORM_DB = "forms.db"
+FUZZY_THRESHOLD = 0.45   # Minimum similarity for a fuzzy resolve
+CANDIDATE_GRAMS = 6      # Rarest query trigrams used to gather candidates
+CANDIDATE_LIMIT = 200
+POSTINGS_LIMIT = 2000    # Records read per trigram when gathering candidates
+IMPORT_BATCH = 50000
+
+FORM_ID_PATTERN = re.compile(r"^(?:0x)?[0-9a-fA-F]{1,8}$")
+
+# Header aliases found in xEdit exports and hand-made CSVs
+COLUMN_ALIASES = {
+    "form_id": ("formid", "form_id", "form id", "id", "fid"),
+    "editor_id": ("editorid", "editor_id", "editor id", "edid"),
+    "name": ("name", "full", "fullname", "full name", "display name"),
+    "record_type": ("signature", "type", "record", "record type", "sig"),
+    "plugin": ("plugin", "file", "master", "source", "mod"),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    form_id TEXT NOT NULL,
+    editor_id TEXT,
+    name TEXT,
+    norm TEXT NOT NULL,
+    record_type TEXT,
+    plugin TEXT
+);
+CREATE TABLE IF NOT EXISTS trigrams (
+    gram TEXT NOT NULL,
+    record_id INTEGER NOT NULL,
+    PRIMARY KEY (gram, record_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS gram_counts (
+    gram TEXT PRIMARY KEY,
+    n INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS records_norm ON records (norm);
+CREATE INDEX IF NOT EXISTS records_editor ON records (editor_id COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS records_form ON records (form_id);
+"""
+
+
+def normalize(text):
+    """'Iron_Sword (Skyrim)' -> 'iron sword skyrim'"""
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", str(text).lower()).split())
+
+
+def trigrams(norm):
+    """Set of trigrams of a normalized name, padded so word starts count"""
+    padded = f"  {norm} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def normalize_form_id(value):
+    """'[WEAP:00012EB7]', '0x12eb7', '00012EB7' -> '00012eb7'"""
+    text = str(value).strip().strip("[]")
+    if ":" in text:
+        text = text.rsplit(":", 1)[1]
+    text = re.sub(r"^0x", "", text.lower())
+    if not FORM_ID_PATTERN.match(text):
+        return None
+    return text.zfill(8)
+
+
+def looks_like_form_id(value):
+    """True for hex form IDs, which are passed through instead of searched"""
+    return isinstance(value, str) and bool(FORM_ID_PATTERN.match(value.strip())) and any(
+        char.isdigit() for char in value)
+
+
+def read_delimited(path):
+    """Yield record dicts from a CSV/TSV/semicolon dump with a header row"""
+    with open(path, 'r', encoding='utf-8-sig', errors='replace', newline='') as f:
+        sample = f.read(64 * 1024)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(f, dialect)
+        header = [normalize(column) for column in next(reader, [])]
+        columns = {}
+        for field, aliases in COLUMN_ALIASES.items():
+            for index, column in enumerate(header):
+                if column in aliases and field not in columns:
+                    columns[field] = index
+        if "form_id" not in columns:
+            raise ValueError(f"{os.path.basename(path)}: no FormID column in header {header}")
+
+        plugin_default = os.path.splitext(os.path.basename(path))[0]
+        for row in reader:
+            record = {field: row[index].strip() if index < len(row) else "" for field, index in columns.items()}
+            record.setdefault("plugin", plugin_default)
+            yield record
+
+
+def read_yaml_ids(path):
+    """Yield record dicts from an ids.yaml-style tree (dotted path = editor id, leaf = name)"""
+    from generator.config_cache import parse_yaml
+
+    with open(path, 'r', encoding='utf-8') as f:
+        flat = flatten_tree(parse_yaml(f.read()))
+    for dotted, form_id in flat.items():
+        if isinstance(form_id, str):
+            yield {"form_id": form_id, "editor_id": dotted, "name": dotted.rsplit(".", 1)[-1],
+                   "plugin": os.path.basename(path)}
+
+
+def read_dump(path):
+    """Records from a .yaml/.yml id file or a delimited text dump"""
+    if path.lower().endswith((".yaml", ".yml")):
+        return read_yaml_ids(path)
+    return read_delimited(path)
+
+
+def import_dumps(db_path, paths, replace=False):
+    """Import dumps into the SQLite index; returns {path: records imported}"""
+    if replace and os.path.exists(db_path):
+        os.remove(db_path)
+    connection = sqlite3.connect(db_path)
+    try:
+        connection.executescript("PRAGMA journal_mode=OFF; PRAGMA synchronous=OFF; PRAGMA temp_store=MEMORY;"
+                                 + SCHEMA)
+        # Rebuilt after the bulk insert; maintaining them row by row is much slower
+        connection.executescript("DROP INDEX IF EXISTS records_norm; DROP INDEX IF EXISTS records_editor;"
+                                 "DROP INDEX IF EXISTS records_form;")
+        first_id = next_id = connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM records").fetchone()[0]
+        counts = {}
+        for path in paths:
+            rows = []
+            imported = 0
+            for record in read_dump(path):
+                form_id = normalize_form_id(record.get("form_id", ""))
+                label = record.get("name") or record.get("editor_id") or ""
+                norm = normalize(label)
+                if form_id is None or not norm:
+                    continue
+                rows.append((next_id, form_id, record.get("editor_id") or None, label, norm,
+                             record.get("record_type") or None, record.get("plugin") or None))
+                next_id += 1
+                imported += 1
+                if len(rows) >= IMPORT_BATCH:
+                    connection.executemany("INSERT INTO records VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                    rows = []
+            connection.executemany("INSERT INTO records VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            counts[path] = imported
+
+        # Trigrams are generated and sorted inside SQLite so the clustered index is written in order
+        longest = connection.execute("SELECT COALESCE(MAX(LENGTH(norm)), 0) FROM records").fetchone()[0]
+        connection.execute("CREATE TEMP TABLE positions (i INTEGER PRIMARY KEY)")
+        connection.executemany("INSERT INTO temp.positions VALUES (?)", ((i,) for i in range(1, longest + 2)))
+        connection.execute(
+            "INSERT OR IGNORE INTO trigrams (gram, record_id) "
+            "SELECT SUBSTR('  ' || norm || ' ', i, 3) AS gram, id FROM records "
+            "JOIN temp.positions ON i <= LENGTH(norm) + 1 WHERE id >= ? ORDER BY gram, id",
+            (first_id,))
+        connection.execute("DELETE FROM gram_counts")
+        connection.execute("INSERT INTO gram_counts SELECT gram, COUNT(*) FROM trigrams GROUP BY gram")
+        connection.executescript(INDEXES + "ANALYZE;")
+        connection.commit()
+    finally:
+        connection.close()
+    return counts
+
+
+class FormDatabase:
+    """Read-only lookups against an imported form-ID index"""
+
+    def __init__(self, path=DEFAULT_FORM_DB):
+        self.path = path
+        self._connection = None
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            uri = "file:" + os.path.abspath(self.path).replace("\\", "/") + "?mode=ro"
+            self._connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def exact(self, name):
+        """Form ID for an exact (normalized) name or EditorID, or None"""
+        row = self.connection.execute(
+            "SELECT form_id FROM records WHERE norm = ? OR editor_id = ? COLLATE NOCASE ORDER BY id LIMIT 1",
+            (normalize(name), str(name))
+        ).fetchone()
+        return row[0] if row else None
+
+    def search(self, query, limit=10):
+        """Best matches as (score, form_id, name, plugin), most similar first"""
+        norm = normalize(query)
+        if not norm:
+            return []
+        query_grams = trigrams(norm)
+
+        # The rarest trigrams find candidates without touching common ones like " th"
+        placeholders = ",".join("?" * len(query_grams))
+        rare = [gram for gram, _ in self.connection.execute(
+            f"SELECT gram, n FROM gram_counts WHERE gram IN ({placeholders}) ORDER BY n LIMIT ?",
+            (*query_grams, CANDIDATE_GRAMS))]
+        prefix_rows = self.connection.execute(
+            "SELECT id, form_id, name, norm, plugin FROM records WHERE norm >= ? AND norm < ? LIMIT ?",
+            (norm, norm + "\x7f", CANDIDATE_LIMIT)).fetchall()
+        # Count shared rare trigrams per record over a bounded slice of each posting list
+        gram_rows = []
+        if rare:
+            postings = " UNION ALL ".join(
+                "SELECT * FROM (SELECT record_id FROM trigrams WHERE gram = ? LIMIT ?)" for _ in rare)
+            parameters = [value for gram in rare for value in (gram, POSTINGS_LIMIT)]
+            # Among equal hit counts shorter names are closer matches, so they win the cut
+            gram_rows = self.connection.execute(
+                f"SELECT r.id, r.form_id, r.name, r.norm, r.plugin FROM ("
+                f"  SELECT record_id, COUNT(*) AS hits FROM ({postings}) GROUP BY record_id"
+                f") c JOIN records r ON r.id = c.record_id ORDER BY c.hits DESC, LENGTH(r.norm), r.id LIMIT ?",
+                (*parameters, CANDIDATE_LIMIT)).fetchall()
+
+        scored = {}
+        for record_id, form_id, name, record_norm, plugin in prefix_rows + gram_rows:
+            if record_id in scored:
+                continue
+            record_grams = trigrams(record_norm)
+            shared = len(query_grams & record_grams)
+            score = shared / len(query_grams | record_grams)
+            if record_norm.startswith(norm):
+                score = min(1.0, score + 0.25)
+            scored[record_id] = (round(score, 4), form_id, name, plugin)
+        # Ties go to the shorter name, then to the earliest import (base game dumps first)
+        ranked = sorted(scored.items(), key=lambda item: (-item[1][0], len(item[1][2] or ""), item[0]))
+        return [match for _, match in ranked[:limit]]
+
+    def resolve(self, name, threshold=FUZZY_THRESHOLD):
+        """Form ID for a human name: exact hit, else the best fuzzy match above threshold"""
+        match = self.resolve_match(name, threshold)
+        return match[0] if match else None
+
+    def resolve_match(self, name, threshold=FUZZY_THRESHOLD):
+        """(form_id, matched name, score) like resolve(); score is None for an exact hit"""
+        form_id = self.exact(name)
+        if form_id is not None:
+            return form_id, name, None
+        matches = self.search(name, limit=1)
+        if matches and matches[0][0] >= threshold:
+            score, form_id, matched, _plugin = matches[0]
+            return form_id, matched, score
+        return None
+
+
+def open_form_database(path=DEFAULT_FORM_DB):
+    """FormDatabase for an existing index file, or None"""
+    if not path or not os.path.exists(path):
+        return None
+    return FormDatabase(path)
@@ -0,0 +1,157 @@
+"""
+Config Fragments
+================
+Lets config.yaml be split into several files. A top-level `include:` lists
+files, directories (every *.yaml / *.yml inside) or glob patterns, relative
+to the file that includes them; fragments may include further fragments.
+
+    include:
+      - keybinds/*.yaml
+      - players/alice.yaml
+
+Every fragment is cached separately by the parsed-config cache, and all
+fragments that changed are parsed together in a process pool. They are then
+merged in a fixed order: the including file first, then its includes in
+the order listed, with glob matches sorted by name. Nested mappings merge
+key by key. A keybind or function definition is one unit, so two fragments
+that define the same one, or set the same value differently, are reported
+as a conflict naming both files.
+"""
+
+import glob
+import os
+
+INCLUDE_KEY = "include"
+ATOMIC_SECTIONS = ("keybinds", "function_definitions")  # Their entries never merge field by field
+FRAGMENT_EXTENSIONS = (".yaml", ".yml")
+
+
+class ConfigConflict(ValueError):
+    """Two fragments define the same setting differently"""
+
+
+def expand_include(base_dir, pattern):
+    """Sorted fragment paths for one include entry"""
+    pattern = os.path.expandvars(os.path.expanduser(str(pattern)))
+    if not os.path.isabs(pattern):
+        pattern = os.path.join(base_dir, pattern)
+    if os.path.isdir(pattern):
+        return sorted(path for path in glob.glob(os.path.join(pattern, "*"))
+                      if path.lower().endswith(FRAGMENT_EXTENSIONS))
+    if glob.has_magic(pattern):
+        return sorted(glob.glob(pattern))
+    if not os.path.exists(pattern):
+        raise FileNotFoundError(f"Included config file not found: {pattern}")
+    return [pattern]
+
+
+def include_list(data, path):
+    includes = data.get(INCLUDE_KEY) or []
+    if isinstance(includes, str):
+        includes = [includes]
+    if not isinstance(includes, list):
+        raise ValueError(f"{path}: include must be a path or a list of paths")
+    return includes
+
+
+class ConfigTree:
+    """Loads a config file plus everything it includes, merged into one mapping"""
+
+    def __init__(self, config_cache):
+        self.config_cache = config_cache
+        self.fragments = []   # Included files of the last load, in merge order
+        self.memo = None      # (fragment content key, merged data) of the last load
+
+    def load(self, path, data):
+        """Merged config for path, whose own parsed data is given; reuses the last merge if nothing changed"""
+        if INCLUDE_KEY not in data:
+            self.fragments = []
+            return data
+
+        # Discover and parse level by level, so each level's changed fragments are parsed together
+        parsed = {os.path.abspath(path): data}
+        level = [os.path.abspath(path)]
+        while level:
+            found = []
+            for parent in level:
+                base_dir = os.path.dirname(parent)
+                for pattern in include_list(parsed[parent], parent):
+                    found += [os.path.abspath(match) for match in expand_include(base_dir, pattern)
+                              if os.path.abspath(match) not in parsed and os.path.abspath(match) not in found]
+            hits, misses = self.config_cache.hits, self.config_cache.misses
+            loaded = self.config_cache.load_many({fragment: (fragment, None) for fragment in found}, processes=True)
+            self.config_cache.hits += hits
+            self.config_cache.misses += misses
+            for fragment in found:
+                parsed[fragment] = loaded[fragment][0]
+            level = found
+
+        order = self.merge_order(os.path.abspath(path), parsed)
+        self.fragments = order[1:]
+        key = tuple((fragment, self.config_cache.memory.get(fragment, {}).get("sha256")) for fragment in order)
+        if self.memo is not None and self.memo[0] == key and parsed[order[0]] is self.memo[2]:
+            return self.memo[1]
+
+        merged = {}
+        owners = {}
+        copied = set()
+        for fragment in order:
+            fragment_data = parsed[fragment]
+            if not isinstance(fragment_data, dict):
+                raise ValueError(f"{fragment}: a config fragment must be a mapping")
+            body = {name: value for name, value in fragment_data.items() if name != INCLUDE_KEY}
+            merge_into(merged, body, os.path.relpath(fragment), owners, copied)
+        self.memo = (key, merged, parsed[order[0]])
+        return merged
+
+    def merge_order(self, root, parsed):
+        """Depth-first: each file, then its includes in the order listed (each file once)"""
+        order = []
+        seen = set()
+
+        def visit(path):
+            if path in seen:
+                return
+            seen.add(path)
+            order.append(path)
+            base_dir = os.path.dirname(path)
+            for pattern in include_list(parsed[path], path):
+                for match in expand_include(base_dir, pattern):
+                    visit(os.path.abspath(match))
+
+        visit(root)
+        return order
+
+
+def owner_of(owners, dotted):
+    """File that defined dotted, or the nearest parent mapping it came with"""
+    while dotted:
+        if dotted in owners:
+            return owners[dotted]
+        dotted = dotted[:-1]
+    return "?"
+
+
+def merge_into(merged, data, source, owners, copied, path=()):
+    """Merge one fragment's mapping into merged in place, raising ConfigConflict on clashes
+
+    Mappings taken over from a fragment are copied before anything is merged
+    into them, so cached fragment data is never modified.
+    """
+    atomic = len(path) == 1 and path[0] in ATOMIC_SECTIONS
+    for key, value in data.items():
+        dotted = path + (key,)
+        if key not in merged:
+            merged[key] = value
+            owners[dotted] = source
+            continue
+        existing = merged[key]
+        if atomic or not isinstance(existing, dict) or not isinstance(value, dict):
+            if existing != value:
+                raise ConfigConflict(f"{'.'.join(map(str, dotted))} is defined in both "
+                                     f"{owner_of(owners, dotted)} and {source}")
+            continue
+        if id(existing) not in copied:
+            existing = merged[key] = dict(existing)
+            copied.add(id(existing))
+        merge_into(existing, value, source, owners, copied, dotted)
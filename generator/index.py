@@ -0,0 +1,75 @@
+"""
+Lookup Index
+============
+Flattens the nested ids.yaml and commands.yaml trees into dotted-path
+lookup tables so every resolution is a single dictionary hit, plus a
+reverse form ID -> name table (built on first use) for reporting.
+"""
+
+from types import MappingProxyType
+
+
+def flatten_tree(tree, prefix=""):
+    """Flatten a nested mapping into {dotted.path: leaf_value}, in document order"""
+    flat = {}
+    if not isinstance(tree, dict):
+        return flat
+
+    stack = [(prefix, iter(tree.items()))]
+    while stack:
+        base, items = stack[-1]
+        for key, value in items:
+            path = f"{base}.{key}" if base else str(key)
+            if isinstance(value, dict):
+                stack.append((path, iter(value.items())))
+                break
+            flat[path] = tuple(value) if isinstance(value, list) else value
+        else:
+            stack.pop()
+    return flat
+
+
+def reverse_form_ids(flat_ids):
+    """Build {form_id: dotted.name} from a flattened ids table (first name wins)"""
+    names = {}
+    for path, value in flat_ids.items():
+        if isinstance(value, str):
+            names.setdefault(value.lower(), path)
+    return names
+
+
+class LookupIndex:
+    """Immutable dotted-path index over the commands and ids tables"""
+
+    def __init__(self, flat_commands=None, flat_ids=None):
+        self.commands = MappingProxyType(dict(flat_commands or {}))
+        self.ids = MappingProxyType(dict(flat_ids or {}))
+        self.names_by_form_id = None  # Reverse index, built on the first name_for()
+
+    def command(self, path, default=None):
+        """Look up a commands.yaml entry by dotted path"""
+        return self.commands.get(path, default)
+
+    def form_id(self, name, default=None):
+        """Look up an ids.yaml form ID by dotted name"""
+        return self.ids.get(name, default)
+
+    def name_for(self, form_id, default=None):
+        """Reverse lookup: form ID to its dotted ids.yaml name"""
+        if not isinstance(form_id, str):
+            return default
+        if self.names_by_form_id is None:
+            self.names_by_form_id = MappingProxyType(reverse_form_ids(self.ids))
+        return self.names_by_form_id.get(form_id.lower(), default)
+
+    def describe_ids(self, command):
+        """['0000000f = currency.gold', ...] for every known form ID in a console command"""
+        notes = []
+        for token in str(command).split()[1:]:
+            name = self.name_for(token)
+            if name is not None:
+                notes.append(f"{token} = {name}")
+        return notes
+
+    def __len__(self):
+        return len(self.commands) + len(self.ids)
@@ -0,0 +1,203 @@
+"""
+Load Order
+==========
+Resolves load-order-independent form references ("Plugin.esp:000D62") to
+runtime form IDs for the current plugins.txt / loadorder.txt.
+
+References are interned as compact integers (plugin table index << 24 |
+local ID) and resolved together in one pass over precomputed per-plugin
+base/mask tables. Full plugins get the next 00-FD prefix; light plugins
+(.esl, or ESL-flagged .esp/.esm) share the FE prefix with a 12-bit slot:
+FE xxx yyy.
+"""
+
+import os
+import re
+import struct
+from array import array
+
+# Masters the game always loads first, whether or not plugins.txt lists them
+IMPLICIT_MASTERS = ("Skyrim.esm", "Update.esm", "Dawnguard.esm", "HearthFires.esm", "Dragonborn.esm")
+DEFAULT_PLUGINS_DIR = os.path.join("%LOCALAPPDATA%", "Skyrim Special Edition")
+
+REFERENCE_PATTERN = re.compile(r"^\s*(?P<plugin>[^:|]+\.es[mpl])\s*[:|]\s*(?:0x)?(?P<local>[0-9a-fA-F]{1,8})\s*$",
+                               re.IGNORECASE)
+
+TES4_HEADER = struct.Struct("<4sIII")
+LIGHT_FLAG = 0x200
+
+MAX_FULL_PLUGINS = 0xFE
+MAX_LIGHT_PLUGINS = 0x1000
+
+
+def parse_reference(value):
+    """'Plugin.esp:000D62' -> ('Plugin.esp', 0xD62), or None for anything else"""
+    if not isinstance(value, str):
+        return None
+    match = REFERENCE_PATTERN.match(value)
+    if match is None:
+        return None
+    return match.group("plugin").strip(), int(match.group("local"), 16) & 0xFFFFFF
+
+
+def read_plugin_list(path):
+    """Plugin names from plugins.txt / loadorder.txt as [(name, active)]"""
+    entries = []
+    with open(path, 'r', encoding='utf-8-sig', errors='replace') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            active = line.startswith("*")
+            entries.append((line.lstrip("*").strip(), active))
+    return entries
+
+
+def is_light_plugin(name, data_path=None):
+    """.esl files, plus .esp/.esm files whose TES4 header carries the light flag"""
+    if name.lower().endswith(".esl"):
+        return True
+    if not data_path:
+        return False
+    try:
+        with open(os.path.join(data_path, name), 'rb') as f:
+            signature, _size, flags, _form_id = TES4_HEADER.unpack(f.read(TES4_HEADER.size))
+    except (OSError, struct.error):
+        return False
+    return signature == b"TES4" and bool(flags & LIGHT_FLAG)
+
+
+class LoadOrder:
+    """Active plugins with their runtime prefix (and light-plugin slot)"""
+
+    def __init__(self, plugins, light=()):
+        self.plugins = []
+        self.slots = {}  # lowercase name -> (is_light, index)
+        light = {name.lower() for name in light}
+        full_count = light_count = 0
+        for name in plugins:
+            lowered = name.lower()
+            if lowered in self.slots:
+                continue
+            if lowered in light:
+                if light_count >= MAX_LIGHT_PLUGINS:
+                    raise ValueError(f"Too many light plugins (max {MAX_LIGHT_PLUGINS})")
+                self.slots[lowered] = (True, light_count)
+                light_count += 1
+            else:
+                if full_count >= MAX_FULL_PLUGINS:
+                    raise ValueError(f"Too many full plugins (max {MAX_FULL_PLUGINS})")
+                self.slots[lowered] = (False, full_count)
+                full_count += 1
+            self.plugins.append(name)
+
+    @classmethod
+    def from_files(cls, plugins_txt=None, loadorder_txt=None, data_path=None):
+        """Parse plugins.txt (active flags) and/or loadorder.txt (full order)"""
+        active = None
+        order = []
+        if plugins_txt and os.path.exists(plugins_txt):
+            entries = read_plugin_list(plugins_txt)
+            # Old-style plugins.txt has no '*' markers; every listed plugin is active
+            marked = any(is_active for _, is_active in entries)
+            active = {name.lower() for name, is_active in entries if is_active or not marked}
+            order = [name for name, _ in entries]
+        if loadorder_txt and os.path.exists(loadorder_txt):
+            order = [name for name, _ in read_plugin_list(loadorder_txt)]
+        if active is None and not order:
+            raise FileNotFoundError("No plugins.txt or loadorder.txt found")
+
+        implicit = [name.lower() for name in IMPLICIT_MASTERS]
+        plugins = list(IMPLICIT_MASTERS) + [
+            name for name in order
+            if name.lower() not in implicit and (active is None or name.lower() in active)
+        ]
+        light = [name for name in plugins if is_light_plugin(name, data_path)]
+        return cls(plugins, light)
+
+    def runtime_form_id(self, plugin, local_id):
+        """Runtime form ID for one reference, or None if the plugin is not active"""
+        slot = self.slots.get(plugin.lower())
+        if slot is None:
+            return None
+        is_light, index = slot
+        if is_light:
+            return 0xFE000000 | (index << 12) | (local_id & 0xFFF)
+        return (index << 24) | (local_id & 0xFFFFFF)
+
+
+class ReferenceTable:
+    """Interned (plugin, local ID) references stored as compact integers"""
+
+    def __init__(self):
+        self.plugins = []        # Plugin names by table index
+        self.plugin_index = {}   # lowercase name -> table index
+        self.codes = array("Q")  # plugin table index << 24 | local ID (64-bit: "L" is 32-bit on Windows)
+
+    def add(self, plugin, local_id):
+        """Intern a reference; returns its position in the table"""
+        lowered = plugin.lower()
+        index = self.plugin_index.get(lowered)
+        if index is None:
+            index = self.plugin_index[lowered] = len(self.plugins)
+            self.plugins.append(plugin)
+        self.codes.append((index << 24) | local_id)
+        return len(self.codes) - 1
+
+    def resolve_all(self, load_order):
+        """Resolve every reference in one pass; unresolvable entries become None"""
+        # Per-plugin base prefix and local-ID mask, so each code is one lookup, OR and AND
+        bases = []
+        masks = []
+        for plugin in self.plugins:
+            slot = load_order.slots.get(plugin.lower())
+            if slot is None:
+                bases.append(None)
+                masks.append(0)
+            elif slot[0]:
+                bases.append(0xFE000000 | (slot[1] << 12))
+                masks.append(0xFFF)
+            else:
+                bases.append(slot[1] << 24)
+                masks.append(0xFFFFFF)
+        return [
+            None if bases[code >> 24] is None else f"{bases[code >> 24] | (code & masks[code >> 24]):08x}"
+            for code in self.codes
+        ]
+
+    def missing_plugins(self, load_order):
+        return [plugin for plugin in self.plugins if plugin.lower() not in load_order.slots]
+
+
+def remap_references(flat, load_order):
+    """Return a copy of a flat {path: value} table with plugin references resolved to form IDs
+
+    Also returns the references that could not be resolved as {path: value}.
+    """
+    table = ReferenceTable()
+    paths = []
+    for path, value in flat.items():
+        reference = parse_reference(value)
+        if reference is not None:
+            table.add(*reference)
+            paths.append(path)
+    if not paths:
+        return flat, {}
+
+    remapped = dict(flat)
+    unresolved = {}
+    for path, form_id in zip(paths, table.resolve_all(load_order)):
+        if form_id is None:
+            unresolved[path] = flat[path]
+        else:
+            remapped[path] = form_id
+    return remapped, unresolved
+
+
+def default_plugin_files(settings=None):
+    """plugins.txt / loadorder.txt locations from config.yaml load_order settings or the game default"""
+    settings = settings or {}
+    directory = os.path.expandvars(settings.get("directory") or DEFAULT_PLUGINS_DIR)
+    plugins_txt = settings.get("plugins") or os.path.join(directory, "plugins.txt")
+    loadorder_txt = settings.get("loadorder") or os.path.join(directory, "loadorder.txt")
+    return os.path.expandvars(plugins_txt), os.path.expandvars(loadorder_txt)
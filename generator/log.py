@@ -0,0 +1,219 @@
+"""
+Logging and Profiling
+=====================
+Leveled console output for the preset generator. Messages use lazy
+%-formatting, so per-preset and per-command detail costs nothing when its
+level is filtered out (--quiet). --json switches to one JSON object per
+line for scripts and CI.
+
+Profiler times named phases (load, index, resolve, allocate, serialize,
+write) and, with tracemalloc, the memory each one allocates. Nested phases
+are exclusive: time spent in an inner phase is not counted again in the
+outer one.
+"""
+
+import json
+import logging
+import sys
+import time
+import tracemalloc
+
+LOGGER_NAME = "skyrim"
+PHASES = ("load", "index", "resolve", "optimize", "validate", "allocate", "serialize", "write")
+
+
+class ConsoleHandler(logging.StreamHandler):
+    """StreamHandler that writes to whatever sys.stdout is at emit time (so redirect_stdout captures it)"""
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record; extra={'fields': {...}} adds structured data"""
+
+    def format(self, record):
+        entry = {
+            "time": round(record.created, 6),
+            "level": record.levelname.lower(),
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def get_logger():
+    """The shared generator logger, printing plain messages at INFO until configured"""
+    logger = logging.getLogger(LOGGER_NAME)
+    if not logger.handlers:
+        handler = ConsoleHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+def configure(quiet=False, verbose=False, json_output=False):
+    """Apply --quiet / --verbose / --json to the shared logger"""
+    logger = get_logger()
+    if quiet:
+        logger.setLevel(logging.WARNING)
+    elif verbose:
+        logger.setLevel(logging.DEBUG)
+    else:
+        logger.setLevel(logging.INFO)
+    formatter = JsonFormatter() if json_output else logging.Formatter("%(message)s")
+    for handler in logger.handlers:
+        handler.setFormatter(formatter)
+    return logger
+
+
+log = get_logger()
+
+
+class Joined:
+    """Lazily joined list for log arguments, so the string is only built if the record is emitted"""
+
+    __slots__ = ("items", "separator")
+
+    def __init__(self, items, separator=", "):
+        self.items = items
+        self.separator = separator
+
+    def __str__(self):
+        return self.separator.join(str(item) for item in self.items)
+
+
+class PhaseStats:
+    """Accumulated wall time and allocations of one phase"""
+
+    __slots__ = ("name", "calls", "seconds", "allocated", "peak")
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.allocated = 0  # Net bytes still allocated when the phase ended
+        self.peak = 0       # Highest memory above the phase's starting point
+
+
+class Phase:
+    """Context manager for one profiled phase"""
+
+    __slots__ = ("profiler", "name")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler.push(self.name)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.pop()
+        return False
+
+
+class NullPhase:
+    """Shared no-op phase used when profiling is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_PHASE = NullPhase()
+
+
+class Profiler:
+    """Per-phase wall time and (optionally) tracemalloc allocations"""
+
+    def __init__(self, enabled=False, trace_memory=True, clock=time.perf_counter):
+        self.enabled = enabled
+        self.trace_memory = trace_memory and enabled
+        self.clock = clock
+        self.stats = {}
+        self.stack = []  # Open phases, innermost last
+        self.segment_start = None
+        self.memory_start = 0
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def phase(self, name):
+        """`with profiler.phase("resolve"):` - free when profiling is disabled"""
+        return Phase(self, name) if self.enabled else NULL_PHASE
+
+    def _memory(self):
+        return tracemalloc.get_traced_memory() if self.trace_memory else (0, 0)
+
+    def _close_segment(self):
+        """Charge time and memory since the last phase boundary to the innermost open phase"""
+        if not self.stack:
+            return
+        stats = self.stats[self.stack[-1]]
+        stats.seconds += self.clock() - self.segment_start
+        current, peak = self._memory()
+        stats.allocated += current - self.memory_start
+        stats.peak = max(stats.peak, peak - self.memory_start)
+
+    def _open_segment(self):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        self.memory_start = self._memory()[0]
+        self.segment_start = self.clock()
+
+    def push(self, name):
+        self._close_segment()
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = PhaseStats(name)
+        stats.calls += 1
+        self.stack.append(name)
+        self._open_segment()
+
+    def pop(self):
+        self._close_segment()
+        self.stack.pop()
+        self._open_segment()
+
+    def report(self):
+        """{phase: {calls, seconds, allocated_kb, peak_kb}} in PHASES order, then any others"""
+        names = [name for name in PHASES if name in self.stats]
+        names += [name for name in self.stats if name not in PHASES]
+        return {
+            name: {
+                "calls": self.stats[name].calls,
+                "seconds": round(self.stats[name].seconds, 6),
+                "allocated_kb": round(self.stats[name].allocated / 1024, 1),
+                "peak_kb": round(self.stats[name].peak / 1024, 1),
+            }
+            for name in names
+        }
+
+    def log_report(self, logger=log):
+        """Print the per-phase table; shown even with --quiet since it was asked for"""
+        if not self.enabled:
+            return
+        level = max(logger.getEffectiveLevel(), logging.INFO)
+        report = self.report()
+        total = sum(entry["seconds"] for entry in report.values())
+        logger.log(level, "⏱️ Profile: %.1fms across %d phases", total * 1000, len(report),
+                   extra={"fields": {"profile_total_seconds": round(total, 6)}})
+        for name, entry in report.items():
+            memory = (f", {entry['allocated_kb']:+.1f} KB net, {entry['peak_kb']:.1f} KB peak"
+                      if self.trace_memory else "")
+            logger.log(level, "   %-9s %8.2fms  x%d%s", name, entry["seconds"] * 1000, entry["calls"], memory,
+                       extra={"fields": {"phase": name, **entry}})
+
@@ -0,0 +1,88 @@
+"""
+Preset Manifest
+===============
+Sidecar record of which slot each keybind was written to and a fingerprint
+of its resolved commands, so re-runs only touch keybinds that changed.
+"""
+
+import hashlib
+import json
+import os
+
+MANIFEST_VERSION = 1
+MANIFEST_FILENAME = "HybridCommander-PythonPresets.json"
+
+
+def fingerprint(preset_name, commands):
+    """Stable content hash of a preset's name and resolved command list"""
+    payload = json.dumps([preset_name, list(commands)], separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class PresetManifest:
+    """Keybind key -> {slot, name, fingerprint} for Python-generated presets
+
+    slot_history remembers the last slot of every key ever written, so a
+    keybind that is removed and later re-added can get its old slot back.
+    batch_files lists the `bat` files written for long presets, so files no
+    preset uses any more can be deleted.
+    """
+
+    def __init__(self, path, presets=None, slot_history=None, batch_files=None):
+        self.path = path
+        self.presets = presets or {}
+        self.slot_history = slot_history or {}
+        self.batch_files = batch_files or []
+        self._saved = self.snapshot()
+
+    @classmethod
+    def load(cls, path):
+        """Load the manifest, or return an empty one if it is missing or unreadable"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(path)
+        if data.get("version") != MANIFEST_VERSION:
+            return cls(path)
+        return cls(path, data.get("presets", {}), data.get("slot_history", {}), data.get("batch_files", []))
+
+    @property
+    def is_new(self):
+        return not os.path.exists(self.path)
+
+    def snapshot(self):
+        return json.dumps([self.presets, self.slot_history, self.batch_files], sort_keys=True)
+
+    @property
+    def dirty(self):
+        return self.snapshot() != self._saved
+
+    def get(self, key):
+        return self.presets.get(key)
+
+    def record(self, key, slot, name, digest):
+        self.presets[key] = {"slot": slot, "name": name, "fingerprint": digest}
+        self.slot_history[key] = slot
+
+    def remove(self, key):
+        return self.presets.pop(key, None)
+
+    def save(self):
+        """Write the manifest if it changed since it was loaded or last saved"""
+        if not self.dirty and not self.is_new:
+            return False
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "version": MANIFEST_VERSION,
+                "presets": self.presets,
+                "slot_history": self.slot_history,
+                "batch_files": self.batch_files,
+            }, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
+        self._saved = self.snapshot()
+        return True
@@ -0,0 +1,157 @@
+"""
+Command Optimizer
+=================
+Peephole pass over a preset's resolved console commands, run before
+presets are grouped and given slots:
+
+- a `setav` overwritten by a later `setav` of the same actor value is
+  dropped
+- adjacent `modav`s of the same actor value become one (and vanish if
+  they cancel out)
+- `additem`s of the same form ID merge into the first one, summing the
+  amounts
+
+Commands are parsed into a small IR (reference, verb, arguments). Order is
+kept: anything else that touches the same actor value or item in between
+blocks the rewrite, and commands the optimizer knows nothing about block
+every rewrite across them.
+"""
+
+import math
+
+MAX_ITEM_COUNT = 2 ** 31 - 1  # additem counts are signed 32-bit in the game
+
+SET_VERBS = ("setav", "setactorvalue")
+MOD_VERBS = ("modav", "modactorvalue")
+ACTOR_VALUE_VERBS = SET_VERBS + MOD_VERBS + (
+    "forceav", "forceactorvalue", "getav", "getactorvalue", "restoreav", "damageav")
+ITEM_VERBS = ("additem", "removeitem", "equipitem", "unequipitem", "drop")
+
+# Verbs that neither read nor change actor values or inventories
+TRANSPARENT_VERBS = frozenset((
+    "tgm", "tcl", "tim", "tai", "tcai", "tdetect", "tg", "tfc", "tm", "tfow", "tll",
+    "fw", "sw", "set", "setgs", "unlock", "lock", "placeatme", "coc", "cow", "moveto",
+    "completequest", "startquest", "stopquest", "setstage", "caqs",
+))
+
+BARRIER = "barrier"
+
+
+class ConsoleCommand:
+    """One console command split into reference, verb and arguments"""
+
+    __slots__ = ("text", "head", "ref", "verb", "args", "changed")
+
+    def __init__(self, text):
+        self.text = text
+        tokens = text.split()
+        self.head = tokens[0] if tokens else ""
+        ref, _, verb = self.head.rpartition(".")
+        self.ref = ref.lower()
+        self.verb = verb.lower()
+        self.args = tokens[1:]
+        self.changed = False
+
+    def set_amount(self, value):
+        self.args[1] = format_number(value)
+        self.changed = True
+
+    def render(self):
+        """Command text; untouched commands keep their original spelling"""
+        return " ".join([self.head] + self.args) if self.changed else self.text
+
+    def target(self):
+        """(kind, ref, name) this command reads or writes, None if it touches none, or BARRIER"""
+        if self.verb in ACTOR_VALUE_VERBS and self.args:
+            return ("av", self.ref, self.args[0].lower())
+        if self.verb in ITEM_VERBS and self.args:
+            return ("item", self.ref, self.args[0].lower().lstrip("0") or "0")
+        if self.verb in TRANSPARENT_VERBS:
+            return None
+        return BARRIER
+
+
+def parse_number(text):
+    """int or finite float for a numeric argument, None otherwise (inf and nan are never folded)"""
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        value = float(text)
+    except ValueError:
+        return None
+    return value if math.isfinite(value) else None
+
+
+def format_number(value):
+    if isinstance(value, float):
+        return f"{value:.6f}".rstrip("0").rstrip(".")
+    return str(value)
+
+
+def drop_overwritten_setavs(commands):
+    """Remove setavs whose value a later setav replaces before anything else touches it"""
+    overwritten = set()  # Targets a later setav sets, scanning backwards
+    kept = []
+    for command in reversed(commands):
+        target = command.target()
+        if command.verb in SET_VERBS and target is not BARRIER:
+            if target in overwritten:
+                continue
+            overwritten.add(target)
+        elif target is BARRIER:
+            overwritten.clear()
+        elif target is not None:
+            overwritten.discard(target)
+        kept.append(command)
+    kept.reverse()
+    return kept
+
+
+def sum_adjacent_modavs(commands):
+    """Fold consecutive modavs of one actor value into a single modav"""
+    kept = []
+    for command in commands:
+        previous = kept[-1] if kept else None
+        if (command.verb in MOD_VERBS and previous is not None and previous.verb in MOD_VERBS
+                and len(command.args) == 2 and len(previous.args) == 2
+                and previous.target() == command.target()):
+            first, second = parse_number(previous.args[1]), parse_number(command.args[1])
+            if first is not None and second is not None and math.isfinite(first + second):
+                previous.set_amount(first + second)
+                if first + second == 0:
+                    kept.pop()  # The two cancel out
+                continue
+        kept.append(command)
+    return kept
+
+
+def merge_additems(commands):
+    """Add later additems of a form ID to the first one, unless something touches that item in between"""
+    kept = []
+    open_items = {}  # target -> earlier additem still safe to merge into
+    for command in commands:
+        target = command.target()
+        if command.verb == "additem" and target is not BARRIER and len(command.args) >= 2:
+            first = open_items.get(target)
+            if first is not None and first.args[2:] == command.args[2:]:
+                counts = parse_number(first.args[1]), parse_number(command.args[1])
+                # Counts are whole numbers; a sum the game cannot hold leaves both commands as written
+                if all(isinstance(count, int) for count in counts) and abs(sum(counts)) <= MAX_ITEM_COUNT:
+                    first.set_amount(sum(counts))
+                    continue
+            open_items[target] = command
+        elif target is BARRIER:
+            open_items.clear()
+        elif target is not None:
+            open_items.pop(target, None)
+        kept.append(command)
+    return kept
+
+
+def optimize_commands(commands):
+    """Optimized copy of a resolved command list; returns (commands, number eliminated)"""
+    parsed = [ConsoleCommand(text) for text in commands]
+    optimized = merge_additems(sum_adjacent_modavs(drop_overwritten_setavs(parsed)))
+    return [command.render() for command in optimized], len(commands) - len(optimized)
@@ -0,0 +1,92 @@
+"""
+Compiled Preset Plans
+=====================
+A plan is the output of resolving config.yaml: every preset's name,
+console commands, keybinds and slot, plus hashes of the source files it
+was built from and the config.yaml settings that still matter when it is
+applied (batch files, backups). Plans are compact JSON so they can be
+applied on machines without PyYAML and without running the command
+resolver.
+"""
+
+import hashlib
+import json
+import os
+
+from generator.config_io import write_if_changed
+from generator.dedupe import PresetGroup
+
+PLAN_FORMAT = "skyrim-preset-plan"
+PLAN_VERSION = 1
+# config.yaml sections copied into a plan; optimize is informational, its commands are already optimized
+PLAN_SETTINGS = ("batch_files", "backups", "optimize")
+
+
+def source_hashes(paths):
+    """SHA-256 of each existing source file, keyed by file name"""
+    hashes = {}
+    for path in paths:
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                hashes[os.path.basename(path)] = hashlib.sha256(f.read()).hexdigest()
+    return hashes
+
+
+def build_plan(groups, slots, layout, sources, settings=None):
+    """Assemble a plan document from preset groups and their assigned slots"""
+    return {
+        "format": PLAN_FORMAT,
+        "version": PLAN_VERSION,
+        "sources": sources,
+        "settings": {name: value for name, value in (settings or {}).items() if name in PLAN_SETTINGS},
+        "layout": {
+            "preset_slots": layout.preset_slots,
+            "commands_per_preset": layout.commands_per_preset,
+            "power_slots": layout.power_slots,
+            "hotkey_slots": layout.hotkey_slots,
+        },
+        "presets": [
+            {"slot": slot, "name": group.name, "keys": group.keys, "commands": group.commands}
+            for group, slot in zip(groups, slots)
+        ],
+    }
+
+
+def write_plan(path, plan):
+    """Write a plan as compact JSON; returns True if the file changed"""
+    text = json.dumps(plan, separators=(',', ':'), ensure_ascii=False)
+    return write_if_changed(path, text + "\n")
+
+
+def read_plan(path):
+    """Load and validate a plan file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        plan = json.load(f)
+    if not isinstance(plan, dict) or plan.get("format") != PLAN_FORMAT:
+        raise ValueError(f"{path} is not a preset plan")
+    if plan.get("version") != PLAN_VERSION:
+        raise ValueError(f"Unsupported plan version {plan.get('version')} (expected {PLAN_VERSION})")
+    return plan
+
+
+def plan_groups(plan):
+    """Rebuild preset groups and {key: slot} preferences from a plan"""
+    groups = []
+    preferred_slots = {}
+    for preset in plan.get("presets", []):
+        keys = preset["keys"]
+        group = PresetGroup(keys[0], preset["name"], preset["commands"], None)
+        group.keys = list(keys)
+        groups.append(group)
+        if preset.get("slot") is not None:
+            for key in keys:
+                preferred_slots[key] = preset["slot"]
+    return groups, preferred_slots
+
+
+def plan_slots(path):
+    """{key: slot} from an existing plan file, used to keep slots stable across compiles"""
+    try:
+        return plan_groups(read_plan(path))[1]
+    except (OSError, ValueError, KeyError):
+        return {}
@@ -0,0 +1,123 @@
+"""
+Multi-Profile Generation
+========================
+Generates presets for many game installs (MO2 instances, test rigs,
+per-player copies) in one run. Targets are listed in a profiles manifest,
+each with an optional config.yaml overlay, and are processed in a process
+pool that shares one parsed copy of commands.yaml and ids.yaml.
+
+Example profiles.yaml:
+
+    profiles:
+      - name: main
+        data_path: "D:/MO2/instances/main/overwrite"
+      - name: test-rig
+        data_path: "E:/Skyrim Test/Data"
+        overlay: "profiles/test-rig.yaml"   # merged over config.yaml
+"""
+
+import contextlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from generator.config_cache import ConfigCache
+from generator.fragments import ConfigTree
+from generator.index import flatten_tree
+
+# Parsed tables shared by every profile, installed once per worker process
+_shared = {}
+
+
+def deep_merge(base, overlay):
+    """Recursively merge overlay into a copy of base; a None value deletes the key"""
+    if not isinstance(base, dict) or not isinstance(overlay, dict):
+        return overlay
+    merged = dict(base)
+    for key, value in overlay.items():
+        if value is None:
+            merged.pop(key, None)
+        elif isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def load_profiles(manifest_path, config_cache=None):
+    """Read the profiles manifest, resolving overlay paths relative to it"""
+    config_cache = config_cache or ConfigCache()
+    data, _ = config_cache.load_many({'profiles': (manifest_path, None)})['profiles']
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+
+    profiles = []
+    for i, entry in enumerate(data.get('profiles') or []):
+        if not isinstance(entry, dict) or not entry.get('data_path'):
+            raise ValueError(f"Profile #{i} in {manifest_path} needs a data_path")
+        profile = dict(entry)
+        profile.setdefault('name', f"profile{i}")
+        overlay = profile.get('overlay')
+        if overlay:
+            overlay_path = os.path.join(base_dir, overlay)
+            profile['overlay_data'], _ = config_cache.load_many({'overlay': (overlay_path, None)})['overlay']
+        profiles.append(profile)
+    return profiles
+
+
+def _init_worker(shared):
+    _shared.clear()
+    _shared.update(shared)
+
+
+def generate_profile(profile):
+    """Run the generator against one target; returns a summary dict (worker entry point)"""
+    from skyrim_preset_generator import SkyrimPresetGenerator
+
+    summary = {"name": profile['name'], "data_path": profile['data_path'], "success": False,
+               "presets": 0, "saved": False, "changes": {}, "error": None, "log": ""}
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            generator = SkyrimPresetGenerator(compact_json=profile.get('compact', _shared.get('compact', False)),
+                                              skyrim_data_path=profile['data_path'])
+            keybinds_data = deep_merge(_shared['config'], profile.get('overlay_data') or {})
+            generator.use_config_data(_shared['commands'], keybinds_data, _shared['ids'],
+                                      _shared['flat_commands'], _shared['flat_ids'])
+            summary["success"] = (generator.check_hybrid_commander() and
+                                  generator.load_hybrid_commander_data() and
+                                  generator.apply_presets())
+            summary["presets"] = generator.last_active_presets
+            summary["saved"] = generator.last_saved
+            summary["changes"] = generator.last_changes
+    except Exception as e:
+        summary["error"] = str(e)
+    summary["log"] = output.getvalue()
+    return summary
+
+
+def run_profiles(manifest_path, jobs=None, compact=False):
+    """Generate presets for every profile in parallel; returns the list of summaries"""
+    config_cache = ConfigCache()
+    files = {
+        'commands': ('commands.yaml', flatten_tree),
+        'config': ('config.yaml', None),
+    }
+    if os.path.exists('ids.yaml'):
+        files['ids'] = ('ids.yaml', flatten_tree)
+    loaded = config_cache.load_many(files)
+    profiles = load_profiles(manifest_path, config_cache)
+    if not profiles:
+        return []
+
+    commands_data, flat_commands = loaded['commands']
+    ids_data, flat_ids = loaded.get('ids', ({}, {}))
+    shared = {
+        "commands": commands_data, "flat_commands": flat_commands,
+        "ids": ids_data, "flat_ids": flat_ids,
+        "config": ConfigTree(config_cache).load('config.yaml', loaded['config'][0]), "compact": compact,
+    }
+
+    workers = min(jobs or os.cpu_count() or 1, len(profiles))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared,)) as executor:
+        return list(executor.map(generate_profile, profiles))
+
@@ -0,0 +1,106 @@
+"""
+Preset Slot Allocation
+======================
+Slot layout of the installed HybridCommander build and an allocator that
+hands out the lowest free preset slot in O(log n), preferring the slot a
+keybind held before so reconfiguring moves as few presets as possible.
+"""
+
+import heapq
+
+
+class SlotLayout:
+    """Table sizes of a HybridCommander build (forks may use larger tables)"""
+
+    def __init__(self, preset_slots=50, commands_per_preset=10, power_slots=10, hotkey_slots=10):
+        self.preset_slots = int(preset_slots)
+        self.commands_per_preset = int(commands_per_preset)
+        self.power_slots = int(power_slots)
+        self.hotkey_slots = int(hotkey_slots)
+
+    @classmethod
+    def from_config(cls, settings):
+        """Build a layout from the optional hybrid_commander section of config.yaml"""
+        settings = settings or {}
+        known = ("preset_slots", "commands_per_preset", "power_slots", "hotkey_slots")
+        return cls(**{name: settings[name] for name in known if name in settings})
+
+    def new_config(self):
+        """Create an empty HybridCommander config structure for this layout"""
+        config = {
+            "string": {},
+            "int": {},
+            "float": {},
+            "stringList": {
+                "PresetName": [""] * self.preset_slots,  # Empty preset slots (intPresetLength)
+                "PowerName": [""] * self.power_slots     # Power slots (intPowerLength)
+            },
+            "intList": {
+                "HotkeyCode": [-1] * self.hotkey_slots,      # Hotkey slots with -1 (unbound)
+                "HotkeyModifier": [0] * self.hotkey_slots,   # Modifier slots
+                "HotkeyPreset": [0] * self.hotkey_slots,     # Preset assignment slots
+                "PowerPreset": [0] * self.power_slots        # Power preset assignments
+            }
+        }
+        # Initialize every preset command list
+        for i in range(self.preset_slots):
+            config["stringList"][str(i)] = [""] * self.commands_per_preset
+        return config
+
+    def fit_config(self, config):
+        """Grow an existing config's preset table to this layout's size; True if it grew"""
+        string_list = config.setdefault("stringList", {})
+        preset_names = string_list.setdefault("PresetName", [])
+        grown = len(preset_names) < self.preset_slots
+        if grown:
+            preset_names.extend([""] * (self.preset_slots - len(preset_names)))
+        for i in range(self.preset_slots):
+            if str(i) not in string_list:
+                string_list[str(i)] = [""] * self.commands_per_preset
+                grown = True
+        return grown
+
+
+class SlotAllocator:
+    """Free-slot pool with O(log n) allocate/release and sticky key -> slot preferences"""
+
+    def __init__(self, preset_names, slot_count=None, sticky=None):
+        self.slot_count = len(preset_names) if slot_count is None else slot_count
+        self.free = {
+            i for i in range(self.slot_count)
+            if i >= len(preset_names) or not preset_names[i] or not preset_names[i].strip()
+        }
+        # Min-heap of free slots (a sorted list already is one); entries claimed since are skipped lazily
+        self._heap = sorted(self.free)
+        self.sticky = dict(sticky or {})
+
+    def preferred(self, key):
+        """The slot a key held before, if it is still free"""
+        slot = self.sticky.get(key)
+        return slot if slot in self.free else None
+
+    def claim(self, slot, key=None):
+        """Mark a specific slot as used"""
+        self.free.discard(slot)
+        if key is not None:
+            self.sticky[key] = slot
+        return slot
+
+    def allocate(self, key=None):
+        """Take the key's previous slot if free, otherwise the lowest free slot"""
+        slot = self.preferred(key) if key is not None else None
+        if slot is None:
+            while self._heap:
+                candidate = heapq.heappop(self._heap)
+                if candidate in self.free:
+                    slot = candidate
+                    break
+        if slot is None:
+            return None
+        return self.claim(slot, key)
+
+    def release(self, slot):
+        """Return a slot to the pool"""
+        if 0 <= slot < self.slot_count and slot not in self.free:
+            self.free.add(slot)
+            heapq.heappush(self._heap, slot)
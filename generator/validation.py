@@ -0,0 +1,190 @@
+"""
+Command Validation
+==================
+Optional check of resolved console commands against the verbs the game
+console accepts, so typos are caught at generation time instead of
+in-game.
+
+The catalog is built only when validation is requested: a set of common
+built-in verbs plus every usage string found in HybridCommander-Command.json
+("additem <item> <count>", "[x]" marks an optional argument). Verbs go into
+a character trie, so an exact lookup is one walk and near misses come from
+a single bounded edit-distance search over the same trie.
+"""
+
+import json
+import os
+import shlex
+
+MAX_SUGGESTION_DISTANCE = 2
+MAX_SUGGESTIONS = 3
+
+# verb -> (minimum, maximum) argument count; None = no upper bound
+BUILTIN_VERBS = {
+    "tgm": (0, 0), "tcl": (0, 0), "tim": (0, 0), "tai": (0, 0), "tcai": (0, 0), "tdetect": (0, 0),
+    "tg": (0, 0), "tfc": (0, 1), "tm": (0, 0), "tmm": (1, 3), "tfow": (0, 0), "tll": (0, 0),
+    "killall": (0, 0), "kill": (0, 1), "resurrect": (0, 1), "unlock": (0, 0), "lock": (0, 1),
+    "advlevel": (0, 0), "advskill": (2, 2), "incpcs": (1, 1), "setlevel": (1, 4),
+    "additem": (2, 3), "removeitem": (2, 2), "removeallitems": (0, 2), "equipitem": (1, 2),
+    "unequipitem": (1, 2), "placeatme": (1, 4),
+    "setav": (2, 2), "modav": (2, 2), "forceav": (2, 2), "getav": (1, 1), "restoreav": (2, 2),
+    "damageav": (2, 2), "setactorvalue": (2, 2), "modactorvalue": (2, 2), "forceactorvalue": (2, 2),
+    "addspell": (1, 1), "removespell": (1, 1), "addperk": (1, 1), "removeperk": (1, 1),
+    "addshout": (1, 1), "teachword": (1, 1), "unlockword": (1, 1),
+    "coc": (1, 1), "cow": (3, 3), "moveto": (1, 1), "setpos": (2, 2), "setangle": (2, 2),
+    "completequest": (1, 1), "startquest": (1, 1), "stopquest": (1, 1), "resetquest": (1, 1),
+    "setstage": (2, 2), "getstage": (1, 1), "completeallobjectives": (1, 1), "caqs": (0, 0),
+    "fw": (1, 1), "sw": (1, 1), "set": (3, 3), "setgs": (2, 2), "setscale": (1, 1),
+    "enable": (0, 0), "disable": (0, 0), "markfordelete": (0, 0), "recycleactor": (0, 1),
+    "showracemenu": (0, 0), "psb": (0, 0), "qqq": (0, 0), "bat": (1, 1), "save": (1, 2),
+    "setessential": (2, 2), "setownership": (0, 1), "setrelationshiprank": (2, 2),
+    "addtofaction": (2, 2), "removefromfaction": (1, 1), "setcrimegold": (1, 2), "paycrimegold": (0, 3),
+}
+
+
+class VerbTrie:
+    """Character trie of console verbs mapping to their (min, max) arity"""
+
+    TERMINAL = ""  # Key marking the end of a verb; holds its arity
+
+    def __init__(self, verbs=None):
+        self.root = {}
+        self.count = 0
+        for verb, arity in (verbs or {}).items():
+            self.add(verb, arity)
+
+    def add(self, verb, arity):
+        node = self.root
+        for char in verb.lower():
+            node = node.setdefault(char, {})
+        if self.TERMINAL not in node:
+            self.count += 1
+            node[self.TERMINAL] = arity
+        else:
+            # Several usages of one verb widen its accepted range
+            low, high = node[self.TERMINAL]
+            node[self.TERMINAL] = (min(low, arity[0]),
+                                   None if high is None or arity[1] is None else max(high, arity[1]))
+
+    def get(self, verb):
+        """Arity of a known verb, or None"""
+        node = self.root
+        for char in verb.lower():
+            node = node.get(char)
+            if node is None:
+                return None
+        return node.get(self.TERMINAL)
+
+    def near(self, word, max_distance=MAX_SUGGESTION_DISTANCE, limit=MAX_SUGGESTIONS):
+        """Known verbs within max_distance edits, closest first
+
+        One edit-distance row per trie node (adjacent transpositions count as
+        one edit, so "tmg" finds "tgm"), pruning any branch whose row minimum
+        already exceeds max_distance.
+        """
+        word = word.lower()
+        matches = []
+        first_row = list(range(len(word) + 1))
+
+        def walk(node, prefix, previous_row, before_previous, previous_char):
+            for char, child in node.items():
+                if char == self.TERMINAL:
+                    continue
+                row = [previous_row[0] + 1]
+                for column in range(1, len(word) + 1):
+                    cost = min(row[column - 1] + 1, previous_row[column] + 1,
+                               previous_row[column - 1] + (word[column - 1] != char))
+                    if (before_previous is not None and column > 1 and word[column - 1] == previous_char
+                            and word[column - 2] == char):
+                        cost = min(cost, before_previous[column - 2] + 1)
+                    row.append(cost)
+                if self.TERMINAL in child and row[-1] <= max_distance:
+                    matches.append((row[-1], prefix + char))
+                if min(row) <= max_distance:
+                    walk(child, prefix + char, row, previous_row, char)
+
+        walk(self.root, "", first_row, None, None)
+        matches.sort()
+        return [verb for _, verb in matches[:limit]]
+
+
+def parse_usage(text):
+    """'player.additem <item> <count> [x]' -> ('additem', (2, 3)), or None"""
+    tokens = text.strip().split()
+    if not tokens or not tokens[0][0].isalpha():
+        return None
+    verb = tokens[0].rsplit(".", 1)[-1]
+    required = sum(1 for token in tokens[1:] if not token.startswith("["))
+    optional = len(tokens) - 1 - required
+    return verb, (required, required + optional)
+
+
+def read_catalog_usages(path):
+    """Every usage string in a HybridCommander-Command.json (StorageUtil string and stringList values)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        document = json.load(f)
+    usages = []
+    for section in ("string", "stringList"):
+        for value in (document.get(section) or {}).values():
+            for text in (value if isinstance(value, list) else [value]):
+                if isinstance(text, str) and text.strip():
+                    usages.append(text)
+    return usages
+
+
+def build_catalog(command_file=None, extra_verbs=None):
+    """Verb trie from the built-in verbs, the HybridCommander catalog and config.yaml extras"""
+    trie = VerbTrie(BUILTIN_VERBS)
+    if command_file and os.path.exists(command_file):
+        for usage in read_catalog_usages(command_file):
+            parsed = parse_usage(usage)
+            if parsed is not None:
+                trie.add(*parsed)
+    for verb, arity in (extra_verbs or {}).items():
+        if isinstance(arity, int):
+            arity = (arity, arity)
+        elif arity is None:
+            arity = (0, None)
+        trie.add(verb, tuple(arity))
+    return trie
+
+
+def split_command(command):
+    """'player.additem 0000000f 100' -> ('additem', ['0000000f', '100'])"""
+    try:
+        tokens = shlex.split(command, posix=True)
+    except ValueError:
+        tokens = command.split()
+    if not tokens:
+        return None, []
+    return tokens[0].rsplit(".", 1)[-1], tokens[1:]
+
+
+def check_command(trie, command):
+    """Problem description for one console command, or None if it looks valid"""
+    verb, args = split_command(command)
+    if verb is None:
+        return None
+    arity = trie.get(verb)
+    if arity is None:
+        suggestions = trie.near(verb)
+        hint = f" - did you mean {', '.join(suggestions)}?" if suggestions else ""
+        return f"unknown console command '{verb}'{hint}"
+    low, high = arity
+    if len(args) < low or (high is not None and len(args) > high):
+        expected = f"{low}" if low == high else f"{low}-{'any' if high is None else high}"
+        return f"'{verb}' takes {expected} argument(s), got {len(args)}"
+    return None
+
+
+def validate_groups(trie, groups):
+    """[(preset name, command, problem)] for every invalid command, each distinct command checked once"""
+    problems = []
+    checked = {}
+    for group in groups:
+        for command in group.commands:
+            if command not in checked:
+                checked[command] = check_command(trie, command)
+            if checked[command] is not None:
+                problems.append((group.name, command, checked[command]))
+    return problems
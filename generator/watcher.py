@@ -0,0 +1,241 @@
+"""
+Config File Watcher
+===================
+Waits for changes to a set of files using inotify on Linux, falling back
+to stat polling elsewhere, and debounces bursts of saves into one event.
+The set of files can change between events (set_paths), so files a new
+include pulls in are watched too.
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+# inotify event masks (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ATTRIB
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def stat_key(path):
+    """(mtime_ns, size) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class PollingWatcher:
+    """Portable watcher that compares file stats on a fixed interval"""
+
+    name = "polling"
+
+    def __init__(self, paths, interval=0.5):
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.interval = interval
+        self.stats = {path: stat_key(path) for path in self.paths}
+        self.lock = threading.Lock()  # The async watcher polls in an executor thread
+
+    def poll(self):
+        changed = set()
+        with self.lock:
+            for path in self.paths:
+                current = stat_key(path)
+                if current != self.stats[path]:
+                    self.stats[path] = current
+                    changed.add(path)
+        return changed
+
+    def set_paths(self, paths):
+        """Watch exactly these files from now on; files already watched keep their last seen stats"""
+        paths = [os.path.abspath(path) for path in paths]
+        with self.lock:
+            self.stats = {path: self.stats[path] if path in self.stats else stat_key(path) for path in paths}
+            self.paths = paths
+
+    def wait(self, timeout=None):
+        """Block until a watched file changes or timeout expires; returns changed paths"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = self.poll()
+            if changed:
+                return changed
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return set()
+                time.sleep(min(self.interval, remaining))
+            else:
+                time.sleep(self.interval)
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux watcher using inotify on the files' parent directories
+
+    Directories are watched (not the files) so editors that save by writing
+    a new file and renaming it over the old one are still seen.
+    """
+
+    name = "inotify"
+
+    def __init__(self, paths):
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.paths = set()
+        self.directories = {}
+        try:
+            self.set_paths(paths)
+        except OSError:
+            self.close()
+            raise
+
+    def set_paths(self, paths):
+        """Watch exactly these files from now on, adding and removing directory watches as needed"""
+        self.paths = {os.path.abspath(path) for path in paths}
+        wanted = {os.path.dirname(path) for path in self.paths}
+        for wd, directory in list(self.directories.items()):
+            if directory not in wanted:
+                self.libc.inotify_rm_watch(self.fd, wd)
+                del self.directories[wd]
+        for directory in wanted - set(self.directories.values()):
+            wd = self.libc.inotify_add_watch(self.fd, directory.encode(sys.getfilesystemencoding()), WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+            self.directories[wd] = directory
+
+    def read_events(self):
+        changed = set()
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(buffer):
+            wd, _mask, _cookie, length = EVENT_HEADER.unpack_from(buffer, offset)
+            offset += EVENT_HEADER.size
+            name = buffer[offset:offset + length].rstrip(b"\0").decode(sys.getfilesystemencoding(), "replace")
+            offset += length
+            path = os.path.join(self.directories.get(wd, ""), name)
+            if path in self.paths:
+                changed.add(path)
+        return changed
+
+    def wait(self, timeout=None):
+        """Block until a watched file changes or timeout expires; returns changed paths"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                return set()
+            changed = self.read_events()
+            if changed:
+                return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def create_watcher(paths, poll_interval=0.5):
+    """inotify on Linux when available, stat polling otherwise"""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(paths, poll_interval)
+
+
+def watch_files(paths, on_change, debounce=0.5, watcher=None, refresh=None):
+    """Call on_change(changed_paths) once per debounced burst of changes, forever
+
+    refresh, if given, returns the files to watch and is called after each
+    on_change, since handling a change can add or drop included files.
+    """
+    watcher = watcher or create_watcher(paths)
+    try:
+        while True:
+            changed = watcher.wait()
+            # Keep absorbing events until the files have been quiet for `debounce` seconds
+            while True:
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                changed |= more
+            on_change(changed)
+            if refresh is not None:
+                watcher.set_paths(refresh())
+    finally:
+        watcher.close()
+
+
+async def watch_files_async(paths, on_change, debounce=0.5, watcher=None, executor=None, refresh=None):
+    """Async watch_files: awaits on_change(changed_paths) once per debounced burst, until cancelled
+
+    inotify descriptors are registered with the event loop, so an idle
+    watch costs no wakeups; polling watchers stat the files in `executor`.
+    """
+    loop = asyncio.get_running_loop()
+    watcher = watcher or create_watcher(paths)
+    queue = asyncio.Queue()
+    poller = None
+
+    def on_readable():
+        changed = watcher.read_events()
+        if changed:
+            queue.put_nowait(changed)
+
+    async def poll_forever():
+        while True:
+            await asyncio.sleep(watcher.interval)
+            changed = await loop.run_in_executor(executor, watcher.poll)
+            if changed:
+                queue.put_nowait(changed)
+
+    if isinstance(watcher, InotifyWatcher):
+        loop.add_reader(watcher.fd, on_readable)
+    else:
+        poller = asyncio.ensure_future(poll_forever())
+
+    try:
+        while True:
+            changed = set(await queue.get())
+            # Keep absorbing events until the files have been quiet for `debounce` seconds
+            while True:
+                try:
+                    changed |= await asyncio.wait_for(queue.get(), debounce)
+                except asyncio.TimeoutError:
+                    break
+            await on_change(changed)
+            if refresh is not None:
+                watcher.set_paths(refresh())
+    finally:
+        if poller is not None:
+            poller.cancel()
+        elif watcher.fd >= 0:
+            loop.remove_reader(watcher.fd)
+        watcher.close()
@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+"""
+Root-level launcher for the Skyrim auto-clicker.
+
+Usage: python run_auto_clicker.py
+"""
+
+from conditions_for_button_clicks.main import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Skyrim Daemon
+=============
+One resident process that hosts preset regeneration, config file watching
+and the auto-clicker as cooperating asyncio tasks.
+
+Everything shares one parsed copy of the configuration: config.yaml is
+loaded once through the generator's config cache and the clicker reads its
+jobs from the `clicker:` section (falling back to
+conditions_for_button_clicks/clicker.yaml). Blocking work - Win32 input,
+JSON/YAML file I/O, preset generation - runs in thread executors so the
+event loop only wakes for file changes and key deadlines.
+
+Usage: python skyrim_daemon.py [--data-path PATH] [--compact] [--debounce SECONDS]
+                               [--no-clicker] [--no-generator] [--quiet | --verbose] [--json]
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from conditions_for_button_clicks import main as clicker
+from conditions_for_button_clicks.scheduler import Scheduler, high_resolution_timer
+from generator.log import configure, log
+from generator.watcher import create_watcher, watch_files_async
+from skyrim_preset_generator import SkyrimPresetGenerator
+
+GENERATOR_FILES = ('config.yaml', 'commands.yaml', 'ids.yaml')
+
+
+class SkyrimDaemon:
+    """Generator, watcher and clicker sharing one event loop and one config copy"""
+
+    def __init__(self, generator, run_generator=True, run_clicker=True, debounce=0.5):
+        self.generator = generator
+        self.run_generator = run_generator
+        self.run_clicker = run_clicker
+        self.debounce = debounce
+        self.generator_ready = False
+        # Generator and config I/O share one worker; key presses get their own so
+        # a long regeneration never delays a scheduled press
+        self.io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="daemon-io")
+        self.input_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="daemon-input")
+        self.lock = asyncio.Lock()
+        self.reschedule = asyncio.Event()
+        self.conditions_changed = asyncio.Event()
+        self.clicker_config = None
+        self.macros = None
+        self.jobs = []
+        self.telemetry = None
+        self.export_path = None
+        self.scheduler = None
+        self.conditions = None
+        self.stats = []  # (key, fires, late, missed) of jobs replaced by a reload
+
+    async def run_blocking(self, func, *args, executor=None):
+        """Run blocking work off the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor or self.io_executor, func, *args)
+
+    def read_clicker_section(self):
+        """The clicker settings from the shared config.yaml copy, else clicker.yaml via the same cache"""
+        section = self.generator.keybinds_data.get('clicker')
+        if section is not None:
+            return section, 'config.yaml'
+        if os.path.exists(clicker.CONFIG_FILE):
+            try:
+                loaded = self.generator.config_cache.load_many({'clicker': (clicker.CONFIG_FILE, None)})
+                return loaded['clicker'][0], os.path.basename(clicker.CONFIG_FILE)
+            except Exception as e:
+                log.warning("⚠️  Could not read %s: %s - using defaults", os.path.basename(clicker.CONFIG_FILE), e)
+        return {}, 'defaults'
+
+    def load_clicker(self):
+        """(Re)build clicker jobs when the parsed clicker settings changed; returns True if they did"""
+        if not self.generator.keybinds_data:
+            self.generator.load_configs()
+        section, source = self.read_clicker_section()
+        if section is self.clicker_config or (self.clicker_config is not None and section == self.clicker_config):
+            return False
+
+        try:
+            macros = clicker.load_macros(section)
+            jobs = clicker.load_jobs(section, macros)
+            telemetry, export_path = clicker.load_telemetry(section)
+            conditions = clicker.load_conditions(section, macros, self.generator.hybrid_config_file, telemetry)
+        except (KeyError, ValueError) as e:
+            log.error("❌ Invalid clicker job in %s: %s", source, e)
+            return False
+
+        if self.telemetry is not None:
+            telemetry.records.extend(self.telemetry.snapshot())  # Keep history across reloads
+            telemetry.total += self.telemetry.total
+        self.stats += [(job.key, job.fires, job.late, job.missed) for job in self.jobs]
+        self.clicker_config = section
+        self.macros, self.jobs = macros, jobs
+        self.telemetry, self.export_path = telemetry, export_path
+        if conditions is not None and self.conditions is not None:
+            conditions.logs.tailers = self.conditions.logs.tailers  # Keep offsets across reloads
+        self.conditions = conditions
+        log.info("⏰ Clicker jobs from %s: %s", source,
+                 ", ".join(f"{job.key} every {job.interval:g}s" for job in jobs))
+        return True
+
+    async def start_generator(self):
+        """Initial full generation"""
+        async with self.lock:
+            self.generator_ready = await self.run_blocking(self.generator.run)
+        if not self.generator_ready:
+            log.warning("⚠️  Preset generation unavailable - the daemon keeps watching config files")
+
+    async def on_change(self, changed):
+        """Regenerate presets and/or reload clicker jobs after a debounced burst of saves"""
+        names = {os.path.basename(path) for path in changed}
+        fragments = set(self.generator.config_tree.fragments)
+        config_changed = bool(names & set(GENERATOR_FILES)) or any(os.path.abspath(path) in fragments for path in changed)
+        async with self.lock:
+            if self.run_generator and config_changed:
+                if self.generator_ready:
+                    await self.run_blocking(self.generator.regenerate, changed)
+                else:
+                    self.generator_ready = await self.run_blocking(self.generator.run)
+            elif config_changed:
+                await self.run_blocking(self.generator.load_configs)
+
+            if self.run_clicker and await self.run_blocking(self.load_clicker):
+                self.install_export_handler()
+                self.reschedule.set()
+                self.conditions_changed.set()
+
+    def install_export_handler(self):
+        """Point the export signal at the current telemetry (reloads replace it); needs the main thread"""
+        if self.telemetry is None:
+            return None
+        return clicker.install_export_handler(
+            self.telemetry, self.export_path,
+            lambda path: log.info("📈 Telemetry exported to %s", path),
+            lambda path, error: log.error("❌ Could not export telemetry to %s: %s", path, error))
+
+    def watched_paths(self):
+        """Every config file the daemon reads, including the fragments of the last config load"""
+        paths = [path for path in GENERATOR_FILES if os.path.exists(path)]
+        paths += [os.path.relpath(path) for path in self.generator.config_tree.fragments]
+        if self.run_clicker and os.path.exists(clicker.CONFIG_FILE):
+            paths.append(clicker.CONFIG_FILE)
+        return paths
+
+    async def watch_task(self):
+        """Watch every config file the daemon reads, following includes as they are added or removed"""
+        paths = self.watched_paths()
+        if not paths:
+            return
+        watcher = create_watcher(paths)
+        log.info("👀 Watching %s (%s)", ", ".join(os.path.basename(path) for path in paths), watcher.name)
+        await watch_files_async(paths, self.on_change, self.debounce, watcher, self.io_executor,
+                                refresh=self.watched_paths)
+
+    async def clicker_task(self):
+        """Sleep until the next key deadline, press on the input thread, repeat"""
+        loop = asyncio.get_running_loop()
+        while True:
+            self.reschedule.clear()
+            self.scheduler = Scheduler(
+                self.jobs, lambda job: clicker.run_action(job.key, self.macros),
+                on_fire=lambda report: clicker.report_fire(report, self.telemetry))
+            self.scheduler.start()
+            scheduler = self.scheduler
+
+            while not self.reschedule.is_set():
+                deadline = scheduler.next_deadline()
+                if deadline is None:
+                    await self.reschedule.wait()
+                    break
+                remaining = deadline - scheduler.clock()
+                if remaining > 0:
+                    try:
+                        await asyncio.wait_for(self.reschedule.wait(), remaining)
+                        break  # Jobs changed; rebuild the schedule
+                    except asyncio.TimeoutError:
+                        pass
+                await loop.run_in_executor(self.input_executor, scheduler.fire_due)
+
+    async def conditions_task(self):
+        """Poll logs and timers for condition rules; matched rules press on the input thread"""
+        while True:
+            conditions = self.conditions
+            if conditions is None:
+                self.conditions_changed.clear()
+                await self.conditions_changed.wait()
+                continue
+            interval = float((self.clicker_config.get('conditions') or {}).get(
+                'poll_interval', clicker.DEFAULT_POLL_INTERVAL))
+            await self.run_blocking(conditions.poll, executor=self.input_executor)
+            await asyncio.sleep(interval)
+
+    async def serve(self):
+        """Run all tasks until cancelled or interrupted"""
+        if self.run_clicker:
+            await self.run_blocking(self.load_clicker)
+            signum = self.install_export_handler()
+            if signum is not None:
+                log.info("📈 Send %s to export telemetry while running", signal.Signals(signum).name)
+            selector = clicker.get_selector()
+            available = [backend.name for backend in selector.backends if backend.available()]
+            log.info("🔧 Input backends: %s", ", ".join(available) or "none available")
+        if self.run_generator:
+            await self.start_generator()
+
+        tasks = [asyncio.ensure_future(self.watch_task())]
+        if self.run_clicker:
+            tasks.append(asyncio.ensure_future(self.clicker_task()))
+            tasks.append(asyncio.ensure_future(self.conditions_task()))
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows: Ctrl+C arrives as KeyboardInterrupt instead
+
+        log.info("🚀 Daemon running - press Ctrl+C to stop")
+        stopper = asyncio.ensure_future(stop.wait())
+        try:
+            done, _ = await asyncio.wait(tasks + [stopper], return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task is not stopper and task.exception() is not None:
+                    log.error("❌ Daemon task failed: %s", task.exception())
+        finally:
+            for task in tasks + [stopper]:
+                task.cancel()
+            await asyncio.gather(*tasks, stopper, return_exceptions=True)
+
+    def shutdown(self):
+        """Close backends, print clicker stats and export telemetry"""
+        self.input_executor.shutdown(wait=True)
+        self.io_executor.shutdown(wait=True)
+        if not self.run_clicker:
+            return
+        clicker.get_selector().close()
+
+        totals = {}
+        for key, fires, late, missed in self.stats + [(job.key, job.fires, job.late, job.missed) for job in self.jobs]:
+            previous = totals.get(key, (0, 0, 0))
+            totals[key] = (previous[0] + fires, previous[1] + late, previous[2] + missed)
+        for key, (fires, late, missed) in totals.items():
+            log.info("📊 %s: %d presses, %d late, %d missed", key, fires, late, missed,
+                     extra={"fields": {"key": key, "fires": fires, "late": late, "missed": missed}})
+        if self.telemetry is None:
+            return
+        for line in clicker.format_summary(self.telemetry.summary()):
+            log.info("📈 %s", line)
+        if self.export_path and self.telemetry.records:
+            try:
+                self.telemetry.export(self.export_path)
+                log.info("📈 Telemetry exported to %s", self.export_path)
+            except OSError as e:
+                log.error("❌ Could not export telemetry: %s", e)
+
+
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description="Run the preset generator, config watcher and auto-clicker in one process")
+    parser.add_argument("--data-path", metavar="PATH",
+                        help="Skyrim Data directory (default: the Steam install location)")
+    parser.add_argument("--compact", action="store_true",
+                        help="write HybridCommander-Config.json without indentation")
+    parser.add_argument("--debounce", type=float, default=0.5, metavar="SECONDS",
+                        help="quiet period before a burst of saves is handled (default: 0.5)")
+    parser.add_argument("--no-clicker", action="store_true", help="do not press any keys")
+    parser.add_argument("--no-generator", action="store_true", help="do not write HybridCommander presets")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--quiet", action="store_true", help="only print warnings and errors")
+    output.add_argument("--verbose", action="store_true", help="also print every preset's commands")
+    parser.add_argument("--json", action="store_true", help="print one JSON object per log line")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Entry point"""
+    args = parse_args(argv)
+    configure(quiet=args.quiet, verbose=args.verbose, json_output=args.json)
+
+    # Relative paths on the command line mean the caller's directory, not the script's
+    data_path = os.path.abspath(args.data_path) if args.data_path else None
+
+    # Ensure we're in the right directory
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(script_dir)
+
+    log.info("🐉 SKYRIM DAEMON")
+    log.info("=" * 45)
+    generator = SkyrimPresetGenerator(compact_json=args.compact, skyrim_data_path=data_path)
+
+    async def run():
+        daemon = SkyrimDaemon(generator, run_generator=not args.no_generator,
+                              run_clicker=not args.no_clicker, debounce=args.debounce)
+        try:
+            with high_resolution_timer():
+                await daemon.serve()
+        finally:
+            daemon.shutdown()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    log.info("🛑 Daemon stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
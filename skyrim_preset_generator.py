@@ -6,386 +6,766 @@ Complete application for generating HybridCommander presets from YAML configurat
 Reads config.yaml and creates JSON presets that HybridCommander can use for 
 background console command execution via powers/hotkeys.
 
-Usage: python skyrim_preset_generator.py
+Usage: python skyrim_preset_generator.py [--compact] [--watch] [--data-path PATH]
+       python skyrim_preset_generator.py --profiles profiles.yaml [--jobs N]
+       python skyrim_preset_generator.py --compile plan.json | --apply plan.json
 """
 
-import yaml
-import json
+import logging
 import os
-import shutil
 import sys
-from pathlib import Path
+
+from generator.backups import BackupStore
+from generator.batch import BatchFiles
+from generator.cli import (parse_args, run_form_import, run_form_search, run_list_backups, run_profile_batch,
+                           run_rollback)
+from generator.commands import CommandRegistry
+from generator.config_cache import ConfigCache
+from generator.config_io import file_matches, read_config_document, serialize_config, write_if_changed
+from generator.dedupe import group_identical
+from generator.fragments import ConfigTree
+from generator.formdb import DEFAULT_FORM_DB, open_form_database
+from generator.index import LookupIndex, flatten_tree
+from generator.log import Joined, Profiler, configure, log
+from generator.loadorder import LoadOrder, default_plugin_files, remap_references
+from generator.manifest import MANIFEST_FILENAME, PresetManifest, fingerprint
+from generator.optimizer import optimize_commands
+from generator.plan import build_plan, plan_groups, plan_slots, read_plan, source_hashes, write_plan
+from generator.slots import SlotAllocator, SlotLayout
+from generator.validation import build_catalog, validate_groups
+from generator.watcher import create_watcher, stat_key, watch_files
+
+DEFAULT_SKYRIM_DATA_PATH = r"C:\Program Files (x86)\Steam\steamapps\common\Skyrim Special Edition\Data"
 
 class SkyrimPresetGenerator:
-    def __init__(self):
+    def __init__(self, compact_json=False, skyrim_data_path=None, profiler=None, validate=False, form_db_path=None):
+        self.profiler = profiler or Profiler()  # Per-phase timings for --profile
+        self.validate = validate
+        self.form_db_path = form_db_path  # --form-db; overrides config.yaml form_database
+        self.command_catalog = None  # Console verb trie, built on the first validated run
+        self.command_catalog_key = None
         self.commands_data = {}
         self.keybinds_data = {}
         self.ids_data = {}
+        self.index = LookupIndex()
+        self.registry = CommandRegistry(self.index)
+        self.form_db = None
+        self.form_db_key = None
+        self.load_order = None
+        self.load_order_key = None
+        self.config_cache = ConfigCache()
+        self.config_tree = ConfigTree(self.config_cache)  # config.yaml plus its include: fragments
         
         # HybridCommander paths
-        self.skyrim_data_path = r"C:\Program Files (x86)\Steam\steamapps\common\Skyrim Special Edition\Data"
+        self.skyrim_data_path = skyrim_data_path or DEFAULT_SKYRIM_DATA_PATH
+        self.game_path = os.path.dirname(os.path.normpath(self.skyrim_data_path))  # Where `bat` files live
         self.hybrid_config_path = os.path.join(self.skyrim_data_path, "SKSE", "Plugins", "StorageUtilData")
         self.hybrid_command_file = os.path.join(self.hybrid_config_path, "HybridCommander-Command.json")
         self.hybrid_config_file = os.path.join(self.hybrid_config_path, "HybridCommander-Config.json")
+        self.preset_manifest_file = os.path.join(self.hybrid_config_path, MANIFEST_FILENAME)
+        self.preset_manifest = None
+        self.last_changes = {}
+        self.last_active_presets = 0
+        self.last_saved = False
+        self.config_changed = False
+        self.hybrid_config_raw = {}  # Unmanaged top-level keys, kept as raw JSON text
+        self.compact_json = compact_json
+        self.slot_layout = SlotLayout()
+        self.slot_allocator = None
+        self.batch_files = None
+        self.hybrid_config = None
+        self.hybrid_config_stat = None  # (mtime_ns, size) when last read or written
         
     def load_configs(self):
-        """Load all YAML configuration files"""
+        """Load all YAML configuration files (served from the parsed-config cache when unchanged)"""
         try:
-            # Load commands reference
-            with open('commands.yaml', 'r', encoding='utf-8') as f:
-                self.commands_data = yaml.safe_load(f)
-                
-            # Load preset configurations  
-            with open('config.yaml', 'r', encoding='utf-8') as f:
-                self.keybinds_data = yaml.safe_load(f)
-                
+            files = {
+                'commands': ('commands.yaml', flatten_tree),  # Commands reference
+                'config': ('config.yaml', None),              # Preset configurations
+            }
             # Load item IDs if exists
             if os.path.exists('ids.yaml'):
-                with open('ids.yaml', 'r', encoding='utf-8') as f:
-                    self.ids_data = yaml.safe_load(f)
-                    
-            print("✅ Loaded configuration files")
+                files['ids'] = ('ids.yaml', flatten_tree)
+            
+            with self.profiler.phase("load"):
+                loaded = self.config_cache.load_many(files)
+                keybinds_data = self.config_tree.load('config.yaml', loaded['config'][0])
+            commands_data, flat_commands = loaded['commands']
+            ids_data, flat_ids = loaded.get('ids', ({}, {}))
+            
+            if self.use_config_data(commands_data, keybinds_data, ids_data, flat_commands, flat_ids):
+                log.info("✅ Loaded configuration files (lookup tables unchanged)")
+            else:
+                log.info("✅ Loaded configuration files (%d cached, %d parsed)", self.config_cache.hits, self.config_cache.misses)
             return True
             
         except Exception as e:
-            print(f"❌ Error loading configs: {e}")
+            log.error("❌ Error loading configs: %s", e)
             return False
     
+    def use_config_data(self, commands_data, keybinds_data, ids_data, flat_commands=None, flat_ids=None):
+        """Install parsed config tables; returns True if the existing index/registry were kept"""
+        previous = (self.commands_data, self.ids_data, self.keybinds_data.get('function_definitions'), self.form_db_key,
+                    self.load_order_key)
+        self.commands_data = commands_data or {}
+        self.keybinds_data = keybinds_data or {}
+        self.ids_data = ids_data or {}
+        definitions = self.keybinds_data.get('function_definitions')
+        
+        # Optional SQLite form-ID index for human item names (rebuilding it invalidates memoized commands)
+        form_db_path = self.form_db_path or self.keybinds_data.get('form_database', DEFAULT_FORM_DB)
+        self.form_db_key = (form_db_path, stat_key(form_db_path))
+        
+        # plugins.txt / loadorder.txt; a changed load order re-resolves every plugin reference
+        plugin_files = default_plugin_files(self.keybinds_data.get('load_order'))
+        self.load_order_key = tuple((path, stat_key(path)) for path in plugin_files)
+        
+        # Slot counts of the target HybridCommander build
+        self.slot_layout = SlotLayout.from_config(self.keybinds_data.get('hybrid_commander'))
+        
+        # Unchanged tables come back as the same objects; keep the index and its memoized registry
+        if (previous[0] is self.commands_data and previous[1] is self.ids_data and previous[2] == definitions
+                and previous[3] == self.form_db_key and previous[4] == self.load_order_key):
+            return True
+        
+        with self.profiler.phase("index"):
+            # Both trees are compiled into flat dotted-path lookups (the cache hands them over pre-flattened)
+            flat_ids = flat_ids if flat_ids is not None else flatten_tree(self.ids_data)
+            self.load_order = self.read_load_order(plugin_files)
+            if self.load_order is not None:
+                flat_ids, unresolved = remap_references(flat_ids, self.load_order)
+                for path, reference in unresolved.items():
+                    log.warning("⚠️ %s: plugin of %s is not in the load order", path, reference)
+            self.index = LookupIndex(
+                flat_commands if flat_commands is not None else flatten_tree(self.commands_data),
+                flat_ids,
+            )
+            
+            # Build the command registry, letting config.yaml extend or override templates
+            if self.form_db is not None:
+                self.form_db.close()
+            self.form_db = open_form_database(form_db_path)
+            self.registry = CommandRegistry(self.index, form_db=self.form_db, load_order=self.load_order)
+            self.registry.load_definitions(definitions)
+        return False
+    
+    def read_load_order(self, plugin_files):
+        """Parse the active load order, or None when no plugins.txt/loadorder.txt exists"""
+        plugins_txt, loadorder_txt = plugin_files
+        if not os.path.exists(plugins_txt) and not os.path.exists(loadorder_txt):
+            return None
+        try:
+            load_order = LoadOrder.from_files(plugins_txt, loadorder_txt, self.skyrim_data_path)
+            log.info("✅ Load order: %d active plugins", len(load_order.plugins))
+            return load_order
+        except (OSError, ValueError) as e:
+            log.warning("⚠️ Could not read load order: %s", e)
+            return None
+    
     def check_hybrid_commander(self):
         """Check if HybridCommander is installed and accessible"""
         if not os.path.exists(self.hybrid_command_file):
-            print(f"❌ HybridCommander not found at: {self.hybrid_command_file}")
-            print("📋 Make sure HybridCommander mod is installed and enabled in Vortex")
-            print("\n🎯 HybridCommander Integration Benefits:")
-            print("   • Execute console commands in background (no console opening)")
-            print("   • Bind commands to in-game powers")
-            print("   • More reliable than keyboard automation")
-            print("   • Commands work even if game loses focus")
+            log.error("❌ HybridCommander not found at: %s", self.hybrid_command_file)
+            log.error("📋 Make sure HybridCommander mod is installed and enabled in Vortex")
+            log.info("\n🎯 HybridCommander Integration Benefits:\n"
+                     "   • Execute console commands in background (no console opening)\n"
+                     "   • Bind commands to in-game powers\n"
+                     "   • More reliable than keyboard automation\n"
+                     "   • Commands work even if game loses focus")
             return False
             
-        print("✅ HybridCommander detected!")
+        log.info("✅ HybridCommander detected!")
         return True
     
     def load_hybrid_commander_data(self):
         """Load existing HybridCommander configuration"""
         try:
-            # Load command definitions
-            with open(self.hybrid_command_file, 'r', encoding='utf-8') as f:
-                self.hybrid_data = json.load(f)
-                
             # Load or create config file with proper HybridCommander structure
             if os.path.exists(self.hybrid_config_file):
-                with open(self.hybrid_config_file, 'r', encoding='utf-8') as f:
-                    self.hybrid_config = json.load(f)
-                print("✅ Loaded existing HybridCommander configuration")
+                self.hybrid_config, self.hybrid_config_raw = read_config_document(self.hybrid_config_file)
+                self.hybrid_config_stat = stat_key(self.hybrid_config_file)
+                self.config_changed = self.slot_layout.fit_config(self.hybrid_config)
+                log.info("✅ Loaded existing HybridCommander configuration")
             else:
                 # Create proper HybridCommander structure based on source code analysis
-                self.hybrid_config = {
-                    "string": {},
-                    "int": {},
-                    "float": {},
-                    "stringList": {
-                        "PresetName": [""] * 50,  # 50 empty preset slots (intPresetLength)
-                        "PowerName": [""] * 10    # 10 power slots (intPowerLength)
-                    },
-                    "intList": {
-                        "HotkeyCode": [-1] * 10,      # 10 hotkey slots with -1 (unbound)
-                        "HotkeyModifier": [0] * 10,   # 10 modifier slots
-                        "HotkeyPreset": [0] * 10,     # 10 preset assignment slots
-                        "PowerPreset": [0] * 10       # 10 power preset assignments
-                    }
-                }
-                
-                # Initialize all 50 preset command lists (each with 10 command slots)
-                for i in range(50):
-                    self.hybrid_config["stringList"][str(i)] = [""] * 10
+                self.hybrid_config = self.slot_layout.new_config()
                 
-                print("✅ Created new HybridCommander configuration structure")
+                log.info("✅ Created new HybridCommander configuration structure")
                 
             return True
             
         except Exception as e:
-            print(f"❌ Error loading HybridCommander data: {e}")
+            log.error("❌ Error loading HybridCommander data: %s", e)
             return False
     
     def resolve_command(self, function_name, args):
         """Convert function calls to actual console commands"""
-        if function_name == "give_item":
-            item_id, amount = args
-            if item_id == "currency.gold":
-                return f"player.additem 0000000f {amount}"
-            else:
-                # Look up item ID from ids.yaml or use directly
-                actual_id = self.get_item_id(item_id)
-                return f"player.additem {actual_id} {amount}"
-                
-        elif function_name == "execute_command":
-            command_path = args[0]
-            # Check if it's a direct console command (contains spaces or periods)
-            if " " in command_path or "." in command_path:
-                return command_path  # Return direct console command as-is
-            else:
-                return self.get_command_by_path(command_path)  # Look up in commands.yaml
-            
-        elif function_name == "set_player_stat":
-            stat_name, value = args
-            return f"player.setav {stat_name} {value}"
-            
-        elif function_name == "modify_player_stat":
-            stat_name, value = args
-            return f"player.modav {stat_name} {value}"
-            
-        elif function_name == "teleport_to":
-            location_id = args[0]
-            return f"coc {location_id}"
-            
-        elif function_name == "give_spell":
-            spell_id = args[0]
-            return f"player.addspell {spell_id}"
-            
-        elif function_name == "complete_quest":
-            quest_id = args[0]
-            return f"completequest {quest_id}"
-            
-        elif function_name == "set_weather":
-            weather_id = args[0]
-            return f"fw {weather_id}"
-            
-        else:
-            print(f"⚠️ Unknown function: {function_name}")
-            return None
+        return self.registry.resolve(function_name, args)
     
     def get_command_by_path(self, path):
         """Get command from commands.yaml using dot notation"""
-        parts = path.split('.')
-        data = self.commands_data
-        
-        for part in parts:
-            if part in data:
-                data = data[part]
-            else:
-                return path  # Return as-is if not found
-                
-        return data
+        return self.index.command(path, path)  # Return as-is if not found
     
     def get_item_id(self, item_name):
-        """Get item ID from ids.yaml or return as-is"""
-        if self.ids_data and item_name in self.ids_data:
-            return self.ids_data[item_name]
-        return item_name
+        """Get item ID from ids.yaml (dot notation), the form database, or return as-is"""
+        return self.registry.lookup_item_id(item_name)
     
-    def create_hybrid_commander_preset(self, preset_name, commands):
-        """Create a new preset in HybridCommander with the given commands"""
+    def create_hybrid_commander_preset(self, preset_name, commands, preset_index=None, key=None):
+        """Create a new preset in HybridCommander with the given commands
+        
+        When preset_index is given the preset is written into that slot in place;
+        otherwise a slot is allocated, preferring the one key held previously.
+        """
         try:
-            # Find first available preset slot (look for empty name or spaces)
-            preset_names = self.hybrid_config["stringList"]["PresetName"]
-            preset_index = None
+            if self.slot_allocator is None:
+                self.slot_allocator = self.build_slot_allocator()
             
-            for i, name in enumerate(preset_names):
-                if not name or name.strip() == "":  # Empty or whitespace-only slot found
-                    preset_index = i
-                    break
+            if preset_index is None:
+                # Take the key's previous slot if free, else the first available slot
+                preset_index = self.slot_allocator.allocate(key)
+            else:
+                self.slot_allocator.claim(preset_index, key)
                     
             if preset_index is None:
-                print(f"❌ No available preset slots (all 50 slots are full)")
+                log.error("❌ No available preset slots (all %d slots are full)", self.slot_layout.preset_slots)
                 return None
             
             # Set the preset name
             self.hybrid_config["stringList"]["PresetName"][preset_index] = preset_name
             
-            # Clear and set commands for this preset (max 10 commands per preset)
-            preset_commands = [""] * 10  # Initialize with 10 empty slots
-            for i, cmd in enumerate(commands[:10]):  # Take max 10 commands
-                preset_commands[i] = cmd
+            # Clear and set commands for this preset (max commands_per_preset commands)
+            self.hybrid_config["stringList"][str(preset_index)] = self.build_preset_commands(commands)
                 
-            self.hybrid_config["stringList"][str(preset_index)] = preset_commands
-                
-            print(f"📝 Created HybridCommander preset: {preset_name} (slot {preset_index})")
-            print(f"   Commands: {', '.join([cmd for cmd in commands[:10] if cmd])}")
+            log.debug("📝 Wrote HybridCommander preset: %s (slot %d)", preset_name, preset_index)
             return preset_index
             
         except Exception as e:
-            print(f"❌ Error creating preset: {e}")
+            log.error("❌ Error creating preset: %s", e)
             return None
     
+    def build_preset_commands(self, commands):
+        """Pad/truncate a command list to the command slots of a preset"""
+        limit = self.slot_layout.commands_per_preset
+        preset_commands = [""] * limit  # Initialize with empty slots
+        for i, cmd in enumerate(commands[:limit]):  # Take max commands_per_preset commands
+            preset_commands[i] = cmd
+        return preset_commands
+    
+    def build_slot_allocator(self, sticky=None):
+        """Build the free-slot allocator from the current preset table"""
+        return SlotAllocator(self.hybrid_config["stringList"]["PresetName"],
+                             self.slot_layout.preset_slots, sticky)
+    
+    def preset_matches(self, preset_index, preset_name, commands):
+        """Check whether a slot already holds exactly this preset"""
+        string_list = self.hybrid_config["stringList"]
+        preset_names = string_list["PresetName"]
+        if preset_index is None or not 0 <= preset_index < len(preset_names):
+            return False
+        return (preset_names[preset_index] == preset_name and
+                string_list.get(str(preset_index)) == self.build_preset_commands(commands))
+    
     def save_hybrid_commander_config(self):
-        """Save the modified HybridCommander configuration"""
+        """Save the modified HybridCommander configuration (atomically, and only if it changed)"""
         try:
             # Ensure directory exists
             os.makedirs(self.hybrid_config_path, exist_ok=True)
             
-            # Backup original config
-            backup_file = self.hybrid_config_file + ".backup"
-            if os.path.exists(self.hybrid_config_file) and not os.path.exists(backup_file):
-                shutil.copy2(self.hybrid_config_file, backup_file)
-                print("💾 Created backup of HybridCommander config")
+            # Serialize once and compare with what is already on disk
+            with self.profiler.phase("serialize"):
+                text = serialize_config(self.hybrid_config, self.hybrid_config_raw, compact=self.compact_json)
+            if file_matches(self.hybrid_config_file, text.encode('utf-8')):
+                log.info("✅ HybridCommander configuration already up to date (not rewritten)")
+                return True
             
-            # Save new config
-            with open(self.hybrid_config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.hybrid_config, f, indent=2)
+            with self.profiler.phase("write"):
+                # Keep the version being replaced in the compressed backup history
+                stored = self.backup_store().backup_file(self.hybrid_config_file)
+                if stored and stored[1]:
+                    log.info("💾 Backed up previous HybridCommander config (%s)", stored[0]["file"])
                 
-            print("✅ Saved HybridCommander configuration")
+                # Save new config via temp file + fsync + rename
+                write_if_changed(self.hybrid_config_file, text)
+                self.hybrid_config_stat = stat_key(self.hybrid_config_file)
+                
+            log.info("✅ Saved HybridCommander configuration")
             return True
             
         except Exception as e:
-            print(f"❌ Error saving HybridCommander config: {e}")
+            log.error("❌ Error saving HybridCommander config: %s", e)
             return False
     
-    def clear_python_presets(self):
-        """Clear existing Python-generated presets to avoid duplicates"""
+    def backup_store(self):
+        """Backup history of HybridCommander-Config.json, configured by config.yaml `backups:`"""
+        return BackupStore.from_config(self.keybinds_data.get('backups'), self.hybrid_config_path)
+    
+    def clear_preset_slot(self, preset_index):
+        """Clear a preset slot's name and command list"""
+        self.hybrid_config["stringList"]["PresetName"][preset_index] = ""
+        self.hybrid_config["stringList"][str(preset_index)] = [""] * self.slot_layout.commands_per_preset
+        if self.slot_allocator is not None:
+            self.slot_allocator.release(preset_index)
+    
+    def clear_python_presets(self, keep=()):
+        """Clear existing Python-generated presets to avoid duplicates (except slots in keep)"""
         preset_names = self.hybrid_config["stringList"]["PresetName"]
         
         # Find and clear slots with Python_ prefix
         cleared_count = 0
         for i, name in enumerate(preset_names):
-            if name.startswith("Python_"):
-                # Clear the preset name
-                self.hybrid_config["stringList"]["PresetName"][i] = ""
-                # Clear the command list for this slot
-                self.hybrid_config["stringList"][str(i)] = [""] * 10
+            if name.startswith("Python_") and i not in keep:
+                self.clear_preset_slot(i)
                 cleared_count += 1
                 
         if cleared_count > 0:
-            print(f"🧹 Cleared {cleared_count} existing Python presets")
+            log.info("🧹 Cleared %d existing Python presets", cleared_count)
         
         return cleared_count
     
-    def setup_hybrid_integration(self):
-        """Create HybridCommander presets for each preset configuration"""
-        if 'keybinds' not in self.keybinds_data:
-            print("❌ No keybinds found in config.yaml")
-            return
-        
-        # Clear existing Python presets first
-        self.clear_python_presets()
-            
-        created_presets = 0
-        
+    def resolve_keybinds(self):
+        """Resolve every keybind into {key: (preset_name, console_commands)}"""
+        resolved = {}
+        optimize = self.keybinds_data.get('optimize', True)
+        eliminated = 0
         for key, config in self.keybinds_data['keybinds'].items():
             name = config.get('name', key)
             description = config.get('description', 'No description')
-            commands = config.get('commands', [])
             
-            print(f"🔗 Setting up HybridCommander preset for {key}: {description}")
+            log.debug("🔗 Setting up HybridCommander preset for %s: %s", key, description)
             
             # Convert YAML commands to console commands
-            console_commands = []
-            for cmd_config in commands:
-                function = cmd_config.get('function')
-                args = cmd_config.get('args', [])
-                
-                console_command = self.resolve_command(function, args)
-                if console_command:
-                    console_commands.append(console_command)
+            console_commands = self.registry.resolve_many(config.get('commands', []))
+            
+            if console_commands and optimize:
+                with self.profiler.phase("optimize"):
+                    console_commands, removed = optimize_commands(console_commands)
+                if removed:
+                    log.debug("🧮 %s: %d redundant commands removed", key, removed)
+                    eliminated += removed
             
             if console_commands:
-                # Create preset in HybridCommander
-                preset_name = f"Python_{name}_{key}"
-                preset_index = self.create_hybrid_commander_preset(preset_name, console_commands)
-                
-                if preset_index is not None:
-                    print(f"✅ Created preset #{preset_index}: {preset_name}")
-                    print(f"   Commands: {', '.join(console_commands)}")
-                    created_presets += 1
+                resolved[key] = (f"Python_{name}_{key}", console_commands)
             else:
-                print(f"⚠️ No valid commands found for {key}")
+                log.warning("⚠️ No valid commands found for %s", key)
+        if eliminated:
+            log.info("🧮 Optimizer eliminated %d redundant commands", eliminated)
+        return resolved
+    
+    def validate_commands(self, groups):
+        """Check resolved commands against the console verb catalog; False only for strict failures"""
+        settings = self.keybinds_data.get('validation') or {}
+        if not (self.validate or settings.get('enabled')):
+            return True
+        with self.profiler.phase("validate"):
+            # The catalog is parsed on first use and kept until Command.json or the extra verbs change
+            key = (stat_key(self.hybrid_command_file), settings.get('extra_verbs'))
+            if self.command_catalog is None or key != self.command_catalog_key:
+                self.command_catalog = build_catalog(self.hybrid_command_file, settings.get('extra_verbs'))
+                self.command_catalog_key = key
+            problems = validate_groups(self.command_catalog, groups)
+        for name, command, problem in problems:
+            notes = self.index.describe_ids(command)
+            log.warning("⚠️ %s: %s in '%s'%s", name, problem, command, f" ({', '.join(notes)})" if notes else "")
+        for group in groups:
+            # Show which ids.yaml names the resolved form IDs came from
+            notes = [note for command in group.commands for note in self.index.describe_ids(command)]
+            if notes:
+                log.info("🔎 %s: %s", group.name, Joined(notes))
+        if problems and settings.get('strict'):
+            log.error("❌ %d invalid commands - presets not written (validation.strict)", len(problems))
+            return False
+        if not problems:
+            log.info("✅ All commands passed validation (%d known verbs)", self.command_catalog.count)
+        return True
+    
+    def seed_manifest(self, manifest, groups):
+        """First run with a manifest: adopt existing Python_ slots and clear stale ones"""
+        slots_by_name = {}
+        for i, name in enumerate(self.hybrid_config["stringList"]["PresetName"]):
+            if name.startswith("Python_"):
+                slots_by_name.setdefault(name, i)
+        
+        adopted = set()
+        for group in groups:
+            slot = slots_by_name.get(group.name)
+            if slot is not None:
+                for key in group.keys:
+                    manifest.record(key, slot, group.name, None)
+                adopted.add(slot)
         
-        print(f"\n📊 Created {created_presets} presets total")
-        return created_presets
+        return self.clear_python_presets(keep=adopted)
     
-    def run(self):
-        """Main execution loop"""
-        print("=" * 60)
-        print("🐉 SKYRIM HYBRIDCOMMANDER PRESET GENERATOR")
-        print("=" * 60)
+    def owns_slot(self, entry):
+        """Check whether a manifest entry's slot still holds our preset (or was emptied)"""
+        preset_names = self.hybrid_config["stringList"]["PresetName"]
+        slot = entry["slot"]
+        return 0 <= slot < len(preset_names) and preset_names[slot] in ("", entry["name"])
+    
+    def setup_hybrid_integration(self, groups=None, preferred_slots=None):
+        """Create or update HybridCommander presets, touching only keybinds that changed
         
-        # Load configurations
+        Keybinds with identical command lists share one preset slot. groups
+        (e.g. from a compiled plan) skips resolving config.yaml; preferred_slots
+        maps keys to the slot a new preset should get if it is free.
+        """
+        if groups is None:
+            if 'keybinds' not in self.keybinds_data:
+                log.error("❌ No keybinds found in config.yaml")
+                return
+            with self.profiler.phase("resolve"):
+                groups = group_identical(self.resolve_keybinds())
+            if not self.validate_commands(groups):
+                return None
+        
+        # Command lists too long for one preset (or all, if configured) move into `bat` files
+        try:
+            self.batch_files = BatchFiles.from_config(self.keybinds_data.get('batch_files'), self.game_path,
+                                                      self.slot_layout.commands_per_preset)
+        except ValueError as e:
+            log.error("❌ %s", e)
+            return None
+        if self.batch_files.apply(groups):
+            log.info("📜 %d presets run through batch files in %s", len(self.batch_files.files),
+                     self.batch_files.directory)
+        
+        manifest = self.preset_manifest or PresetManifest.load(self.preset_manifest_file)
+        preset_names = self.hybrid_config["stringList"]["PresetName"]
+        active_keys = {key for group in groups for key in group.keys}
+        
+        # One allocator for the whole run, remembering each key's previous slot
+        self.slot_allocator = self.build_slot_allocator({**manifest.slot_history, **(preferred_slots or {})})
+        
+        changes = {"added": 0, "changed": 0, "removed": 0, "unchanged": 0}
+        if manifest.is_new:
+            changes["removed"] += self.seed_manifest(manifest, groups)
+        
+        # Keep each group in a slot one of its keybinds already held
+        claimed = set()
+        placed = []
+        pending = []
+        for group in groups:
+            entries = [manifest.get(key) for key in group.keys]
+            slot = next((entry["slot"] for entry in entries
+                         if entry and entry["slot"] not in claimed and self.owns_slot(entry)), None)
+            if slot is None:
+                pending.append(group)
+            else:
+                claimed.add(slot)
+                placed.append((group, slot, entries))
+        
+        # Slots no group kept (removed keybinds, merged duplicates) are cleared and freed
+        stale = {}
+        for entry in manifest.presets.values():
+            if entry["slot"] not in claimed:
+                stale.setdefault(entry["slot"], entry["name"])
+        for slot, name in sorted(stale.items()):
+            if 0 <= slot < len(preset_names) and preset_names[slot] == name:
+                self.clear_preset_slot(slot)
+                log.info("🧹 Removed preset #%d: %s", slot, name)
+                changes["removed"] += 1
+        for key in [key for key in manifest.presets if key not in active_keys]:
+            manifest.remove(key)
+        
+        for group, slot, entries in placed:
+            digest = fingerprint(group.name, group.commands)
+            self.slot_allocator.claim(slot, group.keys[0])
+            
+            # Adopted slots (no fingerprint yet) are compared by content alone
+            unchanged = (all(entry and entry["slot"] == slot and entry["fingerprint"] in (digest, None) for entry in entries)
+                         and self.preset_matches(slot, group.name, group.commands))
+            if unchanged:
+                changes["unchanged"] += 1
+            else:
+                self.create_hybrid_commander_preset(group.name, group.commands, slot)
+                log.info("✅ Updated preset #%d: %s", slot, group.name)
+                log.debug("   Commands: %s", Joined(group.commands))
+                changes["changed"] += 1
+            for key in group.keys:
+                manifest.record(key, slot, group.name, digest)
+        
+        # New presets: those whose keybind's previous slot is still free go first so they get it back
+        def sticky_key(group):
+            return next((key for key in group.keys if self.slot_allocator.preferred(key) is not None), None)
+        pending.sort(key=lambda group: sticky_key(group) is None)
+        for group in pending:
+            for key in group.keys:
+                manifest.remove(key)
+            preset_index = self.create_hybrid_commander_preset(group.name, group.commands,
+                                                               key=sticky_key(group) or group.keys[0])
+            if preset_index is not None:
+                digest = fingerprint(group.name, group.commands)
+                for key in group.keys:
+                    manifest.record(key, preset_index, group.name, digest)
+                log.info("✅ Created preset #%d: %s", preset_index, group.name)
+                log.debug("   Commands: %s", Joined(group.commands))
+                changes["added"] += 1
+                claimed.add(preset_index)
+        
+        self.preset_manifest = manifest
+        self.last_changes = changes
+        self.config_changed = self.config_changed or any(changes[kind] for kind in ("added", "changed", "removed"))
+        
+        active_presets = len(claimed)
+        saved_slots = sum(len(group.keys) - 1 for group in groups)
+        log.info("\n📊 %d presets total: %d added, %d updated, %d removed, %d unchanged", active_presets,
+                 changes['added'], changes['changed'], changes['removed'], changes['unchanged'],
+                 extra={"fields": {"presets": active_presets, **changes}})
+        if saved_slots:
+            shared = sum(1 for group in groups if group.shared)
+            log.info("♻️ %d presets shared by identical keybinds - saved %d slots", shared, saved_slots)
+        self.last_changes["saved_slots"] = saved_slots
+        return active_presets
+    
+    def apply_presets(self, groups=None, preferred_slots=None):
+        """Create presets for each keybind and save whatever changed"""
+        with self.profiler.phase("allocate"):
+            created_count = self.setup_hybrid_integration(groups, preferred_slots)
+        
+        if not created_count:
+            log.error("❌ No presets were created")
+            return False
+        
+        # Batch files go first so a saved preset never points at a missing file
+        try:
+            with self.profiler.phase("write"):
+                written, removed = self.batch_files.write(self.preset_manifest.batch_files)
+            self.preset_manifest.batch_files = sorted(self.batch_files.files)
+            if written or removed:
+                log.info("📜 Batch files: %d written, %d removed", written, removed)
+        except OSError as e:
+            log.error("❌ Error writing batch files: %s", e)
+            return False
+        
+        # Save configuration only when a slot actually changed
+        self.last_active_presets = created_count
+        self.last_saved = self.config_changed
+        if self.config_changed:
+            if not self.save_hybrid_commander_config():
+                return False
+        else:
+            log.info("✅ Presets already up to date - HybridCommander config left untouched")
+        self.config_changed = False
+        
+        try:
+            with self.profiler.phase("write"):
+                self.preset_manifest.save()
+        except OSError as e:
+            log.warning("⚠️ Could not save preset manifest: %s", e)
+        return True
+    
+    def compile_plan(self, plan_path):
+        """Resolve config.yaml into a plan file that can be applied without YAML or the resolver"""
+        log.info("🛠️ Compiling presets into %s", plan_path)
         if not self.load_configs():
             return False
+        if 'keybinds' not in self.keybinds_data:
+            log.error("❌ No keybinds found in config.yaml")
+            return False
         
-        # Check HybridCommander installation
-        if not self.check_hybrid_commander():
+        with self.profiler.phase("resolve"):
+            groups = group_identical(self.resolve_keybinds())
+        if not self.validate_commands(groups):
             return False
         
-        # Load HybridCommander data
-        if not self.load_hybrid_commander_data():
+        # Assign slots deterministically, keeping each key's slot from the previous plan
+        allocator = SlotAllocator([""] * self.slot_layout.preset_slots, sticky=plan_slots(plan_path))
+        slots = []
+        for group in groups:
+            sticky_key = next((key for key in group.keys if allocator.preferred(key) is not None), group.keys[0])
+            slots.append(allocator.allocate(sticky_key))
+        if None in slots:
+            log.error("❌ Plan needs %d presets but only %d slots exist", len(groups), self.slot_layout.preset_slots)
             return False
         
-        # Create presets for each hotkey
-        created_count = self.setup_hybrid_integration()
+        plan = build_plan(groups, slots, self.slot_layout,
+                          source_hashes(['config.yaml', 'commands.yaml', 'ids.yaml']), self.keybinds_data)
+        try:
+            written = write_plan(plan_path, plan)
+        except OSError as e:
+            log.error("❌ Error writing plan: %s", e)
+            return False
         
-        if created_count == 0:
-            print("❌ No presets were created")
+        log.info("✅ %s %s (%d presets)", 'Wrote' if written else 'Plan unchanged:', plan_path, len(groups))
+        return True
+    
+    def apply_plan(self, plan_path):
+        """Merge a compiled plan into HybridCommander-Config.json (no YAML parsing or resolving)"""
+        log.info("📦 Applying preset plan %s", plan_path)
+        try:
+            plan = read_plan(plan_path)
+        except (OSError, ValueError) as e:
+            log.error("❌ Error reading plan: %s", e)
             return False
         
-        # Save configuration
-        if not self.save_hybrid_commander_config():
+        self.slot_layout = SlotLayout(**plan["layout"])
+        # Batch file and backup settings from the config.yaml the plan was compiled from
+        self.keybinds_data = dict(plan.get("settings") or {})
+        if not self.check_hybrid_commander() or not self.load_hybrid_commander_data():
             return False
         
-        print("\n" + "=" * 60)
-        print("✅ HYBRIDCOMMANDER PRESET GENERATION COMPLETE")
-        print("=" * 60)
-        print("🎮 Your presets are now available in HybridCommander!")
-        print("\n📋 CREATED PRESETS:")
+        groups, preferred_slots = plan_groups(plan)
+        if not self.apply_presets(groups, preferred_slots):
+            return False
         
-        # Show what presets were created
-        preset_names = self.hybrid_config["stringList"]["PresetName"]
-        active_presets = [(i, name) for i, name in enumerate(preset_names) if name != ""]
+        log.info("✅ Plan applied - restart Skyrim to load the updated presets")
+        return True
+    
+    def regenerate(self, changed_files=()):
+        """Re-run only the steps affected by changed config files (watch mode)"""
+        names = ', '.join(sorted(os.path.basename(path) for path in changed_files))
+        log.info("\n🔄 Change detected: %s", names or 'config files')
+        
+        if not self.load_configs():
+            return False
+        
+        # Reload HybridCommander state only if something else rewrote it since our last read/write
+        if self.hybrid_config is None or stat_key(self.hybrid_config_file) != self.hybrid_config_stat:
+            if not self.load_hybrid_commander_data():
+                return False
+            self.preset_manifest = None
+        
+        return self.apply_presets()
+    
+    def watched_files(self):
+        """Config files watch mode follows: the main files plus the includes of the last load"""
+        watched = [path for path in ('config.yaml', 'commands.yaml', 'ids.yaml') if os.path.exists(path)]
+        return watched + [os.path.relpath(path) for path in self.config_tree.fragments]
+    
+    def watch(self, debounce=0.5):
+        """Keep state in memory and regenerate presets whenever a config file changes"""
+        success = self.run()
+        if not os.path.exists(self.hybrid_command_file):
+            return success
+        
+        watched = self.watched_files()
+        watcher = create_watcher(watched)
+        log.info("\n👀 Watching %s (%s) - press Ctrl+C to stop", ', '.join(watched), watcher.name)
         
+        try:
+            watch_files(watched, self.regenerate, debounce=debounce, watcher=watcher, refresh=self.watched_files)
+        except KeyboardInterrupt:
+            log.info("\n🛑 Stopped watching")
+        return True
+    
+    def format_summary(self):
+        """Generated presets and in-game setup steps, shown after a run"""
+        active_presets = [(i, name) for i, name in enumerate(self.hybrid_config["stringList"]["PresetName"]) if name]
+        lines = ["", "=" * 60, "✅ HYBRIDCOMMANDER PRESET GENERATION COMPLETE", "=" * 60,
+                 "🎮 Your presets are now available in HybridCommander!", "", "📋 CREATED PRESETS:"]
         for i, name in active_presets:
             # Extract the key name from the preset name
             key_part = name.split('_')[-1] if '_' in name else f"Slot{i}"
-            print(f"   • Slot {i:02d}: {name} ({key_part})")
-            
-        print("\n🎮 TO USE IN SKYRIM:")
-        print("   1. **RESTART SKYRIM** (HybridCommander loads config on startup)")
-        print("   2. In-game, open MCM (Mod Configuration Menu)")
-        print("   3. Navigate to: HybridCommander → Preset List")
-        print("   4. You should see your presets:")
+            lines.append(f"   • Slot {i:02d}: {name} ({key_part})")
+        lines += ["", "🎮 TO USE IN SKYRIM:",
+                  "   1. **RESTART SKYRIM** (HybridCommander loads config on startup)",
+                  "   2. In-game, open MCM (Mod Configuration Menu)",
+                  "   3. Navigate to: HybridCommander → Preset List",
+                  "   4. You should see your presets:"]
         for i, name in active_presets:
             key_part = name.split('_')[-1] if '_' in name else f"Slot{i}"
             description = name.replace('Python_', '').replace(f'_{key_part}', '').replace('_', ' ')
-            print(f"      - Slot {i:02d}: {description} ({key_part})")
-        print("   5. Go to HybridCommander → Hotkey/Power pages to assign them")
-        print("   6. Test your commands!")
-        print("\n💡 TIP: Assign these to numpad keys in HybridCommander for intuitive use:")
-        print("   • Numpad1-8: Basic utilities and enhancements")
-        print("   • Numpad9,0,Period,Plus: Advanced skills and unlocks")
-        print("\n🔄 Re-run this script to update presets when you change config.yaml")
-        print("=" * 60)
+            lines.append(f"      - Slot {i:02d}: {description} ({key_part})")
+        lines += ["   5. Go to HybridCommander → Hotkey/Power pages to assign them",
+                  "   6. Test your commands!", "",
+                  "💡 TIP: Assign these to numpad keys in HybridCommander for intuitive use:",
+                  "   • Numpad1-8: Basic utilities and enhancements",
+                  "   • Numpad9,0,Period,Plus: Advanced skills and unlocks", "",
+                  "🔄 Re-run this script to update presets when you change config.yaml", "=" * 60]
+        return "\n".join(lines)
+    
+    def run(self):
+        """Main execution loop"""
+        log.info("%s\n🐉 SKYRIM HYBRIDCOMMANDER PRESET GENERATOR\n%s", "=" * 60, "=" * 60)
+        
+        # Load configurations
+        if not self.load_configs():
+            return False
+        
+        # Check HybridCommander installation
+        if not self.check_hybrid_commander():
+            return False
+        
+        # Load HybridCommander data
+        if not self.load_hybrid_commander_data():
+            return False
+        
+        if not self.apply_presets():
+            return False
+        
+        # The usage guide is only built when INFO output is on
+        if log.isEnabledFor(logging.INFO):
+            log.info("%s", self.format_summary())
         
         return True
 
-def main():
+def main(argv=None):
     """Main application entry point"""
-    print("🚀 Starting Skyrim Preset Generator...")
+    args = parse_args(argv)
+    configure(quiet=args.quiet, verbose=args.verbose, json_output=args.json)
+    log.info("🚀 Starting Skyrim Preset Generator...")
     
-    # Check if we're in the right directory
-    if not os.path.exists('commands.yaml') or not os.path.exists('config.yaml'):
-        print("❌ Missing YAML config files!")
-        print("📁 Make sure you're in the skyrim project directory")
-        print("📁 Required files: commands.yaml, config.yaml")
-        sys.exit(1)
+    # Form database maintenance needs no preset config
+    if args.import_forms or args.find_form:
+        success = True
+        if args.import_forms:
+            success = run_form_import(args.form_db or DEFAULT_FORM_DB, args.import_forms, args.replace)
+        if success and args.find_form:
+            success = run_form_search(args.form_db or DEFAULT_FORM_DB, args.find_form)
+        return 0 if success else 1
     
-    print("✅ Found required config files")
+    # Backup history needs only the HybridCommander folder (and config.yaml's backups: settings, if any)
+    if args.list_backups or args.rollback is not None:
+        generator = SkyrimPresetGenerator(skyrim_data_path=args.data_path)
+        if os.path.exists('config.yaml'):
+            data = generator.config_cache.load_many({'config': ('config.yaml', None)})['config'][0]
+            generator.keybinds_data = generator.config_tree.load('config.yaml', data)
+        store = generator.backup_store()
+        if args.rollback is not None:
+            success = run_rollback(store, args.rollback, generator.hybrid_config_file)
+        else:
+            success = run_list_backups(store)
+        return 0 if success else 1
+    
+    # Check if we're in the right directory (applying a compiled plan needs no YAML)
+    if not args.apply:
+        if not os.path.exists('commands.yaml') or not os.path.exists('config.yaml'):
+            log.error("❌ Missing YAML config files!")
+            log.error("📁 Make sure you're in the skyrim project directory")
+            log.error("📁 Required files: commands.yaml, config.yaml")
+            sys.exit(1)
+        
+        log.info("✅ Found required config files")
     
     # Run the preset generator
     try:
-        generator = SkyrimPresetGenerator()
-        success = generator.run()
+        if args.profiles:
+            success = run_profile_batch(args.profiles, args.jobs, args.compact)
+        else:
+            profiler = Profiler(enabled=args.profile)
+            generator = SkyrimPresetGenerator(compact_json=args.compact, skyrim_data_path=args.data_path,
+                                              profiler=profiler, validate=args.validate, form_db_path=args.form_db)
+            if args.compile:
+                success = generator.compile_plan(args.compile)
+            elif args.apply:
+                success = generator.apply_plan(args.apply)
+            elif args.watch:
+                success = generator.watch(args.debounce)
+            else:
+                success = generator.run()
+            profiler.log_report()
         
         if success:
-            print("\n🎉 Application completed successfully!")
+            log.info("\n🎉 Application completed successfully!")
             return 0
         else:
-            print("\n❌ Application failed to complete")
+            log.error("\n❌ Application failed to complete")
             return 1
             
     except KeyboardInterrupt:
-        print("\n\n⚠️ Application interrupted by user")
+        log.warning("\n\n⚠️ Application interrupted by user")
         return 130
     except Exception as e:
-        print(f"\n❌ Unexpected error: {e}")
+        log.error("\n❌ Unexpected error: %s", e)
         import traceback
         traceback.print_exc()
         return 1
@@ -0,0 +1,65 @@
+import sys
+import time
+
+from conditions_for_button_clicks.backends import AutoHotkeyBackend, BackendSelector, RecordingBackend
+from conditions_for_button_clicks.keys import get_key
+
+KEY = get_key("F1")
+
+ECHO_SERVER = "import sys\nfor line in sys.stdin:\n    print('ok', flush=True)\n"
+HUNG_SERVER = "import sys, time\nsys.stdin.readline()\ntime.sleep(30)\n"
+
+
+def test_selector_keeps_the_first_working_backend_without_reprobing():
+    first, second = RecordingBackend("first"), RecordingBackend("second")
+    selector = BackendSelector([first, second])
+    assert selector.press(KEY) is first
+    assert selector.press(KEY) is first
+    assert selector.probes == 1
+    assert [name for _, name in first.presses] == ["F1", "F1"]
+    assert second.attempts == 0
+
+
+def test_selector_skips_unavailable_backends():
+    missing, present = RecordingBackend("missing", is_available=False), RecordingBackend("present")
+    selector = BackendSelector([missing, present])
+    assert selector.press(KEY) is present
+    assert missing.attempts == 0
+
+
+def test_selector_falls_back_after_a_failure_and_remembers_the_fallback():
+    flaky, steady = RecordingBackend("flaky", fail=1), RecordingBackend("steady")
+    selector = BackendSelector([flaky, steady])
+    assert selector.press(KEY) is steady
+    assert [(name, ok) for name, _, ok in selector.last_attempts] == [("flaky", False), ("steady", True)]
+    assert selector.press(KEY) is steady
+    assert flaky.attempts == 1
+
+
+def test_selector_returns_none_when_every_backend_fails():
+    selector = BackendSelector([RecordingBackend("a", fail=True), RecordingBackend("b", fail=True)])
+    assert selector.press(KEY) is None
+    assert selector.current is None
+    assert len(selector.last_attempts) == 2
+
+
+def test_autohotkey_press_waits_for_the_acknowledgement():
+    backend = AutoHotkeyBackend(ahk_path=sys.executable, reply_timeout=5)
+    backend.launch([sys.executable, "-c", ECHO_SERVER])
+    try:
+        assert backend.press(KEY)
+        assert backend.press(KEY)
+    finally:
+        backend.close()
+
+
+def test_hung_autohotkey_times_out_and_the_selector_falls_back():
+    backend = AutoHotkeyBackend(ahk_path=sys.executable, reply_timeout=0.2)
+    backend.launch([sys.executable, "-c", HUNG_SERVER])
+    fallback = RecordingBackend("fallback")
+    selector = BackendSelector([backend, fallback])
+    started = time.monotonic()
+    assert selector.press(KEY) is fallback
+    assert time.monotonic() - started < 5
+    assert backend.process is None
+    assert not backend.available()
@@ -0,0 +1,99 @@
+import gzip
+import lzma
+import os
+
+import pytest
+
+from generator.backups import BackupStore
+
+
+def version(number, size=64):
+    return f'{{"version": {number}, "pad": "{"x" * size}"}}'.encode("utf-8")
+
+
+def test_identical_content_is_stored_once(tmp_path):
+    store = BackupStore(str(tmp_path))
+    first, stored = store.add(version(1))
+    assert stored
+    store.add(version(2))
+    again, stored = store.add(version(1))
+    assert not stored and again is first
+    assert [entry["sha256"] for _, entry in store.listing()][0] == first["sha256"]  # Now the newest
+    assert len(store.entries) == 2
+    assert len([name for name in os.listdir(tmp_path) if name != "index.json"]) == 2
+
+
+def test_read_round_trips_and_checks_the_hash(tmp_path):
+    store = BackupStore(str(tmp_path))
+    entry, _ = store.add(version(1))
+    with open(tmp_path / entry["file"], "rb") as f:
+        assert lzma.decompress(f.read()) == version(1)
+    assert store.read(entry) == version(1)
+
+    with open(tmp_path / entry["file"], "wb") as f:
+        f.write(lzma.compress(version(2)))
+    with pytest.raises(ValueError, match="corrupt"):
+        store.read(entry)
+
+
+def test_gzip_compression_and_unknown_compressors(tmp_path):
+    store = BackupStore(str(tmp_path), compression="gzip")
+    entry, _ = store.add(version(1))
+    assert entry["file"].endswith(".json.gz")
+    with open(tmp_path / entry["file"], "rb") as f:
+        assert gzip.decompress(f.read()) == version(1)
+    with pytest.raises(ValueError, match="compression"):
+        BackupStore(str(tmp_path), compression="zip")
+
+
+def test_pruning_by_count_keeps_the_newest(tmp_path):
+    store = BackupStore(str(tmp_path), keep=3)
+    entries = [store.add(version(number))[0] for number in range(5)]
+    assert [entry["sha256"] for entry in store.entries] == [entry["sha256"] for entry in entries[2:]]
+    assert not os.path.exists(tmp_path / entries[0]["file"])
+    assert os.path.exists(tmp_path / entries[4]["file"])
+
+
+def test_pruning_by_size_never_drops_the_newest(tmp_path):
+    store = BackupStore(str(tmp_path), max_bytes=1)
+    store.add(version(1))
+    newest, _ = store.add(version(2))
+    assert store.entries == [newest]
+    assert os.path.exists(tmp_path / newest["file"])
+
+
+def test_index_survives_reload_and_forgets_deleted_files(tmp_path):
+    store = BackupStore(str(tmp_path))
+    old, _ = store.add(version(1))
+    new, _ = store.add(version(2))
+    os.remove(tmp_path / old["file"])
+    assert [entry["sha256"] for entry in BackupStore(str(tmp_path)).entries] == [new["sha256"]]
+
+
+def test_rollback_restores_and_backs_up_the_replaced_version(tmp_path):
+    target = tmp_path / "HybridCommander-Config.json"
+    store = BackupStore(str(tmp_path / "backups"))
+    target.write_bytes(version(1))
+    store.backup_file(str(target))
+    target.write_bytes(version(2))
+
+    entry = store.rollback(1, str(target))
+    assert target.read_bytes() == version(1)
+    assert entry["sha256"] == store.entries[0]["sha256"]
+    # Version 2 was saved first, so the rollback can be undone
+    store.rollback(1, str(target))
+    assert target.read_bytes() == version(2)
+    with pytest.raises(IndexError, match="No backup #5"):
+        store.rollback(5, str(target))
+
+
+def test_missing_file_is_not_backed_up(tmp_path):
+    store = BackupStore(str(tmp_path / "backups"))
+    assert store.backup_file(str(tmp_path / "missing.json")) is None
+    assert store.entries == []
+
+
+def test_from_config_reads_limits(tmp_path):
+    store = BackupStore.from_config({"keep": 0, "max_mb": 0.5, "compression": "gzip"}, str(tmp_path))
+    assert store.directory == os.path.join(str(tmp_path), "HybridCommander-Backups")
+    assert (store.keep, store.max_bytes, store.compression) == (1, 512 * 1024, "gzip")
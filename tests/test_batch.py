@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+from generator.batch import BatchFiles, batch_file_stem
+from generator.dedupe import PresetGroup
+
+
+def group(name, count):
+    return PresetGroup("F1", name, [f"player.modav health {index}" for index in range(count)], None)
+
+
+def test_file_stems_are_console_safe():
+    assert batch_file_stem("Python_Heal & Buff_F1") == "Python_Heal_Buff_F1"
+    assert batch_file_stem("!!!") == "preset"
+
+
+def test_overflow_mode_only_moves_presets_that_do_not_fit(tmp_path):
+    batch = BatchFiles(str(tmp_path), mode="overflow", limit=3)
+    short, long = group("Short", 3), group("Long Preset", 5)
+    assert batch.apply([short, long]) == 1
+    assert len(short.commands) == 3
+    assert long.commands == ["bat Long_Preset"]
+    path = str(tmp_path / "Long_Preset.txt")
+    assert batch.files[path].splitlines() == [f"player.modav health {index}" for index in range(5)]
+
+
+def test_all_mode_quotes_paths_with_spaces(tmp_path):
+    directory = tmp_path / "My Batches"
+    batch = BatchFiles(str(tmp_path), str(directory), mode="all", limit=10)
+    preset = group("Tiny", 1)
+    batch.apply([preset])
+    assert preset.commands == [f'bat "{os.path.join("My Batches", "Tiny")}"']
+
+
+def test_off_mode_keeps_commands_in_the_preset(tmp_path):
+    batch = BatchFiles(str(tmp_path), mode="off", limit=2)
+    preset = group("Long", 4)
+    assert batch.apply([preset]) == 0
+    assert len(preset.commands) == 4 and batch.files == {}
+
+
+def test_unknown_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="batch_files mode"):
+        BatchFiles.from_config({"mode": "sometimes"}, str(tmp_path), 10)
+
+
+def test_write_only_touches_changed_files_and_removes_stale_ones(tmp_path):
+    batch = BatchFiles(str(tmp_path), str(tmp_path / "bat"), mode="all")
+    batch.apply([group("One", 2), group("Two", 2)])
+    assert batch.write() == (2, 0)
+    one, two = sorted(batch.files)
+
+    again = BatchFiles(str(tmp_path), str(tmp_path / "bat"), mode="all")
+    again.apply([group("One", 3)])
+    assert again.write(previous=[one, two]) == (1, 1)
+    assert os.path.exists(one) and not os.path.exists(two)
+    assert again.write(previous=[one]) == (0, 0)
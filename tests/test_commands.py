@@ -0,0 +1,39 @@
+import pytest
+
+from generator.commands import CommandRegistry
+
+COMMANDS = [
+    {"function": "give_item", "args": ["currency.gold", 100]},
+    {"function": "set_player_stat", "args": ["health", 500]},
+    {"function": "no_such_function", "args": []},
+]
+
+
+def test_resolve_many_is_memoized_per_command_list():
+    registry = CommandRegistry()
+    first = registry.resolve_many(COMMANDS)
+    second = registry.resolve_many(COMMANDS)
+    assert first == second == ["player.additem 0000000f 100", "player.setav health 500"]
+    assert first is not second
+    assert registry._resolve_many_cached.cache_info().hits == 1
+
+
+def test_cache_is_cleared_when_templates_change():
+    registry = CommandRegistry()
+    registry.resolve_many(COMMANDS)
+    registry.add_template("set_player_stat", "player.forceav {stat} {value}")
+    assert registry.resolve_many(COMMANDS)[1] == "player.forceav health 500"
+
+
+def test_type_errors_raised_by_handlers_are_not_swallowed():
+    registry = CommandRegistry()
+    calls = []
+
+    @registry.function("broken")
+    def broken(registry, value):
+        calls.append(value)
+        raise TypeError("bug in handler")
+
+    with pytest.raises(TypeError, match="bug in handler"):
+        registry.resolve("broken", [1])
+    assert calls == [1]
@@ -0,0 +1,50 @@
+from conditions_for_button_clicks.conditions import ConditionEngine, Rule
+
+
+def engine(*rules):
+    return ConditionEngine(rules, None, lambda rule, line: None)
+
+
+def test_every_matching_rule_is_returned_whatever_its_position_in_the_line():
+    rules = engine(Rule("a", "key", "F1", "foo"), Rule("b", "key", "F2", "bar"))
+    assert [rule.name for rule in rules.matching_rules("bar then foo")] == ["a", "b"]
+
+
+def test_lines_matching_no_rule_are_rejected():
+    rules = engine(Rule("a", "key", "F1", "foo"), Rule("b", "key", "F2", "bar"))
+    assert rules.matching_rules("nothing here") == []
+
+
+def test_ignore_case_applies_per_rule():
+    rules = engine(Rule("a", "key", "F1", "Dragon", ignore_case=True), Rule("b", "key", "F2", "Dragon"))
+    assert [rule.name for rule in rules.matching_rules("a dragon appears")] == ["a"]
+
+
+def test_patterns_with_groups_match_on_their_own():
+    rules = engine(Rule("repeat", "key", "F1", r"(\w+) and \1"), Rule("named", "key", "F2", r"(?P<who>\w+) died"),
+                   Rule("again", "key", "F3", r"(?P<who>\w+) fled"), Rule("plain", "key", "F4", "health (is )?low"))
+    assert [rule.name for rule in rules.matching_rules("again and again")] == ["repeat"]
+    assert [rule.name for rule in rules.matching_rules("Lydia died, bandit fled")] == ["named", "again"]
+    assert [rule.name for rule in rules.matching_rules("health is low")] == ["plain"]
+    assert rules.matching_rules("again and later") == []
+
+
+def test_patterns_that_cannot_be_combined_still_match():
+    rules = engine(Rule("a", "key", "F1", "(?i)dragon"), Rule("b", "key", "F2", "Giant"))
+    assert rules.combined is None
+    assert [rule.name for rule in rules.matching_rules("DRAGON and Giant")] == ["a", "b"]
+
+
+def test_burst_of_matching_lines_fires_once_within_the_default_cooldown():
+    class Logs:
+        def read_lines(self):
+            return [("Papyrus.0.log", "quest done")] * 5
+
+        def save_state(self):
+            pass
+
+    fired = []
+    rules = ConditionEngine([Rule("quest", "key", "F5", "quest done")], Logs(),
+                            lambda rule, line: fired.append(line), clock=lambda: 100.0)
+    rules.poll()
+    assert fired == ["quest done"]
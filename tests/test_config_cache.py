@@ -0,0 +1,80 @@
+import os
+import pickle
+
+from generator.config_cache import CACHE_VERSION, ConfigCache
+
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def load(cache, path, indexer=None):
+    return cache.load_many({"config": (path, indexer)})["config"]
+
+
+def test_second_load_is_served_from_the_pickle(tmp_path):
+    path = write(tmp_path / "config.yaml", "keybinds:\n  F1: {commands: [tgm]}\n")
+    cache_dir = str(tmp_path / "cache")
+    first = ConfigCache(cache_dir)
+    data, index = load(first, path, lambda data: sorted(data["keybinds"]))
+    assert (first.hits, first.misses) == (0, 1)
+    assert index == ["F1"]
+
+    second = ConfigCache(cache_dir)  # Fresh process: nothing in memory
+    assert load(second, path, lambda data: 1 / 0) == (data, ["F1"])  # The indexer is not run again
+    assert (second.hits, second.misses) == (1, 0)
+
+
+def test_edited_file_is_parsed_again(tmp_path):
+    path = write(tmp_path / "config.yaml", "optimize: true\n")
+    cache = ConfigCache(str(tmp_path / "cache"))
+    load(cache, path)
+    write(tmp_path / "config.yaml", "optimize: false\n")
+    assert load(cache, path)[0] == {"optimize": False}
+    assert cache.misses == 1
+
+
+def test_touched_but_unchanged_file_keeps_the_cached_data(tmp_path):
+    path = write(tmp_path / "config.yaml", "optimize: true\n")
+    cache = ConfigCache(str(tmp_path / "cache"))
+    data = load(cache, path)[0]
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert load(cache, path)[0] is data
+    assert cache.hits == 1
+
+
+def test_stale_or_corrupt_pickles_are_ignored(tmp_path):
+    path = write(tmp_path / "config.yaml", "optimize: true\n")
+    cache_dir = str(tmp_path / "cache")
+    load(ConfigCache(cache_dir), path)
+    entry_path = ConfigCache(cache_dir).entry_path(path)
+
+    with open(entry_path, "rb") as f:
+        entry = pickle.load(f)
+    entry["version"] = CACHE_VERSION + 1
+    entry["data"] = {"optimize": "stale"}
+    with open(entry_path, "wb") as f:
+        pickle.dump(entry, f)
+    cache = ConfigCache(cache_dir)
+    assert load(cache, path)[0] == {"optimize": True}
+    assert cache.misses == 1
+
+    with open(entry_path, "wb") as f:
+        f.write(b"not a pickle")
+    assert load(ConfigCache(cache_dir), path)[0] == {"optimize": True}
+
+
+def test_disabled_cache_writes_no_files(tmp_path):
+    path = write(tmp_path / "config.yaml", "optimize: true\n")
+    cache = ConfigCache(str(tmp_path / "cache"), enabled=False)
+    load(cache, path)
+    assert load(cache, path)[0] == {"optimize": True}
+    assert cache.hits == 1  # Still remembered in memory
+    assert not os.path.exists(tmp_path / "cache")
+
+
+def test_empty_file_parses_to_an_empty_mapping(tmp_path):
+    path = write(tmp_path / "config.yaml", "")
+    assert load(ConfigCache(str(tmp_path / "cache")), path)[0] == {}
@@ -0,0 +1,24 @@
+import os
+import stat
+
+from generator.config_io import atomic_write, default_file_mode
+
+
+def mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_atomic_write_keeps_the_target_permissions(tmp_path):
+    target = tmp_path / "HybridCommander-Config.json"
+    target.write_bytes(b"old")
+    os.chmod(target, 0o640)
+    atomic_write(str(target), b"new")
+    assert target.read_bytes() == b"new"
+    assert mode(target) == 0o640
+
+
+def test_atomic_write_creates_new_files_with_the_umask_default(tmp_path):
+    target = tmp_path / "new.json"
+    atomic_write(str(target), b"data")
+    assert mode(target) == default_file_mode()
+    assert [path.name for path in tmp_path.iterdir()] == ["new.json"]
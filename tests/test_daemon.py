@@ -0,0 +1,109 @@
+import asyncio
+import os
+
+import pytest
+
+from generator.log import configure
+from skyrim_daemon import SkyrimDaemon, main, parse_args
+
+
+class FakeTree:
+    def __init__(self, fragments=()):
+        self.fragments = {os.path.abspath(path): None for path in fragments}
+
+
+class FakeGenerator:
+    def __init__(self, fragments=()):
+        self.config_tree = FakeTree(fragments)
+        self.keybinds_data = {}
+        self.calls = []
+
+    def run(self):
+        self.calls.append(("run",))
+        return True
+
+    def regenerate(self, changed):
+        self.calls.append(("regenerate", tuple(changed)))
+
+    def load_configs(self):
+        self.calls.append(("load_configs",))
+
+
+def change(daemon, *paths):
+    asyncio.run(daemon.on_change(list(paths)))
+
+
+def test_config_change_regenerates_when_ready():
+    generator = FakeGenerator()
+    daemon = SkyrimDaemon(generator, run_clicker=False)
+    daemon.generator_ready = True
+    change(daemon, "config.yaml")
+    assert generator.calls == [("regenerate", ("config.yaml",))]
+
+
+def test_config_change_runs_full_generation_until_ready():
+    generator = FakeGenerator()
+    daemon = SkyrimDaemon(generator, run_clicker=False)
+    change(daemon, "commands.yaml")
+    assert generator.calls == [("run",)]
+    assert daemon.generator_ready
+
+
+def test_included_fragment_counts_as_config(tmp_path):
+    fragment = str(tmp_path / "players" / "mage.yaml")
+    generator = FakeGenerator([fragment])
+    daemon = SkyrimDaemon(generator, run_clicker=False)
+    daemon.generator_ready = True
+    change(daemon, fragment)
+    assert generator.calls == [("regenerate", (fragment,))]
+
+
+def test_unrelated_file_is_ignored(tmp_path):
+    generator = FakeGenerator()
+    daemon = SkyrimDaemon(generator, run_clicker=False)
+    daemon.generator_ready = True
+    change(daemon, str(tmp_path / "notes.yaml"))
+    assert generator.calls == []
+
+
+def test_without_generator_only_reloads_config():
+    generator = FakeGenerator()
+    daemon = SkyrimDaemon(generator, run_generator=False, run_clicker=False)
+    change(daemon, "config.yaml")
+    assert generator.calls == [("load_configs",)]
+
+
+def test_clicker_reload_reschedules(monkeypatch):
+    generator = FakeGenerator()
+    daemon = SkyrimDaemon(generator, run_generator=False)
+    reloads = []
+    monkeypatch.setattr(daemon, "load_clicker", lambda: reloads.append(True) or True)
+    change(daemon, "clicker.yaml")
+    assert reloads == [True]
+    assert daemon.reschedule.is_set() and daemon.conditions_changed.is_set()
+    assert generator.calls == []
+
+
+def test_relative_data_path_is_resolved_before_chdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    seen = {}
+
+    class Stop(Exception):
+        pass
+
+    def fake_generator(compact_json=False, skyrim_data_path=None):
+        seen["data_path"] = skyrim_data_path
+        raise Stop
+
+    monkeypatch.setattr("skyrim_daemon.SkyrimPresetGenerator", fake_generator)
+    try:
+        with pytest.raises(Stop):
+            main(["--quiet", "--data-path", "Data"])
+    finally:
+        configure()
+    assert seen["data_path"] == str(tmp_path / "Data")
+
+
+def test_output_flags_are_exclusive():
+    with pytest.raises(SystemExit):
+        parse_args(["--quiet", "--verbose"])
@@ -0,0 +1,20 @@
+from generator.dedupe import canonical_command, group_identical
+
+
+def test_verb_and_form_ids_are_case_insensitive():
+    assert canonical_command("Player.AddItem 0000000F  100") == canonical_command("player.additem 0000000f 100")
+    assert canonical_command("coc Skyrim.esm:000D62") == canonical_command("COC skyrim.esm:000d62")
+
+
+def test_quoted_arguments_keep_their_case_and_spacing():
+    assert canonical_command('player.setdisplayname "Big  Sword"') == 'player.setdisplayname "Big  Sword"'
+    assert canonical_command('setname "Lydia"') != canonical_command('setname "LYDIA"')
+
+
+def test_presets_differing_only_in_quoted_case_get_separate_slots():
+    groups = group_identical({
+        "F1": ("Python_a_F1", ['player.setdisplayname "Ebony Blade"']),
+        "F2": ("Python_b_F2", ['player.setdisplayname "EBONY BLADE"']),
+        "F3": ("Python_c_F3", ['Player.SetDisplayName "Ebony Blade"']),
+    })
+    assert [group.keys for group in groups] == [["F1", "F3"], ["F2"]]
@@ -0,0 +1,76 @@
+import logging
+
+import pytest
+
+from generator.commands import CommandRegistry
+from generator.formdb import FormDatabase, import_dumps, normalize_form_id
+from generator.log import get_logger
+
+DUMP = """FormID;EditorID;Name;Signature
+[WEAP:00012EB7];IronSword;Iron Sword;WEAP
+[WEAP:00013989];SteelSword;Steel Sword;WEAP
+[WEAP:000139B9];DaedricSword;Daedric Sword;WEAP
+[WEAP:0001C4E6];EnchIronSwordFire01;Iron Sword of Embers;WEAP
+[WEAP:000CC829];GlassBowFrost;Glass Bow of Frost;WEAP
+"""
+
+
+@pytest.fixture
+def database(tmp_path):
+    dump = tmp_path / "Skyrim.esm.csv"
+    dump.write_text(DUMP, encoding="utf-8")
+    path = str(tmp_path / "forms.db")
+    counts = import_dumps(path, [str(dump)])
+    assert counts == {str(dump): 5}
+    db = FormDatabase(path)
+    yield db
+    db.close()
+
+
+class Records(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_form_ids_are_normalized_on_import():
+    assert normalize_form_id("[WEAP:00012EB7]") == normalize_form_id("0x12eb7") == "00012eb7"
+
+
+def test_import_fills_the_index(database):
+    assert len(database) == 5
+    assert database.exact("iron sword") == "00012eb7"
+    assert database.exact("GlassBowFrost") == "000cc829"
+
+
+def test_trigram_search_tolerates_typos(database):
+    score, form_id, name, plugin = database.search("daedric swrd", limit=1)[0]
+    assert (form_id, name, plugin) == ("000139b9", "Daedric Sword", "Skyrim.esm")
+    assert 0.45 <= score < 1
+
+
+def test_exact_name_beats_a_higher_scoring_fuzzy_match(database):
+    # "Iron Sword of Embers" is a prefix match and scores high, but the exact name wins
+    assert database.resolve_match("Iron Sword") == ("00012eb7", "Iron Sword", None)
+
+
+def test_nothing_similar_resolves_to_none(database):
+    assert database.resolve("flagon of mead") is None
+
+
+def test_give_item_resolves_names_and_logs_fuzzy_picks(database):
+    handler = Records()
+    get_logger().addHandler(handler)
+    try:
+        registry = CommandRegistry(form_db=database)
+        assert registry.resolve("give_item", ["glass bow of frost", 1]) == "player.additem 000cc829 1"
+        assert not handler.records
+        assert registry.resolve("give_item", ["daedric swrd", 1]) == "player.additem 000139b9 1"
+    finally:
+        get_logger().removeHandler(handler)
+    (record,) = handler.records
+    assert record.levelno == logging.INFO
+    assert record.fields["matched"] == "Daedric Sword"
@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+from generator.config_cache import ConfigCache
+from generator.fragments import ConfigConflict, ConfigTree, merge_into
+
+
+def load_tree(tmp_path, files, root="config.yaml"):
+    for name, text in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    cache = ConfigCache(str(tmp_path / ".cache"), enabled=False)
+    root_path = str(tmp_path / root)
+    data = cache.load_many({"config": (root_path, None)})["config"][0]
+    tree = ConfigTree(cache)
+    return tree, tree.load(root_path, data)
+
+
+def merge(*fragments):
+    merged, owners, copied = {}, {}, set()
+    for source, data in fragments:
+        merge_into(merged, data, source, owners, copied)
+    return merged
+
+
+def test_nested_mappings_merge_key_by_key():
+    merged = merge(("a.yaml", {"backups": {"keep": 5}}), ("b.yaml", {"backups": {"directory": "old"}}))
+    assert merged == {"backups": {"keep": 5, "directory": "old"}}
+
+
+def test_conflicting_value_names_both_files():
+    with pytest.raises(ConfigConflict, match=r"backups\.keep is defined in both a\.yaml and b\.yaml"):
+        merge(("a.yaml", {"backups": {"keep": 5}}), ("b.yaml", {"backups": {"keep": 3}}))
+
+
+def test_identical_values_do_not_conflict():
+    assert merge(("a.yaml", {"optimize": True}), ("b.yaml", {"optimize": True})) == {"optimize": True}
+
+
+def test_keybind_definitions_never_merge_field_by_field():
+    with pytest.raises(ConfigConflict, match=r"keybinds\.F1"):
+        merge(("a.yaml", {"keybinds": {"F1": {"commands": ["tgm"]}}}),
+              ("b.yaml", {"keybinds": {"F1": {"name": "God mode"}}}))
+    # Different keybinds in one section still merge
+    merged = merge(("a.yaml", {"keybinds": {"F1": {"commands": ["tgm"]}}}),
+                   ("b.yaml", {"keybinds": {"F2": {"commands": ["tcl"]}}}))
+    assert set(merged["keybinds"]) == {"F1", "F2"}
+
+
+def test_merge_never_modifies_fragment_data():
+    first = {"backups": {"keep": 5}}
+    merge(("a.yaml", first), ("b.yaml", {"backups": {"directory": "old"}}))
+    assert first == {"backups": {"keep": 5}}
+
+
+def test_includes_merge_depth_first_in_listed_order(tmp_path):
+    tree, merged = load_tree(tmp_path, {
+        "config.yaml": "include:\n  - players/*.yaml\n  - extra.yaml\nkeybinds:\n  F1: {commands: [tgm]}\n",
+        "players/b.yaml": "keybinds:\n  F3: {commands: [tai]}\n",
+        "players/a.yaml": "include: nested.yaml\nkeybinds:\n  F2: {commands: [tcl]}\n",
+        "players/nested.yaml": "keybinds:\n  F4: {commands: [tfc]}\n",
+        "extra.yaml": "keybinds:\n  F5: {commands: [tm]}\n",
+    })
+    names = [os.path.relpath(path, tmp_path) for path in tree.fragments]
+    assert names == [os.path.join("players", "a.yaml"), os.path.join("players", "nested.yaml"),
+                     os.path.join("players", "b.yaml"), "extra.yaml"]
+    assert list(merged["keybinds"]) == ["F1", "F2", "F4", "F3", "F5"]
+    assert "include" not in merged
+
+
+def test_conflict_between_included_files(tmp_path):
+    with pytest.raises(ConfigConflict, match="one.yaml.*two.yaml"):
+        load_tree(tmp_path, {
+            "config.yaml": "include: [one.yaml, two.yaml]\n",
+            "one.yaml": "keybinds:\n  F1: {commands: [tgm]}\n",
+            "two.yaml": "keybinds:\n  F1: {commands: [tcl]}\n",
+        })
+
+
+def test_missing_include_is_reported(tmp_path):
+    with pytest.raises(FileNotFoundError, match="gone.yaml"):
+        load_tree(tmp_path, {"config.yaml": "include: gone.yaml\n"})
@@ -0,0 +1,45 @@
+from generator.commands import CommandRegistry
+from generator.index import LookupIndex, flatten_tree
+
+IDS = {
+    "currency": {"gold": "0000000f", "lockpick": "0000000a"},
+    "one_handed_swords": {"iron_sword": "00012eb7", "steel_sword": "00013989"},
+    "aliases": {"money": "0000000F"},
+}
+COMMANDS = {"player_commands": {"god_mode": "tgm", "no_clip": "tcl"}}
+
+
+def index():
+    return LookupIndex(flatten_tree(COMMANDS), flatten_tree(IDS))
+
+
+def test_nested_trees_flatten_to_dotted_paths():
+    flat = flatten_tree(IDS)
+    assert flat["one_handed_swords.iron_sword"] == "00012eb7"
+    assert flat["currency.gold"] == "0000000f"
+    assert "one_handed_swords" not in flat
+
+
+def test_dotted_path_lookups_hit():
+    lookups = index()
+    assert lookups.form_id("one_handed_swords.iron_sword") == "00012eb7"
+    assert lookups.command("player_commands.god_mode") == "tgm"
+    assert lookups.form_id("iron_sword", "missing") == "missing"
+
+
+def test_registry_resolves_dotted_item_names():
+    registry = CommandRegistry(index())
+    assert registry.resolve("give_item", ["one_handed_swords.iron_sword", 1]) == "player.additem 00012eb7 1"
+    assert registry.resolve("execute_command", ["player_commands.no_clip"]) == "tcl"
+
+
+def test_reverse_index_maps_form_ids_to_the_first_name():
+    lookups = index()
+    assert lookups.name_for("00012EB7") == "one_handed_swords.iron_sword"
+    assert lookups.name_for("0000000f") == "currency.gold"
+    assert lookups.name_for("deadbeef") is None
+    assert lookups.name_for(15, "n/a") == "n/a"
+
+
+def test_describe_ids_names_the_form_ids_in_a_command():
+    assert index().describe_ids("player.additem 0000000f 100") == ["0000000f = currency.gold"]
@@ -0,0 +1,77 @@
+import struct
+
+import pytest
+
+from generator.loadorder import (
+    IMPLICIT_MASTERS, LIGHT_FLAG, LoadOrder, ReferenceTable, is_light_plugin, parse_reference, remap_references,
+)
+
+
+def write_plugin(directory, name, flags=0):
+    (directory / name).write_bytes(struct.pack("<4sIII", b"TES4", 0, flags, 0) + b"\0" * 8)
+
+
+def test_parse_reference_accepts_colon_pipe_and_hex_prefix():
+    assert parse_reference("Plugin.esp:000D62") == ("Plugin.esp", 0xD62)
+    assert parse_reference(" Mod Name.esm | 0x01000ABC ") == ("Mod Name.esm", 0xABC)
+    assert parse_reference("0000000f") is None
+    assert parse_reference(15) is None
+
+
+def test_full_and_light_plugins_get_their_prefixes():
+    order = LoadOrder(["Skyrim.esm", "Small.esl", "Mod.esp", "Tiny.esp"], light=["Small.esl", "Tiny.esp"])
+    assert order.runtime_form_id("skyrim.esm", 0x00000F) == 0x0000000F
+    assert order.runtime_form_id("Mod.esp", 0x123456) == 0x01123456
+    assert order.runtime_form_id("Small.esl", 0x801) == 0xFE000801
+    # Light plugins keep only 12 bits of the local ID
+    assert order.runtime_form_id("Tiny.esp", 0xABC801) == 0xFE001801
+    assert order.runtime_form_id("Missing.esp", 0x801) is None
+
+
+def test_light_flag_is_read_from_the_tes4_header(tmp_path):
+    write_plugin(tmp_path, "Flagged.esp", LIGHT_FLAG)
+    write_plugin(tmp_path, "Plain.esp", 0x1)
+    (tmp_path / "Broken.esp").write_bytes(b"TES")
+    assert is_light_plugin("Anything.esl")
+    assert is_light_plugin("Flagged.esp", str(tmp_path))
+    assert not is_light_plugin("Plain.esp", str(tmp_path))
+    assert not is_light_plugin("Broken.esp", str(tmp_path))
+    assert not is_light_plugin("Flagged.esp")  # No Data folder to read
+
+
+def test_implicit_masters_load_first_and_only_active_plugins_count(tmp_path):
+    write_plugin(tmp_path, "Flagged.esp", LIGHT_FLAG)
+    plugins_txt = tmp_path / "plugins.txt"
+    plugins_txt.write_text("# comment\n*Mod.esp\nInactive.esp\n*Update.esm\n*Flagged.esp\n", encoding="utf-8")
+    order = LoadOrder.from_files(str(plugins_txt), data_path=str(tmp_path))
+    assert order.plugins == list(IMPLICIT_MASTERS) + ["Mod.esp", "Flagged.esp"]
+    assert order.runtime_form_id("Mod.esp", 0x10) == 0x05000010
+    assert order.runtime_form_id("Flagged.esp", 0x10) == 0xFE000010
+    assert order.runtime_form_id("Inactive.esp", 0x10) is None
+
+
+def test_missing_plugin_lists_raise():
+    with pytest.raises(FileNotFoundError):
+        LoadOrder.from_files("/nonexistent/plugins.txt", "/nonexistent/loadorder.txt")
+
+
+def test_remap_reports_unresolved_references():
+    order = LoadOrder(["Skyrim.esm", "Mod.esp"])
+    flat = {"items.gold": "Skyrim.esm:00000F", "items.sword": "Mod.esp:000D62",
+            "items.gone": "Gone.esp:000001", "items.raw": "0001397e"}
+    remapped, unresolved = remap_references(flat, order)
+    assert remapped == {"items.gold": "0000000f", "items.sword": "01000d62",
+                        "items.gone": "Gone.esp:000001", "items.raw": "0001397e"}
+    assert unresolved == {"items.gone": "Gone.esp:000001"}
+
+
+def test_reference_table_holds_more_than_256_plugins():
+    names = [f"Light{index}.esl" for index in range(300)]
+    order = LoadOrder(names, light=names)
+    table = ReferenceTable()
+    for name in names:
+        table.add(name, 0xABC)
+    assert table.codes.itemsize >= 8
+    resolved = table.resolve_all(order)
+    assert resolved[299] == f"{0xFE000000 | 299 << 12 | 0xABC:08x}"
+    assert table.missing_plugins(order) == []
@@ -0,0 +1,70 @@
+import ctypes
+
+from conditions_for_button_clicks.backends import HOLD_SECONDS, SendInputBackend
+from conditions_for_button_clicks.keys import get_key
+from conditions_for_button_clicks.macros import MacroEngine, compile_macro
+from conditions_for_button_clicks.win32_input import (INPUT, INPUT_KEYBOARD, KEYEVENTF_KEYUP, KEYEVENTF_SCANCODE,
+                                                      MOUSEINPUT, keyboard_input)
+
+
+def layout(segment):
+    return [(event.type, event.ki.wVk, event.ki.wScan, event.ki.dwFlags) for event in segment.events]
+
+
+def test_input_union_is_sized_for_its_largest_member():
+    assert ctypes.sizeof(INPUT._INPUT) == ctypes.sizeof(MOUSEINPUT)
+
+
+def test_chord_is_one_array_pressed_in_order_and_released_in_reverse():
+    macro = compile_macro("save", ["Ctrl+Shift+S"])
+    assert macro.call_count == 1
+    (segment,) = macro.segments
+    assert segment.labels == (("Ctrl", "down"), ("Shift", "down"), ("S", "down"),
+                              ("S", "up"), ("Shift", "up"), ("Ctrl", "up"))
+    ctrl, shift, s = get_key("Ctrl"), get_key("Shift"), get_key("S")
+    assert layout(segment) == [
+        (INPUT_KEYBOARD, 0, ctrl.scan, KEYEVENTF_SCANCODE),
+        (INPUT_KEYBOARD, 0, shift.scan, KEYEVENTF_SCANCODE),
+        (INPUT_KEYBOARD, 0, s.scan, KEYEVENTF_SCANCODE),
+        (INPUT_KEYBOARD, 0, s.scan, KEYEVENTF_SCANCODE | KEYEVENTF_KEYUP),
+        (INPUT_KEYBOARD, 0, shift.scan, KEYEVENTF_SCANCODE | KEYEVENTF_KEYUP),
+        (INPUT_KEYBOARD, 0, ctrl.scan, KEYEVENTF_SCANCODE | KEYEVENTF_KEYUP),
+    ]
+
+
+def test_virtual_key_events_carry_no_scan_code():
+    key = get_key("F1")
+    event = keyboard_input(key, key_up=True, scan_codes=False)
+    assert (event.ki.wVk, event.ki.wScan, event.ki.dwFlags) == (key.vk, 0, KEYEVENTF_KEYUP)
+
+
+def test_delays_split_a_macro_into_separate_calls():
+    macro = compile_macro("quick", ["1", 0.5, "2", {"key": "3", "hold": 0.1}])
+    assert [(segment.labels, segment.delay) for segment in macro.segments] == [
+        ((("1", "down"), ("1", "up")), 0.5),
+        ((("2", "down"), ("2", "up"), ("3", "down")), 0.1),
+        ((("3", "up"),), 0),
+    ]
+
+
+def test_play_sends_each_array_once_and_sleeps_between_them():
+    calls, sleeps = [], []
+    engine = MacroEngine({"quick": ["1", 0.5, "2"]}, sender=lambda events: calls.append(len(events)) or len(events),
+                         sleep=sleeps.append)
+    assert engine.play("quick")
+    assert calls == [2, 2]
+    assert sleeps == [0.5]
+
+
+def test_single_key_press_holds_between_down_and_up():
+    macro = SendInputBackend().compile(get_key("F1"))
+    assert [(segment.labels, segment.delay) for segment in macro.segments] == [
+        ((("F1", "down"),), HOLD_SECONDS),
+        ((("F1", "up"),), 0),
+    ]
+
+
+def test_single_key_press_without_hold_is_one_call():
+    macro = SendInputBackend(hold=0).compile(get_key("F1"))
+    assert macro.call_count == 1
+    assert macro.segments[0].labels == (("F1", "down"), ("F1", "up"))
@@ -0,0 +1,50 @@
+import json
+
+from generator.manifest import MANIFEST_VERSION, PresetManifest, fingerprint
+
+
+def test_fingerprint_depends_on_name_and_command_order():
+    digest = fingerprint("Preset_F1", ["tgm", "tcl"])
+    assert digest == fingerprint("Preset_F1", ("tgm", "tcl"))
+    assert digest != fingerprint("Preset_F1", ["tcl", "tgm"])
+    assert digest != fingerprint("Preset_F2", ["tgm", "tcl"])
+
+
+def test_round_trip_keeps_presets_history_and_batch_files(tmp_path):
+    path = str(tmp_path / "sub" / "manifest.json")
+    manifest = PresetManifest.load(path)
+    manifest.record("F1", 3, "Preset_F1", "abc")
+    manifest.batch_files.append("preset_f1.txt")
+    assert manifest.save()
+
+    loaded = PresetManifest.load(path)
+    assert loaded.get("F1") == {"slot": 3, "name": "Preset_F1", "fingerprint": "abc"}
+    assert loaded.slot_history == {"F1": 3}
+    assert loaded.batch_files == ["preset_f1.txt"]
+    assert not loaded.dirty
+
+
+def test_removed_keys_keep_their_slot_history(tmp_path):
+    manifest = PresetManifest(str(tmp_path / "manifest.json"))
+    manifest.record("F1", 3, "Preset_F1", "abc")
+    assert manifest.remove("F1")["slot"] == 3
+    assert manifest.get("F1") is None
+    assert manifest.slot_history == {"F1": 3}
+
+
+def test_save_skips_unchanged_manifests(tmp_path):
+    path = tmp_path / "manifest.json"
+    manifest = PresetManifest(str(path))
+    assert manifest.save()  # A new file is always written
+    assert not manifest.save()
+    manifest.record("F1", 0, "Preset_F1", "abc")
+    assert manifest.dirty and manifest.save()
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_unreadable_or_other_version_manifests_start_empty(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_text("{not json", encoding="utf-8")
+    assert PresetManifest.load(str(path)).presets == {}
+    path.write_text(json.dumps({"version": MANIFEST_VERSION + 1, "presets": {"F1": {}}}), encoding="utf-8")
+    assert PresetManifest.load(str(path)).presets == {}
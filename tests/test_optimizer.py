@@ -0,0 +1,77 @@
+from generator.optimizer import optimize_commands
+
+
+def test_overwritten_setav_is_dropped():
+    commands = ["player.setav health 100", "player.setav magicka 100", "player.setav health 999"]
+    assert optimize_commands(commands) == (["player.setav magicka 100", "player.setav health 999"], 1)
+
+
+def test_setav_read_in_between_is_kept():
+    commands = ["player.setav health 100", "player.getav health", "player.setav health 999"]
+    assert optimize_commands(commands) == (commands, 0)
+
+
+def test_setavs_of_different_references_are_independent():
+    commands = ["player.setav health 100", "setav health 50", "player.setav health 999"]
+    assert optimize_commands(commands) == (["setav health 50", "player.setav health 999"], 1)
+
+
+def test_adjacent_modavs_are_summed():
+    commands = ["player.modav health 10", "player.modav Health 5.5", "player.modav stamina 1"]
+    assert optimize_commands(commands) == (["player.modav health 15.5", "player.modav stamina 1"], 1)
+
+
+def test_modavs_that_cancel_out_are_removed():
+    commands = ["player.modav health 10", "player.modav health -10", "tgm"]
+    assert optimize_commands(commands) == (["tgm"], 2)
+
+
+def test_non_adjacent_modavs_are_not_summed():
+    commands = ["player.modav health 10", "tgm", "player.modav health 5"]
+    assert optimize_commands(commands) == (commands, 0)
+
+
+def test_additems_merge_into_the_first_across_transparent_verbs():
+    commands = ["player.additem f 100", "tgm", "player.additem 0000000F 50"]
+    assert optimize_commands(commands) == (["player.additem f 150", "tgm"], 1)
+
+
+def test_additem_merge_stops_at_a_command_touching_the_item():
+    commands = ["player.additem f 100", "player.removeitem f 10", "player.additem f 1"]
+    assert optimize_commands(commands) == (commands, 0)
+
+
+def test_additems_with_different_flags_are_not_merged():
+    commands = ["player.additem f 100 1", "player.additem f 50"]
+    assert optimize_commands(commands) == (commands, 0)
+
+
+def test_unknown_commands_are_barriers_for_every_rule():
+    commands = ["player.setav health 1", "player.additem f 1", "bat stuff",
+                "player.setav health 2", "player.additem f 1"]
+    assert optimize_commands(commands) == (commands, 0)
+
+
+def test_untouched_commands_keep_their_spelling():
+    commands = ["Player.SetAV Health   1", "PLAYER.ADDITEM F 2", "player.additem f 3"]
+    assert optimize_commands(commands) == (["Player.SetAV Health   1", "PLAYER.ADDITEM F 5"], 1)
+
+
+def test_non_finite_amounts_are_never_folded():
+    for commands in (["player.modav health 1e400", "player.modav health 1"],
+                     ["player.modav health nan", "player.modav health 1"],
+                     ["player.modav health inf", "player.modav health -inf"],
+                     ["player.modav health 1e308", "player.modav health 1e308"]):
+        assert optimize_commands(commands) == (commands, 0)
+
+
+def test_additem_counts_never_overflow_int32():
+    commands = ["player.additem f 2147483647", "player.additem f 1"]
+    assert optimize_commands(commands) == (commands, 0)
+    assert optimize_commands(["player.additem f 2147483646", "player.additem f 1"]) == (
+        ["player.additem f 2147483647"], 1)
+
+
+def test_fractional_additem_counts_are_not_merged():
+    commands = ["player.additem f 1.5", "player.additem f 1"]
+    assert optimize_commands(commands) == (commands, 0)
@@ -0,0 +1,90 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from benchmarks.synthetic import write_workspace
+from generator.dedupe import PresetGroup
+from generator.log import configure
+from generator.plan import (
+    PLAN_FORMAT, build_plan, plan_groups, plan_slots, read_plan, source_hashes, write_plan,
+)
+from generator.slots import SlotLayout
+from skyrim_preset_generator import SkyrimPresetGenerator
+
+
+def group(keys, name, commands):
+    preset = PresetGroup(keys[0], name, commands, None)
+    preset.keys = list(keys)
+    return preset
+
+
+def sample_plan(tmp_path):
+    config = tmp_path / "config.yaml"
+    config.write_text("optimize: true\n", encoding="utf-8")
+    groups = [group(["F1"], "Preset_F1", ["tgm"]), group(["F2", "F3"], "Shared_F2", ["player.additem f 100"])]
+    settings = {"batch_files": {"mode": "all"}, "backups": {"keep": 3}, "keybinds": {"F1": {}}}
+    return build_plan(groups, [4, 0], SlotLayout(preset_slots=60), source_hashes([str(config), "missing.yaml"]),
+                      settings)
+
+
+def test_plan_round_trips_through_the_file(tmp_path):
+    plan = sample_plan(tmp_path)
+    path = str(tmp_path / "presets.plan.json")
+    assert write_plan(path, plan)
+    assert not write_plan(path, plan)  # Unchanged plans are not rewritten
+
+    loaded = read_plan(path)
+    assert loaded == plan
+    assert list(loaded["sources"]) == ["config.yaml"]
+    assert loaded["settings"] == {"batch_files": {"mode": "all"}, "backups": {"keep": 3}}
+    assert SlotLayout(**loaded["layout"]).preset_slots == 60
+
+    groups, preferred = plan_groups(loaded)
+    assert [(preset.keys, preset.name, preset.commands) for preset in groups] == [
+        (["F1"], "Preset_F1", ["tgm"]), (["F2", "F3"], "Shared_F2", ["player.additem f 100"])]
+    assert preferred == {"F1": 4, "F2": 0, "F3": 0}
+    assert plan_slots(path) == preferred
+
+
+def test_read_plan_rejects_other_files_and_versions(tmp_path):
+    path = tmp_path / "plan.json"
+    path.write_text(json.dumps({"format": "something else"}), encoding="utf-8")
+    with pytest.raises(ValueError, match="not a preset plan"):
+        read_plan(str(path))
+    path.write_text(json.dumps({"format": PLAN_FORMAT, "version": 99}), encoding="utf-8")
+    with pytest.raises(ValueError, match="Unsupported plan version 99"):
+        read_plan(str(path))
+    assert plan_slots(str(path)) == {}
+    assert plan_slots(str(tmp_path / "missing.json")) == {}
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    data_path = write_workspace(str(tmp_path), keybinds=12, ids=200, commands=30, filled=0)
+    monkeypatch.chdir(tmp_path)
+    configure(quiet=True)
+    yield data_path
+    configure()
+
+
+def hybrid_config(data_path):
+    with open(os.path.join(data_path, "SKSE", "Plugins", "StorageUtilData", "HybridCommander-Config.json"), "rb") as f:
+        return f.read()
+
+
+def test_applying_a_compiled_plan_matches_a_direct_run(workspace, tmp_path):
+    untouched = hybrid_config(workspace)
+    plan_path = str(tmp_path / "presets.plan.json")
+    assert SkyrimPresetGenerator(skyrim_data_path=workspace).compile_plan(plan_path)
+    assert hybrid_config(workspace) == untouched  # Compiling never writes the game files
+
+    assert SkyrimPresetGenerator(skyrim_data_path=workspace).apply_plan(plan_path)
+    applied = hybrid_config(workspace)
+    assert applied != untouched
+
+    shutil.rmtree(workspace)
+    write_workspace(str(tmp_path), keybinds=12, ids=200, commands=30, filled=0)
+    assert SkyrimPresetGenerator(skyrim_data_path=workspace).run()
+    assert hybrid_config(workspace) == applied
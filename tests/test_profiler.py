@@ -0,0 +1,108 @@
+import json
+import logging
+import tracemalloc
+
+from generator.log import NULL_PHASE, JsonFormatter, Joined, Profiler, configure, get_logger
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Records(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_disabled_profiler_hands_out_the_shared_null_phase():
+    profiler = Profiler()
+    assert profiler.phase("load") is NULL_PHASE
+    with profiler.phase("load"):
+        pass
+    assert profiler.report() == {}
+
+
+def test_nested_phases_are_timed_exclusively():
+    clock = FakeClock()
+    profiler = Profiler(enabled=True, trace_memory=False, clock=clock)
+    with profiler.phase("resolve"):
+        clock.now += 1.0
+        with profiler.phase("optimize"):
+            clock.now += 0.25
+        clock.now += 0.5
+    with profiler.phase("resolve"):
+        clock.now += 2.0
+    report = profiler.report()
+    assert report["resolve"]["seconds"] == 3.5 and report["resolve"]["calls"] == 2
+    assert report["optimize"]["seconds"] == 0.25 and report["optimize"]["calls"] == 1
+
+
+def test_report_lists_known_phases_in_pipeline_order_then_others():
+    profiler = Profiler(enabled=True, trace_memory=False, clock=FakeClock())
+    for name in ("write", "custom", "load", "resolve"):
+        with profiler.phase(name):
+            pass
+    assert list(profiler.report()) == ["load", "resolve", "write", "custom"]
+
+
+def test_memory_is_charged_to_the_phase_that_allocates_it():
+    tracing = tracemalloc.is_tracing()
+    profiler = Profiler(enabled=True)
+    try:
+        with profiler.phase("index"):
+            kept = [bytearray(1024) for _ in range(256)]
+        with profiler.phase("write"):
+            pass
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    report = profiler.report()
+    assert report["index"]["allocated_kb"] >= 256
+    assert report["write"]["allocated_kb"] < 64
+    del kept
+
+
+def test_log_report_is_shown_even_when_quiet():
+    logger = get_logger()
+    handler = Records()
+    logger.addHandler(handler)
+    try:
+        configure(quiet=True)
+        profiler = Profiler(enabled=True, trace_memory=False, clock=FakeClock())
+        with profiler.phase("load"):
+            pass
+        profiler.log_report()
+    finally:
+        logger.removeHandler(handler)
+        configure()
+    assert [record.levelno for record in handler.records] == [logging.WARNING, logging.WARNING]
+    assert handler.records[1].fields["phase"] == "load"
+
+
+def test_json_formatter_adds_structured_fields():
+    record = logging.LogRecord("skyrim", logging.INFO, __file__, 1, "%d presets", (3,), None)
+    record.fields = {"presets": 3}
+    entry = json.loads(JsonFormatter().format(record))
+    assert (entry["level"], entry["message"], entry["presets"]) == ("info", "3 presets", 3)
+
+
+def test_joined_is_only_built_when_formatted():
+    class Exploding:
+        def __str__(self):
+            raise AssertionError("formatted")
+
+    logger = get_logger()
+    configure(quiet=True)
+    try:
+        logger.info("%s", Joined([Exploding()]))
+    finally:
+        configure()
+    assert str(Joined(["a", 1], " + ")) == "a + 1"
@@ -0,0 +1,92 @@
+import random
+
+from conditions_for_button_clicks.scheduler import Job, Scheduler
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def scheduler_for(jobs, clock, action=None, press_seconds=0.0):
+    fired = []
+
+    def press(job):
+        fired.append((clock.now, job.key))
+        clock.now += press_seconds
+        return "pressed"
+
+    def sleeper(deadline, clock, stop=None):
+        clock.now = max(clock.now, deadline)
+        return True
+
+    scheduler = Scheduler(jobs, action or press, clock=clock, sleeper=sleeper)
+    return scheduler, fired
+
+
+def test_deadlines_do_not_drift_with_press_duration():
+    clock = FakeClock()
+    scheduler, fired = scheduler_for([Job("F1", 10)], clock, press_seconds=0.3)
+    scheduler.start()
+    scheduler.run(max_fires=4)
+    assert [time for time, _ in fired] == [0.0, 10.0, 20.0, 30.0]
+
+
+def test_jobs_fire_in_deadline_order_on_independent_cadences():
+    clock = FakeClock()
+    scheduler, fired = scheduler_for([Job("F1", 3), Job("F2", 5, phase=2)], clock)
+    scheduler.start()
+    scheduler.run(max_fires=6)
+    assert fired == [(0.0, "F1"), (2.0, "F2"), (3.0, "F1"), (6.0, "F1"), (7.0, "F2"), (9.0, "F1")]
+
+
+def test_blocked_scheduler_counts_missed_presses_instead_of_bursting():
+    clock = FakeClock()
+    job = Job("F1", 10)
+    scheduler, fired = scheduler_for([job], clock)
+    scheduler.start()
+    scheduler.fire_due()
+    clock.now = 35.0  # Blocked through the presses due at 10, 20 and 30
+    (report,) = scheduler.fire_due()
+    assert report.deadline == 10.0
+    assert report.missed == 2
+    assert report.lateness == 25.0
+    assert (job.fires, job.missed, job.late) == (2, 2, 1)
+    # Catches up on the original grid: the next press is at 40, not 45
+    assert scheduler.next_deadline() == 40.0
+    assert len(fired) == 2
+
+
+def test_small_lateness_is_late_but_not_missed():
+    clock = FakeClock()
+    job = Job("F1", 10)
+    scheduler, _ = scheduler_for([job], clock)
+    scheduler.start()
+    clock.now = 0.5
+    (report,) = scheduler.fire_due()
+    assert (report.missed, job.late) == (0, 1)
+    assert scheduler.next_deadline() == 10.0
+
+
+def test_jitter_stays_within_bounds_and_does_not_accumulate():
+    clock = FakeClock()
+    job = Job("F1", 10, jitter=2)
+    scheduler, fired = scheduler_for([job], clock)
+    scheduler.rng = random.Random(7)
+    scheduler.start()
+    scheduler.run(max_fires=50)
+    for index, (time, _) in enumerate(fired):
+        assert abs(time - index * 10) <= 2
+
+
+def test_reports_reach_on_fire_with_the_action_result():
+    clock = FakeClock()
+    reports = []
+    scheduler, _ = scheduler_for([Job("F1", 10)], clock)
+    scheduler.on_fire = reports.append
+    scheduler.start()
+    scheduler.run(max_fires=2)
+    assert [(report.job.key, report.result) for report in reports] == [("F1", "pressed"), ("F1", "pressed")]
@@ -0,0 +1,30 @@
+from generator.slots import SlotAllocator
+
+
+def test_allocate_hands_out_the_lowest_free_slot():
+    allocator = SlotAllocator(["taken", "", "", "taken", ""])
+    assert [allocator.allocate() for _ in range(4)] == [1, 2, 4, None]
+
+
+def test_released_slots_are_reused_lowest_first():
+    allocator = SlotAllocator([""] * 6)
+    assert [allocator.allocate() for _ in range(6)] == [0, 1, 2, 3, 4, 5]
+    allocator.release(4)
+    allocator.release(1)
+    allocator.release(3)
+    assert [allocator.allocate() for _ in range(3)] == [1, 3, 4]
+
+
+def test_claimed_slots_are_skipped():
+    allocator = SlotAllocator([""] * 4)
+    allocator.claim(0)
+    allocator.release(0)
+    allocator.claim(0)
+    assert allocator.allocate() == 1
+
+
+def test_a_key_gets_its_previous_slot_back_when_free():
+    allocator = SlotAllocator([""] * 5, sticky={"F1": 3})
+    assert allocator.allocate("F2") == 0
+    assert allocator.allocate("F1") == 3
+    assert allocator.allocate() == 1
@@ -0,0 +1,61 @@
+import os
+import signal
+import threading
+
+import pytest
+
+from conditions_for_button_clicks.telemetry import PressOutcome, Telemetry, export_signal, install_export_handler
+
+
+def press(telemetry, key="F1", backend="SendInput", lateness=0.002):
+    return telemetry.record(key, 10.0, 10.0 + lateness, PressOutcome(backend, ((backend, 0.001, True),)))
+
+
+def test_summary_counts_presses_per_backend():
+    telemetry = Telemetry()
+    press(telemetry)
+    press(telemetry, backend="AutoHotkey")
+    telemetry.record("F2", 1.0, 1.0, PressOutcome(None, (("AutoHotkey", 0.1, False),)))
+    summary = telemetry.summary()
+    assert summary["presses"] == 3
+    assert summary["failed"] == 1
+    assert summary["backends"]["SendInput"]["presses"] == 1
+    assert (summary["attempts"]["AutoHotkey"]["attempts"], summary["attempts"]["AutoHotkey"]["failures"]) == (2, 1)
+
+
+@pytest.mark.parametrize("suffix", [".json", ".csv"])
+def test_export_while_other_threads_record(tmp_path, suffix):
+    telemetry = Telemetry(capacity=500)
+    stop = threading.Event()
+
+    def record_forever():
+        while not stop.is_set():
+            press(telemetry)
+
+    threads = [threading.Thread(target=record_forever) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    try:
+        for index in range(30):
+            telemetry.export(str(tmp_path / f"export{index}{suffix}"))
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    assert telemetry.total > 0
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGUSR1"), reason="needs SIGUSR1")
+def test_failed_signal_export_is_reported_not_raised(tmp_path):
+    telemetry = Telemetry()
+    press(telemetry)
+    errors = []
+    previous = signal.getsignal(export_signal())
+    try:
+        install_export_handler(telemetry, str(tmp_path / "missing" / "telemetry.json"),
+                               on_error=lambda path, error: errors.append(error))
+        os.kill(os.getpid(), export_signal())
+    finally:
+        signal.signal(export_signal(), previous)
+    assert len(errors) == 1
+    assert isinstance(errors[0], OSError)
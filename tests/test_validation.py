@@ -0,0 +1,86 @@
+import json
+
+from generator.dedupe import PresetGroup
+from generator.validation import (
+    BUILTIN_VERBS, VerbTrie, build_catalog, check_command, parse_usage, split_command, validate_groups,
+)
+
+
+def edit_distance(a, b):
+    """Reference optimal string alignment distance"""
+    rows = [[max(i, j) if not i or not j else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            rows[i][j] = min(rows[i - 1][j] + 1, rows[i][j - 1] + 1, rows[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                rows[i][j] = min(rows[i][j], rows[i - 2][j - 2] + 1)
+    return rows[-1][-1]
+
+
+def test_near_finds_typos_and_transpositions():
+    trie = VerbTrie(BUILTIN_VERBS)
+    assert "tgm" in trie.near("tmg")  # One transposition, tied with "tg" (one deletion)
+    assert trie.near("aditem")[0] == "additem"
+    assert trie.near("SETVA")[0] == "setav"
+    assert trie.near("xyzzyplugh") == []
+
+
+def test_near_agrees_with_a_brute_force_search():
+    trie = VerbTrie(BUILTIN_VERBS)
+    for word in ("tmg", "aditem", "stav", "completequets", "moveot", "kil", "psbb", "equip"):
+        expected = sorted((edit_distance(word, verb), verb) for verb in BUILTIN_VERBS
+                          if edit_distance(word, verb) <= 2)
+        assert trie.near(word, limit=100) == [verb for _, verb in expected], word
+
+
+def test_repeated_verbs_widen_their_arity():
+    trie = VerbTrie({"additem": (2, 2)})
+    trie.add("AddItem", (3, 3))
+    trie.add("additem", (1, None))
+    assert trie.count == 1
+    assert trie.get("ADDITEM") == (1, None)
+    assert trie.get("additems") is None and trie.get("addite") is None
+
+
+def test_parse_usage_counts_required_and_optional_arguments():
+    assert parse_usage("player.additem <item> <count> [x]") == ("additem", (2, 3))
+    assert parse_usage("tgm") == ("tgm", (0, 0))
+    assert parse_usage("  ") is None
+    assert parse_usage("<item>") is None
+
+
+def test_catalog_includes_hybrid_commander_usages_and_config_extras(tmp_path):
+    command_file = tmp_path / "HybridCommander-Command.json"
+    command_file.write_text(json.dumps({"string": {"a": "mymod.dosomething <target> [force]"},
+                                        "stringList": {"b": ["spawnhorde <count>", ""]}}), encoding="utf-8")
+    trie = build_catalog(str(command_file), {"customverb": 1, "anyargs": None, "ranged": [0, 2]})
+    assert trie.get("dosomething") == (1, 2)
+    assert trie.get("spawnhorde") == (1, 1)
+    assert (trie.get("customverb"), trie.get("anyargs"), trie.get("ranged")) == ((1, 1), (0, None), (0, 2))
+    assert build_catalog(str(tmp_path / "missing.json")).count == len(BUILTIN_VERBS)
+
+
+def test_check_command_reports_unknown_verbs_and_wrong_arity():
+    trie = build_catalog()
+    assert check_command(trie, "player.additem 0000000f 100") is None
+    assert check_command(trie, 'player.placeatme "some name" 1') is None
+    assert check_command(trie, "player.aditem 0000000f 100") == "unknown console command 'aditem' - did you mean additem?"
+    assert check_command(trie, "player.setav health") == "'setav' takes 2 argument(s), got 1"
+    assert check_command(trie, "tfc 1 2") == "'tfc' takes 0-1 argument(s), got 2"
+    assert split_command('say "unbalanced') == ("say", ['"unbalanced'])
+    assert check_command(trie, "   ") is None
+
+
+def test_validate_groups_checks_each_distinct_command_once():
+    calls = []
+
+    class CountingTrie(VerbTrie):
+        def get(self, verb):
+            calls.append(verb)
+            return super().get(verb)
+
+    first = PresetGroup("F1", "Preset_F1", ["tgm", "tmg"], None)
+    second = PresetGroup("F2", "Preset_F2", ["tmg", "tcl"], None)
+    problems = validate_groups(CountingTrie(BUILTIN_VERBS), [first, second])
+    assert [(name, command) for name, command, _ in problems] == [("Preset_F1", "tmg"), ("Preset_F2", "tmg")]
+    assert calls == ["tgm", "tmg", "tcl"]
@@ -0,0 +1,139 @@
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+from generator.watcher import (
+    InotifyWatcher, PollingWatcher, create_watcher, stat_key, watch_files, watch_files_async,
+)
+
+
+def touch(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def make_watchers(paths):
+    yield PollingWatcher(paths, interval=0.01)
+    if sys.platform.startswith("linux"):
+        yield InotifyWatcher(paths)
+
+
+def test_set_paths_follows_added_and_removed_files(tmp_path):
+    config, old, new = (str(tmp_path / name) for name in ("config.yaml", "old.yaml", "new.yaml"))
+    (tmp_path / "sub").mkdir()
+    nested = str(tmp_path / "sub" / "nested.yaml")
+    for path in (config, old, new, nested):
+        touch(path, "a: 1\n")
+
+    for watcher in make_watchers([config, old]):
+        try:
+            watcher.set_paths([config, new, nested])
+            touch(old, "a: 2\n")
+            assert watcher.wait(0.2) == set()
+            touch(new, "a: 22\n")
+            assert watcher.wait(1.0) == {new}
+            touch(nested, "a: 333\n")
+            assert watcher.wait(1.0) == {nested}
+        finally:
+            watcher.close()
+
+
+def test_watch_files_refreshes_paths_after_each_change(tmp_path):
+    config, fragment = str(tmp_path / "config.yaml"), str(tmp_path / "fragment.yaml")
+    touch(config, "a: 1\n")
+    touch(fragment, "b: 1\n")
+    watcher = PollingWatcher([config], interval=0.01)
+    seen = []
+
+    class Done(Exception):
+        pass
+
+    def on_change(changed):
+        seen.append(changed)
+        if len(seen) == 1:
+            # Only seen if the refresh after this call added the fragment
+            threading.Timer(0.2, touch, (fragment, "b: 22\n")).start()
+        else:
+            raise Done
+
+    touch(config, "a: 22\n")
+    with pytest.raises(Done):
+        watch_files([config], on_change, debounce=0.05, watcher=watcher,
+                    refresh=lambda: [config, fragment])
+    assert seen == [{os.path.abspath(config)}, {os.path.abspath(fragment)}]
+
+
+def test_stat_key_is_none_for_missing_files(tmp_path):
+    assert stat_key(str(tmp_path / "missing.yaml")) is None
+    path = str(tmp_path / "config.yaml")
+    touch(path, "a: 1\n")
+    assert stat_key(path)[1] == 5
+
+
+def test_files_replaced_by_rename_are_seen(tmp_path):
+    config = str(tmp_path / "config.yaml")
+    touch(config, "a: 1\n")
+    for watcher in make_watchers([config]):
+        try:
+            temp = str(tmp_path / "config.yaml.tmp")
+            touch(temp, "a: 2222\n")
+            os.replace(temp, config)  # How editors and atomic_write save
+            assert watcher.wait(1.0) == {os.path.abspath(config)}
+        finally:
+            watcher.close()
+
+
+def test_a_burst_of_saves_is_handled_once(tmp_path):
+    config, commands = str(tmp_path / "config.yaml"), str(tmp_path / "commands.yaml")
+    touch(config, "a: 1\n")
+    touch(commands, "b: 1\n")
+    watcher = PollingWatcher([config, commands], interval=0.01)
+    seen = []
+
+    class Done(Exception):
+        pass
+
+    def on_change(changed):
+        seen.append(changed)
+        raise Done
+
+    touch(config, "a: 22\n")
+    threading.Timer(0.05, touch, (commands, "b: 22\n")).start()
+    with pytest.raises(Done):
+        watch_files([config, commands], on_change, debounce=0.3, watcher=watcher)
+    assert seen == [{os.path.abspath(config), os.path.abspath(commands)}]
+
+
+def test_async_watch_awaits_the_handler_per_burst(tmp_path):
+    config = str(tmp_path / "config.yaml")
+    touch(config, "a: 1\n")
+    seen = []
+
+    async def on_change(changed):
+        seen.append(changed)
+
+    async def run():
+        task = asyncio.ensure_future(watch_files_async(
+            [config], on_change, debounce=0.05, watcher=PollingWatcher([config], interval=0.01)))
+        await asyncio.sleep(0.05)
+        touch(config, "a: 22\n")
+        for _ in range(100):
+            if seen:
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(run())
+    assert seen == [{os.path.abspath(config)}]
+
+
+def test_create_watcher_falls_back_to_polling(tmp_path, monkeypatch):
+    config = str(tmp_path / "config.yaml")
+    touch(config, "a: 1\n")
+    monkeypatch.setattr(sys, "platform", "win32")
+    watcher = create_watcher([config], poll_interval=0.25)
+    assert watcher.name == "polling" and watcher.interval == 0.25